@@ -16,6 +16,19 @@ class Settings:
     BATTLE_HISTORY_SHEET = os.getenv("BATTLE_HISTORY_SHEET", "BattleHistory")
     RANKING_SHEET = os.getenv("RANKING_SHEET", "Rankings")
     GOOGLE_CREDENTIALS_PATH = Path(os.getenv("GOOGLE_CREDENTIALS_PATH", "credentials.json"))
+    SHEETS_CACHE_TTL = float(os.getenv("SHEETS_CACHE_TTL", "30"))  # Seconds a worksheet snapshot is reused (0 = no cache)
+    SHEETS_FLUSH_INTERVAL = float(os.getenv("SHEETS_FLUSH_INTERVAL", "2"))  # Seconds queued battle results are batched before writing
+    STORY_PROGRESS_TTL = float(os.getenv("STORY_PROGRESS_TTL", "10"))  # Seconds the story progress map is reused by the story/endless engines
+    SHEETS_READS_PER_MINUTE = float(os.getenv("SHEETS_READS_PER_MINUTE", "60"))  # Sheets API read budget (per-user quota is 60/min)
+    SHEETS_WRITES_PER_MINUTE = float(os.getenv("SHEETS_WRITES_PER_MINUTE", "60"))  # Sheets API write budget
+    SHEETS_MAX_RETRIES = int(os.getenv("SHEETS_MAX_RETRIES", "5"))  # Retries for 429/5xx responses (exponential backoff)
+    SHEETS_LOCAL_MIRROR = os.getenv("SHEETS_LOCAL_MIRROR", "false").lower() in ("1", "true", "yes")  # Serve reads from a local SQLite copy and push writes in the background
+    SHEETS_SYNC_INTERVAL = float(os.getenv("SHEETS_SYNC_INTERVAL", "15"))  # Seconds between mirror push/pull cycles
+    SHEETS_FULL_SYNC_INTERVAL = float(os.getenv("SHEETS_FULL_SYNC_INTERVAL", "300"))  # Seconds between full diffs that catch edits made elsewhere
+    CHARACTER_PIPELINE_WORKERS = int(os.getenv("CHARACTER_PIPELINE_WORKERS", "4"))  # Characters generated/processed in parallel on load
+    CHARACTER_PIPELINE_DOWNLOADS = int(os.getenv("CHARACTER_PIPELINE_DOWNLOADS", "4"))  # Concurrent image downloads
+    CHARACTER_PIPELINE_CPU = int(os.getenv("CHARACTER_PIPELINE_CPU", "2"))  # Concurrent sprite (background removal) jobs
+    CHARACTER_PIPELINE_UPLOADS = int(os.getenv("CHARACTER_PIPELINE_UPLOADS", "2"))  # Concurrent Drive uploads / AI analysis requests
 
     # Google Drive Settings (optional - for organizing uploads in a specific folder)
     DRIVE_FOLDER_ID = os.getenv("DRIVE_FOLDER_ID")  # Optional: specify a folder ID to organize uploads
@@ -23,6 +36,13 @@ class Settings:
     # Google Apps Script Settings (for uploading via GAS to use user's storage quota)
     GAS_WEBHOOK_URL = os.getenv("GAS_WEBHOOK_URL")  # Google Apps Script Web App URL
     GAS_SHARED_SECRET = os.getenv("SHARED_SECRET", "oekaki_battler_line_to_gas_secret_shiyow5")  # Secret for GAS authentication
+    GAS_UPLOAD_MAX_SIZE = int(os.getenv("GAS_UPLOAD_MAX_SIZE", "1280"))  # Images are downscaled to this width/height before upload
+
+    # HTTP Settings (Drive downloads and GAS calls share one pooled session)
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "8"))  # Keep-alive connections per host
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))  # Seconds to establish a connection
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))  # Seconds to wait for data
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))  # Retries for connection errors and 429/5xx (GET only)
 
     # Image Processing
     MAX_IMAGE_SIZE = 600  # Maximum width or height while preserving aspect ratio
@@ -42,6 +62,12 @@ class Settings:
     ASSETS_DIR = PROJECT_ROOT / "assets"
     SOUNDS_DIR = ASSETS_DIR / "sounds"
     MUSIC_DIR = ASSETS_DIR / "music"
+    RECORDINGS_DIR = DATA_DIR / "recordings"
+    BATTLE_LOG_DIR = DATA_DIR / "battle_logs"  # Compressed battle logs by battle ID (kept out of the BattleHistory sheet)
+    SHEETS_MIRROR_PATH = DATA_DIR / "sheets_mirror.db"  # Local mirror of the Google Sheets backend (SHEETS_LOCAL_MIRROR)
+    IMAGE_CACHE_DIR = DATA_DIR / "image_cache"  # Downloaded Drive images/sprites (content-addressed)
+    IMAGE_CACHE_MAX_MB = float(os.getenv("IMAGE_CACHE_MAX_MB", "500"))  # Size limit before least recently used images are evicted
+    IMAGE_CACHE_REVALIDATE_HOURS = float(os.getenv("IMAGE_CACHE_REVALIDATE_HOURS", "24"))  # Re-check cached images with the server after this long
     
     # Database
     DATABASE_PATH = DATA_DIR / "database.db"
@@ -56,6 +82,25 @@ class Settings:
     # - 2 = Tertiary monitor (third display)
     # Note: Display indices are 0-based. For 2 monitors, valid indices are 0 and 1.
     BATTLE_DISPLAY_INDEX = int(os.getenv("BATTLE_DISPLAY_INDEX", "1"))
+    # Render battles offscreen with the SDL dummy video driver (no physical display needed)
+    BATTLE_HEADLESS = os.getenv("BATTLE_HEADLESS", "false").lower() in ("1", "true", "yes")
+
+    # Battle Recording Settings
+    # - "" = recording disabled
+    # - "video" = one video file per battle (OpenCV VideoWriter)
+    # - "png" = one PNG sequence directory per battle
+    BATTLE_RECORD_MODE = os.getenv("BATTLE_RECORD_MODE", "")
+    BATTLE_RECORD_FPS = int(os.getenv("BATTLE_RECORD_FPS", "60"))
+    BATTLE_RECORD_QUEUE_SIZE = int(os.getenv("BATTLE_RECORD_QUEUE_SIZE", "120"))
+
+    # Draw HP bars from pre-rendered strips/labels (set to false for the per-frame drawing path)
+    BATTLE_PRERENDERED_HUD = os.getenv("BATTLE_PRERENDERED_HUD", "true").lower() in ("1", "true", "yes")
+
+    # Shared-memory frame output for local capture/streaming tools
+    # - "" = disabled
+    # - any name = publish every battle frame to a shared memory ring buffer with that name
+    BATTLE_SHM_NAME = os.getenv("BATTLE_SHM_NAME", "")
+    BATTLE_SHM_SLOTS = int(os.getenv("BATTLE_SHM_SLOTS", "3"))
     
     # Audio Settings
     ENABLE_SOUND = True
@@ -166,9 +166,8 @@ function handleRegisterCharacterManual(payload, spreadsheetId) {
     var ss = SpreadsheetApp.openById(spreadsheetId);
     var sheet = ss.getSheetByName('Characters') || ss.getSheets()[0];
 
-    // 新しいIDを生成（最終行+1）
-    var lastRow = sheet.getLastRow();
-    var newId = lastRow; // ヘッダー行を考慮
+    // 新しいIDを生成（A列の最大ID+1）
+    var newId = nextCharacterId(sheet);
 
     var now = new Date();
 
@@ -234,8 +233,7 @@ function handleRegisterCharacterAuto(payload, spreadsheetId) {
     var ss = SpreadsheetApp.openById(spreadsheetId);
     var sheet = ss.getSheetByName('Characters') || ss.getSheets()[0];
 
-    var lastRow = sheet.getLastRow();
-    var newId = lastRow;
+    var newId = nextCharacterId(sheet);
 
     var now = new Date();
 
@@ -273,3 +271,21 @@ function handleRegisterCharacterAuto(payload, spreadsheetId) {
     })).setMimeType(ContentService.MimeType.JSON);
   }
 }
+
+// 次のキャラクターIDを生成（A列の最大ID+1）
+// 行数ではなく最大IDを使うので、削除や欠番があっても既存IDと重複しない
+function nextCharacterId(sheet) {
+  var lastRow = sheet.getLastRow();
+  if (lastRow < 2) {
+    return 1;
+  }
+  var ids = sheet.getRange(2, 1, lastRow - 1, 1).getValues();
+  var maxId = 0;
+  for (var i = 0; i < ids.length; i++) {
+    var id = parseInt(ids[i][0], 10);
+    if (!isNaN(id) && id > maxId) {
+      maxId = id;
+    }
+  }
+  return maxId + 1;
+}
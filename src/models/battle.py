@@ -49,6 +49,21 @@ class Battle(BaseModel):
     def add_turn(self, turn: BattleTurn):
         """Add a turn to the battle"""
         self.turns.append(turn)
+
+    def stat_increments(self) -> dict:
+        """Wins/losses/draws to add per fighter (no winner = draw for both)"""
+        if not self.character1_id or not self.character2_id:
+            return {}
+        increments = {}
+        for char_id in (self.character1_id, self.character2_id):
+            delta = increments.setdefault(str(char_id), {'wins': 0, 'losses': 0, 'draws': 0})
+            if not self.winner_id:
+                delta['draws'] += 1
+            elif self.winner_id == char_id:
+                delta['wins'] += 1
+            else:
+                delta['losses'] += 1
+        return increments
         
     def to_dict(self) -> dict:
         """Convert to dictionary for database storage"""
@@ -18,6 +18,7 @@ class Character(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     battle_count: int = 0
     win_count: int = 0
+    draw_count: int = 0  # Included in battle_count (Google Sheets backend only)
 
     @model_validator(mode='after')
     def check_total_stats(self):
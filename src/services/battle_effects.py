@@ -6,7 +6,7 @@ Handles all visual effects including particles, screen shake, and animations
 import pygame
 import math
 import random
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Dict, Any
 from dataclasses import dataclass
 
 @dataclass
@@ -23,6 +23,20 @@ class Particle:
     gravity: float = 0.2
     fade: bool = True
 
+    def reset(self, x: float, y: float, vx: float, vy: float, life: float,
+              color: Tuple[int, int, int], size: float, gravity: float = 0.2, fade: bool = True):
+        """Reinitialize a pooled particle in place"""
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.life = life
+        self.max_life = life
+        self.color = color
+        self.size = size
+        self.gravity = gravity
+        self.fade = fade
+
     def update(self, dt: float = 1.0):
         """Update particle position and lifetime"""
         self.x += self.vx * dt
@@ -46,26 +60,73 @@ class Particle:
 
 
 class BattleEffects:
-    """Manages all battle visual effects"""
+    """Manages all battle visual effects
+
+    Particles come from a fixed-capacity pool that is allocated once, and particle
+    sprites are drawn through reusable per-size scratch surfaces, so long endless
+    sessions don't allocate new objects every frame. When the pool is exhausted new
+    particles are dropped (and counted) instead of growing memory.
+    """
 
-    def __init__(self, screen: pygame.Surface):
+    MAX_PARTICLES = 600
+
+    def __init__(self, screen: pygame.Surface, max_particles: int = MAX_PARTICLES):
         self.screen = screen
-        self.particles: List[Particle] = []
+        self.max_particles = max(1, max_particles)
+        self.particles: List[Particle] = []  # Live particles
+        self._free_particles: List[Particle] = [
+            Particle(x=0.0, y=0.0, vx=0.0, vy=0.0, life=0.0, max_life=1.0,
+                     color=(0, 0, 0), size=0.0)
+            for _ in range(self.max_particles)
+        ]
+        self._scratch_surfaces: Dict[int, pygame.Surface] = {}
+        self.peak_particles = 0
+        self.particles_dropped = 0
         self.screen_shake_intensity = 0.0
         self.screen_shake_duration = 0.0
         self.screen_offset = [0, 0]
 
     def add_particle(self, x: float, y: float, vx: float, vy: float,
                     life: float, color: Tuple[int, int, int],
-                    size: float = 3.0, gravity: float = 0.2, fade: bool = True):
-        """Add a new particle to the effect system"""
-        particle = Particle(
-            x=x, y=y, vx=vx, vy=vy,
-            life=life, max_life=life,
-            color=color, size=size,
-            gravity=gravity, fade=fade
-        )
+                    size: float = 3.0, gravity: float = 0.2, fade: bool = True) -> Optional[Particle]:
+        """Take a particle from the pool and add it to the effect system
+
+        Returns:
+            The live particle, or None if the pool is full
+        """
+        if not self._free_particles:
+            self.particles_dropped += 1
+            return None
+
+        particle = self._free_particles.pop()
+        particle.reset(x, y, vx, vy, life, color, size, gravity=gravity, fade=fade)
         self.particles.append(particle)
+        if len(self.particles) > self.peak_particles:
+            self.peak_particles = len(self.particles)
+        return particle
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get particle pool utilisation statistics"""
+        live = len(self.particles)
+        return {
+            'capacity': self.max_particles,
+            'live': live,
+            'free': len(self._free_particles),
+            'peak': self.peak_particles,
+            'dropped': self.particles_dropped,
+            'utilisation': live / self.max_particles,
+            'scratch_surfaces': len(self._scratch_surfaces)
+        }
+
+    def _get_scratch_surface(self, size: int) -> pygame.Surface:
+        """Get a cleared SRCALPHA surface for drawing a particle of the given radius"""
+        surface = self._scratch_surfaces.get(size)
+        if surface is None:
+            surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            self._scratch_surfaces[size] = surface
+        else:
+            surface.fill((0, 0, 0, 0))
+        return surface
 
     def create_explosion(self, x: float, y: float, particle_count: int = 20,
                         color: Tuple[int, int, int] = (255, 100, 0)):
@@ -178,10 +239,15 @@ class BattleEffects:
 
     def update(self, dt: float = 1.0):
         """Update all effects"""
-        # Update particles
-        self.particles = [p for p in self.particles if p.is_alive()]
+        # Update particles and return dead ones to the pool
+        alive = []
         for particle in self.particles:
-            particle.update(dt)
+            if particle.is_alive():
+                particle.update(dt)
+                alive.append(particle)
+            else:
+                self._free_particles.append(particle)
+        self.particles = alive
 
         # Update screen shake
         if self.screen_shake_duration > 0:
@@ -201,8 +267,8 @@ class BattleEffects:
                 if size > 0:
                     alpha = particle.get_alpha()
 
-                    # Create surface with alpha
-                    surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                    # Reuse a scratch surface with alpha for this size
+                    surface = self._get_scratch_surface(size)
                     # Ensure all color values are integers
                     color_with_alpha = (
                         int(particle.color[0]),
@@ -221,6 +287,7 @@ class BattleEffects:
 
     def clear(self):
         """Clear all effects"""
+        self._free_particles.extend(self.particles)
         self.particles.clear()
         self.screen_shake_intensity = 0
         self.screen_shake_duration = 0
@@ -13,6 +13,10 @@ from typing import Tuple, List, Optional
 from src.models import Character, Battle, BattleTurn, BattleResult
 from src.services.audio_manager import audio_manager
 from src.services.battle_effects import BattleEffects, CharacterAnimator
+from src.services.battle_recorder import BattleRecorder
+from src.services.image_cache import image_cache
+from src.services.frame_ring_buffer import acquire_frame_sink, release_frame_sink
+from src.services.font_service import FontService
 from config.settings import Settings
 
 logging.basicConfig(level=logging.INFO)
@@ -47,15 +51,142 @@ class BattleEngine:
         self.char1_base_pos = (250, 350)
         self.char2_base_pos = (774, 350)
 
-        # Font cache for performance
-        self._font_cache = {}
+        # Font service (resolved font path + per-size font cache)
+        self.font_service = FontService()
+
+        # Pre-rendered HUD (HP bar strips, frames and labels built once per battle)
+        self.use_prerendered_hud = Settings.BATTLE_PRERENDERED_HUD
+        self._hud_cache = None
 
         # Effect systems
         self.effects = None
         self.animator = None
-        
+
+        # Offscreen rendering and frame output
+        self.headless = Settings.BATTLE_HEADLESS
+        self.record_mode = Settings.BATTLE_RECORD_MODE or None  # "video", "png" or None
+        self.record_dir = Settings.RECORDINGS_DIR
+        self.frame_sinks = []  # Objects with write_frame(surface) and close()
+        self.recorder = None
+        self.last_recording_stats = None
+        self.shared_frame_sink = None
+
+        if Settings.BATTLE_SHM_NAME:
+            self.enable_shared_memory_output(Settings.BATTLE_SHM_NAME, Settings.BATTLE_SHM_SLOTS)
+
+    def enable_recording(self, mode: str = BattleRecorder.MODE_VIDEO, output_dir=None, headless: bool = None):
+        """Record every following battle to its own clip
+
+        Args:
+            mode: "video" for a video file per battle, "png" for a PNG sequence per battle
+            output_dir: Directory for recordings (default: Settings.RECORDINGS_DIR)
+            headless: If True, render offscreen with the SDL dummy video driver
+        """
+        if mode not in (BattleRecorder.MODE_VIDEO, BattleRecorder.MODE_PNG):
+            raise ValueError(f"Unsupported recording mode: {mode}")
+        self.record_mode = mode
+        if output_dir is not None:
+            self.record_dir = Path(output_dir)
+        if headless is not None:
+            self.headless = headless
+        logger.info(f"Battle recording enabled ({mode}) -> {self.record_dir}")
+
+    def disable_recording(self):
+        """Stop recording battles"""
+        self._stop_recording()
+        self.record_mode = None
+
+    def enable_shared_memory_output(self, name: str, slot_count: int = 3):
+        """Publish every rendered frame to a shared memory ring buffer
+
+        The buffer stays alive across battles so an external capture process can
+        stay attached. Engines in one process share the buffer of a name; it is
+        unlinked when the last of them calls cleanup() or disable_shared_memory_output().
+
+        Args:
+            name: Shared memory block name (consumers attach with SharedMemoryFrameReader)
+            slot_count: Number of frames kept in the ring
+        """
+        self.disable_shared_memory_output()
+        self.shared_frame_sink = acquire_frame_sink(name, slot_count=slot_count)
+        self.add_frame_sink(self.shared_frame_sink)
+        logger.info(f"Shared-memory frame output enabled: {name}")
+
+    def disable_shared_memory_output(self):
+        """Stop publishing frames to shared memory and release this engine's hold on the buffer"""
+        if not self.shared_frame_sink:
+            return
+
+        try:
+            self.remove_frame_sink(self.shared_frame_sink)
+            release_frame_sink(self.shared_frame_sink)
+        except Exception as e:
+            logger.error(f"Error closing shared-memory frame output: {e}")
+        finally:
+            self.shared_frame_sink = None
+
+    def add_frame_sink(self, sink):
+        """Register a frame sink that receives every rendered battle frame"""
+        if sink not in self.frame_sinks:
+            self.frame_sinks.append(sink)
+
+    def remove_frame_sink(self, sink):
+        """Unregister a frame sink (the sink is not closed)"""
+        if sink in self.frame_sinks:
+            self.frame_sinks.remove(sink)
+
+    def _start_recording(self, battle: Battle):
+        """Create a recorder for the current battle if recording is enabled"""
+        if not self.record_mode or self.recorder:
+            return
+
+        try:
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            clip_name = f"battle_{timestamp}_{battle.id[:8]}"
+            if self.record_mode == BattleRecorder.MODE_VIDEO:
+                output_path = Path(self.record_dir) / f"{clip_name}.mp4"
+            else:
+                output_path = Path(self.record_dir) / clip_name
+
+            recorder = BattleRecorder(
+                output_path,
+                mode=self.record_mode,
+                fps=Settings.BATTLE_RECORD_FPS,
+                queue_size=Settings.BATTLE_RECORD_QUEUE_SIZE
+            )
+            if recorder.start():
+                self.recorder = recorder
+                self.add_frame_sink(recorder)
+        except Exception as e:
+            logger.error(f"Failed to start battle recording: {e}")
+
+    def _stop_recording(self):
+        """Finish the current recording and keep its statistics"""
+        if not self.recorder:
+            return
+
+        try:
+            self.remove_frame_sink(self.recorder)
+            self.recorder.close()
+            self.last_recording_stats = self.recorder.get_stats()
+        except Exception as e:
+            logger.error(f"Error stopping battle recording: {e}")
+        finally:
+            self.recorder = None
+
+    def _emit_frame(self):
+        """Hand the finished frame to all registered frame sinks"""
+        for sink in list(self.frame_sinks):
+            try:
+                sink.write_frame(self.screen)
+            except Exception as e:
+                logger.warning(f"Frame sink {type(sink).__name__} failed: {e}")
+
     def initialize_display(self) -> bool:
         """Initialize Pygame display for battle visualization"""
+        if self.headless:
+            return self._initialize_headless_display()
+
         try:
             # Detect monitors BEFORE any pygame display operations
             # and set environment variable for window positioning
@@ -149,82 +280,58 @@ class BattleEngine:
 
             pygame.display.set_caption("お絵描きバトラー - Battle Arena")
 
+            return self._finish_display_setup()
+        except Exception as e:
+            logger.error(f"Failed to initialize battle display: {e}")
+            return False
+
+    def _initialize_headless_display(self) -> bool:
+        """Initialize an offscreen display using the SDL dummy video driver"""
+        try:
+            if not pygame.get_init():
+                pygame.init()
+                self.pygame_initialized = True
+
+            # The video driver is chosen when the display subsystem starts,
+            # so restart it with the dummy driver and restore the previous value afterwards
+            if pygame.display.get_init():
+                pygame.display.quit()
+                self.screen = None
+
+            previous_driver = os.environ.get('SDL_VIDEODRIVER')
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            try:
+                pygame.display.init()
+                self.screen = pygame.display.set_mode((Settings.SCREEN_WIDTH, Settings.SCREEN_HEIGHT))
+            finally:
+                if previous_driver is None:
+                    os.environ.pop('SDL_VIDEODRIVER', None)
+                else:
+                    os.environ['SDL_VIDEODRIVER'] = previous_driver
+
+            self.screen_width = self.screen.get_width()
+            self.screen_height = self.screen.get_height()
+            logger.info(f"Headless battle display created ({self.screen_width}x{self.screen_height})")
+
+            return self._finish_display_setup()
+        except Exception as e:
+            logger.error(f"Failed to initialize headless battle display: {e}")
+            return False
+
+    def _finish_display_setup(self) -> bool:
+        """Load fonts, effects and layout values once the display surface exists"""
+        try:
             # Initialize clock if needed
             if self.clock is None:
                 self.clock = pygame.time.Clock()
             
-            # Load fonts with Japanese and emoji support
+            # Load fonts with Japanese and emoji support (path resolved once and persisted)
             if self.font is None:
-                try:
-                    # Try to load a Japanese font with emoji support
-                    japanese_fonts = [
-                        "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",  # Linux Noto (best for CJK + emoji fallback)
-                        "/usr/share/fonts/truetype/noto-cjk/NotoSansCJK-Regular.ttc",  # Linux alternative path
-                        "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",  # Linux alternative path
-                        "/System/Library/Fonts/ヒラギノ角ゴシック W3.ttc",  # macOS
-                        "C:/Windows/Fonts/msgothic.ttc",  # Windows
-                        "/usr/share/fonts/truetype/fonts-japanese-gothic.ttf",  # Linux system font
-                        "/usr/share/fonts/truetype/fonts-japanese-mincho.ttf",  # Linux system font
-                        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",  # Linux fallback
-                    ]
+                self.japanese_font_path = self.font_service.resolve_font_path()
+                self.font = self._create_font(28 if self.japanese_font_path else 36)
 
-                    font_loaded = False
-                    for font_path in japanese_fonts:
-                        try:
-                            if Path(font_path).exists():
-                                self.font = pygame.font.Font(font_path, 28)
-                                self.japanese_font_path = font_path  # Store the font path
-                                font_loaded = True
-                                logger.info(f"Loaded Japanese font: {font_path}")
-                                break
-                        except:
-                            continue
-
-                    if not font_loaded:
-                        # Fallback to default font
-                        self.font = pygame.font.Font(None, 36)
-                        self.japanese_font_path = None
-                        logger.warning("Could not load Japanese font, using default")
-
-                except Exception as e:
-                    logger.error(f"Error loading font: {e}")
-                    self.font = pygame.font.Font(None, 36)
-                    self.japanese_font_path = None
-            
             if self.small_font is None:
-                try:
-                    # Use the same font path if available
-                    if self.japanese_font_path:
-                        self.small_font = pygame.font.Font(self.japanese_font_path, 18)
-                    else:
-                        # Try to load a Japanese font with emoji support
-                        japanese_fonts = [
-                            "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-                            "/usr/share/fonts/truetype/noto-cjk/NotoSansCJK-Regular.ttc",
-                            "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-                            "/System/Library/Fonts/ヒラギノ角ゴシック W3.ttc",
-                            "C:/Windows/Fonts/msgothic.ttc",
-                            "/usr/share/fonts/truetype/fonts-japanese-gothic.ttf",
-                            "/usr/share/fonts/truetype/fonts-japanese-mincho.ttf",
-                            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-                        ]
-
-                        font_loaded = False
-                        for font_path in japanese_fonts:
-                            try:
-                                if Path(font_path).exists():
-                                    self.small_font = pygame.font.Font(font_path, 18)
-                                    font_loaded = True
-                                    break
-                            except:
-                                continue
-
-                        if not font_loaded:
-                            self.small_font = pygame.font.Font(None, 24)
-
-                except Exception as e:
-                    logger.error(f"Error loading small font: {e}")
-                    self.small_font = pygame.font.Font(None, 24)
+                self.small_font = self._create_font(18 if self.japanese_font_path else 24)
 
             # Initialize effect systems
             self.effects = BattleEffects(self.screen)
@@ -242,10 +349,13 @@ class BattleEngine:
             self.char1_base_pos = (int(250 * self.screen_scale_x), int(350 * self.screen_scale_y))
             self.char2_base_pos = (int((self.screen_width - 250 * self.screen_scale_x)), int(350 * self.screen_scale_y))
 
+            # Open every HUD font size now so no font file is opened mid-animation
+            self.font_service.prewarm(self._get_hud_font_sizes())
+
             logger.info(f"Battle display initialized successfully (scale: {self.screen_scale:.2f}x)")
             return True
         except Exception as e:
-            logger.error(f"Failed to initialize battle display: {e}")
+            logger.error(f"Failed to finish battle display setup: {e}")
             return False
     
     def start_battle(self, char1: Character, char2: Character, visual_mode: bool = True) -> Battle:
@@ -278,6 +388,7 @@ class BattleEngine:
                 if not self.initialize_display():
                     visual_mode = False
                 else:
+                    self._start_recording(battle)
                     # Show battle start screen with countdown
                     self._show_battle_start_screen(char1, char2)
             
@@ -861,12 +972,127 @@ class BattleEngine:
             # Update display
             pygame.display.flip()
 
+            # Hand the finished frame to recording/capture sinks
+            if self.frame_sinks:
+                self._emit_frame()
+
         except Exception as e:
             logger.error(f"Error rendering battle frame: {e}")
 
+    # HP bar fill colors by health percentage (same thresholds as the per-frame path)
+    HP_BAR_COLORS = {
+        'green': (0, 255, 0),
+        'yellow': (255, 255, 0),
+        'red': (255, 0, 0)
+    }
+
+    @staticmethod
+    def _get_hp_color_key(hp_ratio: float) -> str:
+        """Get the HP bar color tier for a health ratio"""
+        if hp_ratio > 0.5:
+            return 'green'
+        elif hp_ratio > 0.25:
+            return 'yellow'
+        return 'red'
+
+    def _render_outlined_text(self, font: pygame.font.Font, text: str, outline_offset: int) -> pygame.Surface:
+        """Render white text with a black outline onto a padded transparent surface"""
+        main = font.render(text, True, (255, 255, 255))
+        outline = font.render(text, True, (0, 0, 0))
+        surface = pygame.Surface((main.get_width() + outline_offset * 2, main.get_height() + outline_offset * 2), pygame.SRCALPHA)
+        for dx in [-outline_offset, 0, outline_offset]:
+            for dy in [-outline_offset, 0, outline_offset]:
+                if dx != 0 or dy != 0:
+                    surface.blit(outline, (outline_offset + dx, outline_offset + dy))
+        surface.blit(main, (outline_offset, outline_offset))
+        return surface
+
+    def _build_hud_cache(self, char1: Character, char2: Character, scale: float) -> dict:
+        """Pre-render HP bar strips, frames and label pieces for the current battle"""
+        hp_bar_width = int(280 * scale)
+        hp_bar_height = int(30 * scale)
+        border_width = max(1, int(3 * scale))
+
+        # Fill strips: one full-width bar per color tier with a vertical shading gradient
+        strips = {}
+        for key, (r, g, b) in self.HP_BAR_COLORS.items():
+            strip = pygame.Surface((hp_bar_width, hp_bar_height))
+            for y in range(hp_bar_height):
+                shade = 1.0 - 0.35 * (y / max(1, hp_bar_height - 1))
+                pygame.draw.line(strip, (int(r * shade), int(g * shade), int(b * shade)), (0, y), (hp_bar_width, y))
+            strips[key] = strip.convert() if pygame.display.get_surface() else strip
+
+        # Empty bar background and border drawn on top of the fill
+        background = pygame.Surface((hp_bar_width, hp_bar_height))
+        background.fill((80, 80, 80))
+        frame = pygame.Surface((hp_bar_width, hp_bar_height), pygame.SRCALPHA)
+        pygame.draw.rect(frame, (0, 0, 0), frame.get_rect(), border_width)
+
+        # Labels: "HP: " prefix, digit glyphs and each fighter's "/max" suffix
+        hp_font = self._create_font(int(36 * scale))
+        outline_offset = max(1, int(2 * scale))
+        glyphs = {}
+        for piece in ["HP: "] + [str(d) for d in range(10)] + ["-"]:
+            glyphs[piece] = (self._render_outlined_text(hp_font, piece, outline_offset), hp_font.size(piece)[0])
+        for char in (char1, char2):
+            suffix = f"/{char.hp}"
+            glyphs[suffix] = (self._render_outlined_text(hp_font, suffix, outline_offset), hp_font.size(suffix)[0])
+
+        return {
+            'key': (round(scale, 4), char1.id, char1.hp, char2.id, char2.hp),
+            'width': hp_bar_width,
+            'height': hp_bar_height,
+            'strips': strips,
+            'background': background,
+            'frame': frame,
+            'glyphs': glyphs,
+            'outline_offset': outline_offset
+        }
+
+    def _get_hud_cache(self, char1: Character, char2: Character, scale: float) -> dict:
+        """Get the pre-rendered HUD for this battle, rebuilding it if fighters or scale changed"""
+        key = (round(scale, 4), char1.id, char1.hp, char2.id, char2.hp)
+        if self._hud_cache is None or self._hud_cache['key'] != key:
+            self._hud_cache = self._build_hud_cache(char1, char2, scale)
+        return self._hud_cache
+
+    def _blit_hp_label(self, hud: dict, char: Character, current_hp: int, position: Tuple[int, int]):
+        """Compose "HP: current/max" from pre-rendered glyphs"""
+        glyphs = hud['glyphs']
+        x, y = position
+        offset = hud['outline_offset']
+        for piece in ["HP: "] + list(str(current_hp)) + [f"/{char.hp}"]:
+            surface, advance = glyphs[piece]
+            self.screen.blit(surface, (x - offset, y - offset))
+            x += advance
+
+    def _draw_hp_bars_prerendered(self, char1: Character, char2: Character, char1_pos: Tuple[int, int], char2_pos: Tuple[int, int], char1_hp: int, char2_hp: int, scale: float = 1.0):
+        """Draw HP bars by blitting pre-rendered surfaces (no per-frame color math or rect drawing)"""
+        hud = self._get_hud_cache(char1, char2, scale)
+        hp_bar_offset_x = int(140 * scale)
+        hp_bar_offset_y = int(185 * scale)
+        hp_text_offset_y = int(225 * scale)
+
+        for char, pos, current_hp in ((char1, char1_pos, char1_hp), (char2, char2_pos, char2_hp)):
+            hp_ratio = max(0, current_hp / char.hp)
+            bar_pos = (pos[0] - hp_bar_offset_x, pos[1] - hp_bar_offset_y)
+            fill_width = min(hud['width'], int(hud['width'] * hp_ratio))
+
+            self.screen.blit(hud['background'], bar_pos)
+            if fill_width > 0:
+                strip = hud['strips'][self._get_hp_color_key(hp_ratio)]
+                self.screen.blit(strip, bar_pos, pygame.Rect(0, 0, fill_width, hud['height']))
+            self.screen.blit(hud['frame'], bar_pos)
+
+            self._blit_hp_label(hud, char, current_hp, (pos[0] - hp_bar_offset_x, pos[1] - hp_text_offset_y))
+
     def _draw_hp_bars(self, char1: Character, char2: Character, char1_pos: Tuple[int, int], char2_pos: Tuple[int, int], char1_hp: int, char2_hp: int, shake_offset: List[int], scale: float = 1.0):
         """Draw HP bars for both characters"""
         try:
+            if self.use_prerendered_hud:
+                self._draw_hp_bars_prerendered(char1, char2, char1_pos, char2_pos, char1_hp, char2_hp, scale)
+                return
+
             # HP bar dimensions
             hp_bar_width = int(280 * scale)  # Increased to 280 to accommodate larger text
             hp_bar_height = int(30 * scale)  # Increased from 25 to 30 for better visibility
@@ -1327,15 +1553,14 @@ class BattleEngine:
             if image_path:
                 # Check if it's a URL (http:// or https://)
                 if image_path.startswith('http://') or image_path.startswith('https://'):
-                    # URL detected - try to find local cached sprite instead
-                    sprite_cache_path = Settings.SPRITES_DIR / f"char_{character.id}_sprite.png"
-                    if sprite_cache_path.exists():
-                        logger.info(f"Using cached sprite for character {character.name}: {sprite_cache_path}")
-                        image_path = str(sprite_cache_path)
+                    # URL detected - resolve through the image cache (downloads at most once per URL)
+                    cached_path = image_cache.resolve(image_path)
+                    if cached_path:
+                        logger.info(f"Using cached sprite for character {character.name}: {cached_path}")
+                        image_path = cached_path
                     else:
-                        logger.warning(f"Character {character.name} has URL path but no local sprite cache found")
+                        logger.warning(f"Character {character.name} has URL path but the image could not be downloaded")
                         logger.warning(f"  URL: {image_path}")
-                        logger.warning(f"  Expected cache: {sprite_cache_path}")
                         return None
                 # If it's a relative path, make it relative to the project root
                 elif not Path(image_path).is_absolute():
@@ -1365,25 +1590,24 @@ class BattleEngine:
             return None
 
     def _create_font(self, size: int) -> pygame.font.Font:
-        """Create a font with Japanese support at the specified size (with caching for performance)"""
-        # Check cache first
-        if size in self._font_cache:
-            return self._font_cache[size]
-
+        """Create a font with Japanese support at the specified size (cached by the font service)"""
         try:
-            if self.japanese_font_path:
-                font = pygame.font.Font(self.japanese_font_path, size)
-            else:
-                # Fallback to default font if no Japanese font available
-                font = pygame.font.Font(None, size)
-
-            # Cache the font for future use
-            self._font_cache[size] = font
-            return font
+            return self.font_service.get_font(size)
         except Exception as e:
             logger.warning(f"Failed to create font with size {size}: {e}")
             return self.font  # Return the default font as fallback
 
+    def _get_hud_font_sizes(self) -> List[int]:
+        """Get every font size used by the battle screens at the current screen size"""
+        scale = self.screen_scale  # Base: 1024x768 (battle frame and result screen)
+        start_scale = min(self.screen_width / 1920, self.screen_height / 1080)  # Base: 1920x1080 (start screen)
+
+        battle_sizes = [40, 36, 72, 52, 48, 56]  # Names, HP, damage, action text
+        result_sizes = [120, 60, 28, 40, 20]  # Victory, name, stats, button, instructions
+        sizes = [int(base * scale) for base in battle_sizes + result_sizes]
+        sizes += [int(36 * start_scale * 1.5), 180, 120]  # Start screen names, countdown, FIGHT!
+        return sizes
+
     def _show_battle_result(self, battle: Battle, char1: Character, char2: Character, char1_hp: int, char2_hp: int):
         """Show final battle result screen"""
         if not self.screen:
@@ -1638,7 +1862,7 @@ class BattleEngine:
             # Wait for user input or auto-close after 10 seconds
             waiting = True
             clock = pygame.time.Clock()
-            auto_close_time = 10.0  # Auto-close after 10 seconds
+            auto_close_time = 10.0 if not self.headless else 0.0  # Auto-close after 10 seconds (nobody can click offscreen)
             elapsed_time = 0.0
 
             while waiting:
@@ -1747,8 +1971,12 @@ class BattleEngine:
             # Reset battle state
             self.current_battle = None
 
+            # Finish the recording for this battle
+            self._stop_recording()
+
             # Clear sprite cache to free memory
             self.battle_sprites.clear()
+            self._hud_cache = None
 
             # Clear effect systems
             if self.effects:
@@ -1795,6 +2023,7 @@ class BattleEngine:
             # Stop any playing audio
             audio_manager.stop_bgm()
             audio_manager.cleanup()
+            self.disable_shared_memory_output()
             
             if pygame.get_init():
                 pygame.quit()
@@ -1803,6 +2032,7 @@ class BattleEngine:
                 self.clock = None
                 self.font = None
                 self.small_font = None
+                self.font_service.clear()
             logger.info("Battle engine cleaned up")
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Compressed storage for battle logs outside the BattleHistory sheet
+Each log is kept as data/battle_logs/{battle_id}.txt.gz so history rows stay
+small and a log is only read when a detail view asks for it
+"""
+
+import gzip
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class BattleLogStore:
+    """Battle ID -> gzip-compressed battle log file"""
+
+    def __init__(self, log_dir: Optional[Path] = None):
+        self.log_dir = Path(log_dir) if log_dir else Settings.BATTLE_LOG_DIR
+
+    def _path(self, battle_id) -> Path:
+        return self.log_dir / f"{battle_id}.txt.gz"
+
+    def save(self, battle_id, battle_log: List[str]) -> bool:
+        """Write a battle log (one entry per line) atomically"""
+        try:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(battle_id)
+            tmp_path = path.with_name(path.name + '.tmp')
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write('\n'.join(str(entry) for entry in battle_log))
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving battle log {battle_id}: {e}")
+            return False
+
+    def load(self, battle_id) -> Optional[List[str]]:
+        """Read a battle log, or None if it is not stored locally"""
+        path = self._path(battle_id)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                text = f.read()
+            return text.split('\n') if text else []
+        except Exception as e:
+            logger.error(f"Error reading battle log {battle_id}: {e}")
+            return None
+
+    def contains(self, battle_id) -> bool:
+        return self._path(battle_id).exists()
+
+    def delete(self, battle_id):
+        """Remove a stored battle log"""
+        try:
+            self._path(battle_id).unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not delete battle log {battle_id}: {e}")
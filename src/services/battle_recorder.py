@@ -0,0 +1,189 @@
+"""
+Offscreen battle recorder
+Captures rendered battle frames and encodes them to a PNG sequence or a video file
+on a background thread so the render loop never waits on encoding
+"""
+
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+try:
+    import cv2
+    import numpy as np
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+class BattleRecorder:
+    """Frame sink that writes battle frames to disk through a bounded queue
+
+    The render thread only copies the surface pixels and hands them to the queue.
+    If the encoder falls behind and the queue is full, the frame is dropped and
+    counted instead of blocking the battle animation.
+    """
+
+    MODE_PNG = "png"
+    MODE_VIDEO = "video"
+
+    def __init__(self, output_path, mode: str = MODE_VIDEO, fps: int = 60,
+                 queue_size: int = 120, fourcc: str = "mp4v"):
+        """
+        Args:
+            output_path: Directory for PNG sequences, or file path for video output
+            mode: "png" for a numbered PNG sequence, "video" for an OpenCV VideoWriter stream
+            fps: Frame rate written to the video container
+            queue_size: Maximum number of frames waiting for the encoder
+            fourcc: FourCC codec code used in video mode
+        """
+        if mode not in (self.MODE_PNG, self.MODE_VIDEO):
+            raise ValueError(f"Unsupported recording mode: {mode}")
+
+        self.output_path = Path(output_path)
+        self.mode = mode
+        self.fps = fps
+        self.fourcc = fourcc
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+        self._thread: Optional[threading.Thread] = None
+        self._writer = None
+        self._running = False
+        self._failed = False  # Set when the output can't be opened; later frames are discarded
+
+        # Statistics
+        self.frames_submitted = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.encode_errors = 0
+        self._started_at = 0.0
+
+    def start(self) -> bool:
+        """Start the encoder thread"""
+        if self._running:
+            return True
+
+        if not CV2_AVAILABLE:
+            logger.error("OpenCV is not available, battle recording disabled")
+            return False
+
+        try:
+            if self.mode == self.MODE_PNG:
+                self.output_path.mkdir(parents=True, exist_ok=True)
+            else:
+                self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logger.error(f"Failed to prepare recording output {self.output_path}: {e}")
+            return False
+
+        self._running = True
+        self._started_at = time.time()
+        self._thread = threading.Thread(target=self._encode_loop, name="BattleRecorder", daemon=True)
+        self._thread.start()
+        logger.info(f"Battle recording started ({self.mode}): {self.output_path}")
+        return True
+
+    def write_frame(self, surface: pygame.Surface):
+        """Copy a finished frame and queue it for encoding (never blocks)"""
+        if not self._running or self._failed:
+            return
+
+        try:
+            width, height = surface.get_size()
+            pixels = pygame.image.tobytes(surface, "RGB")
+        except Exception as e:
+            logger.warning(f"Failed to capture frame: {e}")
+            return
+
+        index = self.frames_submitted
+        self.frames_submitted += 1
+
+        try:
+            self._queue.put_nowait((index, width, height, pixels))
+        except queue.Full:
+            # Backpressure: drop the frame rather than stall the render loop
+            self.frames_dropped += 1
+            if self.frames_dropped == 1 or self.frames_dropped % 100 == 0:
+                logger.warning(f"Recorder queue full, dropped {self.frames_dropped} frame(s) so far")
+
+    def close(self):
+        """Flush pending frames, stop the encoder thread and release the writer"""
+        if not self._running:
+            return
+
+        self._running = False
+        self._queue.put(None)  # Sentinel - wait for encoder to drain the queue
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+        stats = self.get_stats()
+        logger.info(f"Battle recording finished: {stats['frames_written']} frame(s) written, "
+                    f"{stats['frames_dropped']} dropped ({stats['drop_rate']:.1f}%)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get recording statistics"""
+        drop_rate = (self.frames_dropped / self.frames_submitted * 100) if self.frames_submitted else 0.0
+        return {
+            'mode': self.mode,
+            'output_path': str(self.output_path),
+            'frames_submitted': self.frames_submitted,
+            'frames_written': self.frames_written,
+            'frames_dropped': self.frames_dropped,
+            'encode_errors': self.encode_errors,
+            'failed': self._failed,
+            'queue_depth': self._queue.qsize(),
+            'drop_rate': drop_rate,
+            'elapsed': time.time() - self._started_at if self._started_at else 0.0
+        }
+
+    def _encode_loop(self):
+        """Encoder thread: drain the queue and write frames"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            index, width, height, pixels = item
+            if self._failed:
+                continue
+
+            try:
+                frame = np.frombuffer(pixels, dtype=np.uint8).reshape((height, width, 3))
+                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+
+                if self.mode == self.MODE_PNG:
+                    frame_path = self.output_path / f"frame_{index:06d}.png"
+                    if not cv2.imwrite(str(frame_path), frame):
+                        raise IOError(f"cv2.imwrite failed for {frame_path}")
+                else:
+                    if self._writer is None:
+                        self._writer = cv2.VideoWriter(
+                            str(self.output_path),
+                            cv2.VideoWriter_fourcc(*self.fourcc),
+                            self.fps,
+                            (width, height)
+                        )
+                        if not self._writer.isOpened():
+                            # Stop encoding instead of writing every later frame to a closed writer
+                            self._writer.release()
+                            self._writer = None
+                            self._failed = True
+                            raise IOError(f"Could not open VideoWriter for {self.output_path}")
+                    self._writer.write(frame)
+
+                self.frames_written += 1
+            except Exception as e:
+                self.encode_errors += 1
+                if self.encode_errors == 1:
+                    logger.error(f"Error encoding battle frame {index}: {e}")
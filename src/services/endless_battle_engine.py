@@ -8,6 +8,7 @@ import random
 from typing import List, Optional, Dict, Any
 from src.models import Character, Battle
 from src.services.battle_engine import BattleEngine
+from config.settings import Settings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,6 +27,8 @@ class EndlessBattleEngine:
         self.champion_wins = 0
         self.known_character_ids = set()
         self.endless_access_granted_ids = set()  # Track characters who have been granted endless access
+        self._progress_map: Optional[Dict[str, Any]] = None  # Character ID -> StoryProgress (bulk loaded)
+        self._progress_loaded_at = 0.0
 
     def start_endless_battle(self, visual_mode: bool = False):
         """
@@ -156,6 +159,20 @@ class EndlessBattleEngine:
             'winner_name': winner_name
         }
 
+    def _get_story_progress(self, character_id: str):
+        """Get story progress from the bulk-loaded progress map (one sheet read per TTL)"""
+        if not hasattr(self.db_manager, 'get_all_story_progress'):
+            return self.db_manager.get_story_progress(character_id)
+
+        if self._progress_map is None or time.time() - self._progress_loaded_at >= Settings.STORY_PROGRESS_TTL:
+            progress_map = self.db_manager.get_all_story_progress()
+            if progress_map is None:
+                return self.db_manager.get_story_progress(character_id)
+            self._progress_map = progress_map
+            self._progress_loaded_at = time.time()
+
+        return self._progress_map.get(str(character_id))
+
     def _load_characters(self):
         """Load all characters from database (only those with endless access)"""
         try:
@@ -168,7 +185,7 @@ class EndlessBattleEngine:
                     continue
 
                 # Check endless access via StoryProgress
-                progress = self.db_manager.get_story_progress(char.id)
+                progress = self._get_story_progress(char.id)
                 if progress and progress.endless_access:
                     eligible_characters.append(char)
 
@@ -191,6 +208,10 @@ class EndlessBattleEngine:
         try:
             logger.debug("Checking for new characters with endless access...")
 
+            # Drop cached sheet snapshots so new registrations are visible
+            if hasattr(self.db_manager, 'refresh'):
+                self.db_manager.refresh()
+
             # This call will automatically generate stats for empty characters (HP=0)
             # The get_all_characters() method handles AI generation internally
             all_characters = self.db_manager.get_all_characters()
@@ -205,7 +226,7 @@ class EndlessBattleEngine:
                     continue
 
                 # Check endless access via StoryProgress
-                progress = self.db_manager.get_story_progress(char.id)
+                progress = self._get_story_progress(char.id)
 
                 # Character already known
                 if char.id in self.known_character_ids:
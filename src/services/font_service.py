@@ -0,0 +1,111 @@
+"""
+Font service for battle rendering
+Resolves the Japanese font path once (persisted in user settings) and keeps opened
+pygame fonts per size so they can be pre-loaded before any animation starts
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import pygame
+
+from src.services.settings_manager import settings_manager
+
+logger = logging.getLogger(__name__)
+
+# Japanese fonts with emoji support, in order of preference
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",  # Linux Noto (best for CJK + emoji fallback)
+    "/usr/share/fonts/truetype/noto-cjk/NotoSansCJK-Regular.ttc",  # Linux alternative path
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",  # Linux alternative path
+    "/System/Library/Fonts/ヒラギノ角ゴシック W3.ttc",  # macOS
+    "C:/Windows/Fonts/msgothic.ttc",  # Windows
+    "/usr/share/fonts/truetype/fonts-japanese-gothic.ttf",  # Linux system font
+    "/usr/share/fonts/truetype/fonts-japanese-mincho.ttf",  # Linux system font
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",  # Linux fallback
+]
+
+
+class FontService:
+    """Resolve and cache pygame fonts"""
+
+    def __init__(self):
+        self.font_path: Optional[str] = None
+        self._resolved = False
+        self._fonts: Dict[int, pygame.font.Font] = {}
+
+    def resolve_font_path(self) -> Optional[str]:
+        """Get the Japanese font path, probing the candidates only if no valid path is stored
+
+        Returns:
+            Font file path, or None to use the pygame default font
+        """
+        if self._resolved:
+            return self.font_path
+
+        stored_path = settings_manager.get_setting('font_path', '')
+        if stored_path and Path(stored_path).exists():
+            self.font_path = stored_path
+            logger.info(f"Using stored Japanese font: {stored_path}")
+        else:
+            self.font_path = self._probe_font_path()
+            if self.font_path and self.font_path != stored_path:
+                settings_manager.set_setting('font_path', self.font_path)
+
+        self._resolved = True
+        return self.font_path
+
+    def _probe_font_path(self) -> Optional[str]:
+        """Find the first candidate font that exists and opens"""
+        for font_path in FONT_CANDIDATES:
+            try:
+                if Path(font_path).exists():
+                    pygame.font.Font(font_path, 12)
+                    logger.info(f"Loaded Japanese font: {font_path}")
+                    return font_path
+            except Exception:
+                continue
+
+        logger.warning("Could not load Japanese font, using default")
+        return None
+
+    def get_font(self, size: int) -> pygame.font.Font:
+        """Get a font at the specified size (opened once per size)"""
+        size = max(1, int(size))
+        font = self._fonts.get(size)
+        if font is None:
+            font_path = self.resolve_font_path()
+            try:
+                font = pygame.font.Font(font_path, size)
+            except Exception as e:
+                logger.warning(f"Failed to open {font_path} at size {size}, using default font: {e}")
+                font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+        return font
+
+    def prewarm(self, sizes: Iterable[int]) -> int:
+        """Open all given sizes ahead of time
+
+        Returns:
+            Number of fonts newly opened
+        """
+        start = time.perf_counter()
+        opened = 0
+        for size in sorted({max(1, int(s)) for s in sizes}):
+            if size not in self._fonts:
+                self.get_font(size)
+                opened += 1
+
+        if opened:
+            logger.info(f"Pre-warmed {opened} font size(s) in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return opened
+
+    def cached_sizes(self) -> list:
+        """Get the sizes currently opened"""
+        return sorted(self._fonts)
+
+    def clear(self):
+        """Drop opened fonts (required after pygame.quit invalidates them)"""
+        self._fonts.clear()
@@ -0,0 +1,212 @@
+"""
+Shared-memory frame ring buffer
+Publishes finished battle frames to a multiprocessing.shared_memory block so a local
+capture/streaming process can read lossless frames without screen capture
+"""
+
+import logging
+import struct
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# Buffer layout (little endian)
+#   Header:       magic(4s) version(I) slot_count(I) slot_capacity(I) latest_index(q)
+#   Each slot:    frame_index(q) width(I) height(I) length(I) padding(I) + pixel data (RGB, row-major)
+# latest_index is -1 until the first frame is published. A slot is consistent when its
+# frame_index still matches after the pixel data has been read (the writer updates it last).
+HEADER_FORMAT = "<4sIIIq"
+SLOT_HEADER_FORMAT = "<qIIII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+SLOT_HEADER_SIZE = struct.calcsize(SLOT_HEADER_FORMAT)
+MAGIC = b"OKBF"
+VERSION = 1
+PIXEL_FORMAT = "RGB"
+BYTES_PER_PIXEL = 3
+
+_sinks_lock = threading.Lock()
+_owned_blocks: Dict[str, "SharedMemoryFrameSink"] = {}  # Block name -> sink in this process that created it
+_shared_sinks: Dict[str, "SharedMemoryFrameSink"] = {}  # Block name -> sink handed out by acquire_frame_sink
+
+
+class SharedMemoryFrameSink:
+    """Frame sink that writes each frame into a shared-memory ring buffer"""
+
+    def __init__(self, name: str, slot_count: int = 3, max_size: Optional[Tuple[int, int]] = None):
+        """
+        Args:
+            name: Shared memory block name the consumer attaches to
+            slot_count: Number of frames kept in the ring
+            max_size: Largest (width, height) accepted. Defaults to the first frame's size.
+        """
+        self.name = name
+        self.slot_count = max(2, slot_count)
+        self.max_size = max_size
+        self.slot_capacity = 0
+        self.frame_index = 0
+        self.frames_skipped = 0
+        self.users = 0  # Holders from acquire_frame_sink
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+    def _create(self, width: int, height: int):
+        """Allocate the shared memory block sized for the largest expected frame"""
+        max_w, max_h = self.max_size if self.max_size else (width, height)
+        self.slot_capacity = max_w * max_h * BYTES_PER_PIXEL
+        total_size = HEADER_SIZE + self.slot_count * (SLOT_HEADER_SIZE + self.slot_capacity)
+
+        with _sinks_lock:
+            owner = _owned_blocks.get(self.name)
+            if owner is not None and owner is not self:
+                # Unlinking would cut off the readers attached to the live block
+                raise FileExistsError(f"Shared memory block '{self.name}' is owned by another frame sink "
+                                      f"in this process (use acquire_frame_sink to share it)")
+            try:
+                self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=total_size)
+            except FileExistsError:
+                # No live sink in this process owns it: stale block from a previous run - replace it
+                stale = shared_memory.SharedMemory(name=self.name)
+                stale.close()
+                stale.unlink()
+                self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=total_size)
+            _owned_blocks[self.name] = self
+
+        struct.pack_into(HEADER_FORMAT, self._shm.buf, 0, MAGIC, VERSION,
+                         self.slot_count, self.slot_capacity, -1)
+        logger.info(f"Shared-memory frame buffer '{self.name}' created "
+                    f"({self.slot_count} slots, {max_w}x{max_h}, {total_size / 1024 / 1024:.1f} MB)")
+
+    def write_frame(self, surface: pygame.Surface):
+        """Copy the surface pixels into the next ring slot and publish its index"""
+        width, height = surface.get_size()
+        if self._shm is None:
+            self._create(width, height)
+
+        length = width * height * BYTES_PER_PIXEL
+        if length > self.slot_capacity:
+            self.frames_skipped += 1
+            if self.frames_skipped == 1:
+                logger.warning(f"Frame {width}x{height} exceeds shared buffer capacity, skipping")
+            return
+
+        index = self.frame_index
+        slot_offset = HEADER_SIZE + (index % self.slot_count) * (SLOT_HEADER_SIZE + self.slot_capacity)
+        data_offset = slot_offset + SLOT_HEADER_SIZE
+        buf = self._shm.buf
+
+        # Invalidate the slot, write pixels, then stamp the slot and the global index
+        struct.pack_into("<q", buf, slot_offset, -1)
+        buf[data_offset:data_offset + length] = pygame.image.tobytes(surface, PIXEL_FORMAT)
+        struct.pack_into(SLOT_HEADER_FORMAT, buf, slot_offset, index, width, height, length, 0)
+        struct.pack_into("<q", buf, HEADER_SIZE - 8, index)
+
+        self.frame_index += 1
+
+    def close(self):
+        """Release and unlink the shared memory block"""
+        if self._shm is None:
+            return
+        try:
+            self._shm.close()
+            self._shm.unlink()
+        except Exception as e:
+            logger.warning(f"Error releasing shared frame buffer '{self.name}': {e}")
+        finally:
+            self._shm = None
+            with _sinks_lock:
+                if _owned_blocks.get(self.name) is self:
+                    del _owned_blocks[self.name]
+        logger.info(f"Shared-memory frame buffer '{self.name}' closed after {self.frame_index} frame(s)")
+
+
+def acquire_frame_sink(name: str, slot_count: int = 3) -> SharedMemoryFrameSink:
+    """Get the process-wide sink for a block name, creating it on first use
+
+    Every battle engine publishing to the same name shares one sink, so engines
+    created later (e.g. per story battle) don't replace the block readers are
+    attached to. Pair each call with release_frame_sink().
+    """
+    with _sinks_lock:
+        sink = _shared_sinks.get(name)
+        if sink is None:
+            sink = _shared_sinks[name] = SharedMemoryFrameSink(name, slot_count=slot_count)
+        sink.users += 1
+        return sink
+
+
+def release_frame_sink(sink: SharedMemoryFrameSink):
+    """Drop one hold on a sink from acquire_frame_sink; the last one closes and unlinks the block"""
+    with _sinks_lock:
+        sink.users -= 1
+        if sink.users > 0:
+            return
+        if _shared_sinks.get(sink.name) is sink:
+            del _shared_sinks[sink.name]
+    sink.close()
+
+
+class SharedMemoryFrameReader:
+    """Consumer side of the frame ring buffer (for capture/streaming processes)"""
+
+    def __init__(self, name: str, untrack: bool = True):
+        """
+        Args:
+            name: Shared memory block name used by the writer
+            untrack: Remove the block from this process' resource tracker so it is not
+                unlinked when the consumer exits (disable when reading in the writer's process)
+        """
+        self._shm = shared_memory.SharedMemory(name=name)
+        if untrack:
+            try:
+                # The writer owns the block - don't let the consumer's resource tracker unlink it
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+            except Exception:
+                pass
+
+        magic, version, self.slot_count, self.slot_capacity, _ = struct.unpack_from(HEADER_FORMAT, self._shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self._shm.close()
+            raise ValueError(f"'{name}' is not a battle frame buffer (magic={magic!r}, version={version})")
+
+    def latest_index(self) -> int:
+        """Index of the most recently published frame (-1 if none yet)"""
+        return struct.unpack_from("<q", self._shm.buf, HEADER_SIZE - 8)[0]
+
+    def read_frame(self, index: Optional[int] = None) -> Optional[Tuple[int, int, int, memoryview]]:
+        """Get a frame without copying
+
+        Args:
+            index: Frame index to read (default: latest)
+
+        Returns:
+            (frame_index, width, height, pixels) where pixels is a memoryview of RGB bytes,
+            or None if the frame is not available. The view is only valid until the writer
+            wraps around the ring; call is_valid() after processing to detect overwrites.
+        """
+        if index is None:
+            index = self.latest_index()
+        if index < 0:
+            return None
+
+        slot_offset = self._slot_offset(index)
+        frame_index, width, height, length, _ = struct.unpack_from(SLOT_HEADER_FORMAT, self._shm.buf, slot_offset)
+        if frame_index != index:
+            return None
+
+        data_offset = slot_offset + SLOT_HEADER_SIZE
+        return frame_index, width, height, self._shm.buf[data_offset:data_offset + length]
+
+    def is_valid(self, index: int) -> bool:
+        """Check that a previously read frame has not been overwritten"""
+        return struct.unpack_from("<q", self._shm.buf, self._slot_offset(index))[0] == index
+
+    def close(self):
+        """Detach from the shared memory block"""
+        self._shm.close()
+
+    def _slot_offset(self, index: int) -> int:
+        return HEADER_SIZE + (index % self.slot_count) * (SLOT_HEADER_SIZE + self.slot_capacity)
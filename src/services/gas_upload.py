@@ -0,0 +1,139 @@
+"""
+Streaming upload helpers for the Google Apps Script (GAS) webhook
+Images are downscaled to the upload size first, then the JSON payload with the
+base64 image is generated chunk by chunk while it is sent, so neither the raw
+file nor its base64 string has to be held in memory
+"""
+
+import base64
+import json
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Raw bytes read per chunk (multiple of 3 so chunk encodings concatenate to valid base64)
+RAW_CHUNK_SIZE = 3 * 64 * 1024
+
+
+def prepare_upload_image(file_path: str, max_size: int) -> Tuple[Path, str, bool]:
+    """
+    Downscale and re-encode an image that is larger than the upload size
+
+    Args:
+        file_path: Source image
+        max_size: Maximum width/height to upload
+
+    Returns:
+        (path to upload, MIME type, True if the path is a temporary file to delete)
+    """
+    path = Path(file_path)
+    is_png = path.suffix.lower() == '.png'
+    mime_type = 'image/png' if is_png else 'image/jpeg'
+
+    try:
+        with Image.open(path) as img:
+            if max(img.size) <= max_size:
+                return path, mime_type, False
+
+            original_size = img.size
+            if img.format == 'JPEG':
+                # Let the JPEG decoder scale down while decoding (much less memory for phone photos)
+                img.draft('RGB', (max_size, max_size))
+            img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+            suffix = '.png' if is_png else '.jpg'
+            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+                if is_png:
+                    img.save(tmp, format='PNG', optimize=True)
+                else:
+                    img.convert('RGB').save(tmp, format='JPEG', quality=90, optimize=True)
+                upload_path = Path(tmp.name)
+
+        logger.info(f"Downscaled {path.name} from {original_size[0]}x{original_size[1]} "
+                    f"to fit {max_size}px for upload ({path.stat().st_size // 1024} KB -> "
+                    f"{upload_path.stat().st_size // 1024} KB)")
+        return upload_path, mime_type, True
+
+    except Exception as e:
+        logger.warning(f"Could not downscale {path.name} for upload, sending as is: {e}")
+        return path, mime_type, False
+
+
+class Base64JsonBody:
+    """Request body streaming {"<fields>...", "<file_field>": "<base64 of file>"} as JSON
+
+    Has a length, so requests sends a Content-Length header and iterates the
+    body instead of using chunked transfer encoding
+    """
+
+    def __init__(self, fields: Dict[str, Any], file_path: Path, file_field: str = 'image',
+                 chunk_size: int = RAW_CHUNK_SIZE):
+        if chunk_size % 3:
+            raise ValueError("chunk_size must be a multiple of 3")
+        self.file_path = Path(file_path)
+        self.chunk_size = chunk_size
+        head = json.dumps(fields, ensure_ascii=False)[:-1]  # Drop closing brace
+        separator = ', ' if fields else ''
+        self._prefix = f'{head}{separator}{json.dumps(file_field)}: "'.encode('utf-8')
+        self._suffix = b'"}'
+        self.file_size = self.file_path.stat().st_size
+        self.bytes_sent = 0
+
+    def __len__(self) -> int:
+        encoded_size = 4 * ((self.file_size + 2) // 3)
+        return len(self._prefix) + encoded_size + len(self._suffix)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._send(self._prefix)
+        with open(self.file_path, 'rb') as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield self._send(base64.b64encode(chunk))
+        yield self._send(self._suffix)
+
+    def _send(self, data: bytes) -> bytes:
+        self.bytes_sent += len(data)
+        return data
+
+
+class UploadStats:
+    """Upload count, volume and throughput"""
+
+    def __init__(self):
+        self.uploads = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self.seconds = 0.0
+        self.last_throughput = 0.0  # Bytes per second of the last upload
+        self._lock = threading.Lock()
+
+    def record(self, bytes_sent: int, seconds: float, ok: bool) -> float:
+        """Record one upload and return its throughput in bytes per second"""
+        throughput = bytes_sent / seconds if seconds > 0 else 0.0
+        with self._lock:
+            self.uploads += 1
+            self.failures += 0 if ok else 1
+            self.bytes_sent += bytes_sent
+            self.seconds += seconds
+            self.last_throughput = throughput
+        return throughput
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get totals and average throughput"""
+        with self._lock:
+            return {
+                'uploads': self.uploads,
+                'failures': self.failures,
+                'bytes_sent': self.bytes_sent,
+                'seconds': self.seconds,
+                'avg_throughput': self.bytes_sent / self.seconds if self.seconds > 0 else 0.0,
+                'last_throughput': self.last_throughput
+            }
@@ -0,0 +1,101 @@
+"""
+Shared HTTP session for Google Drive downloads and GAS calls
+Reuses keep-alive connections through a pooled HTTPAdapter, applies default
+timeouts and a retry policy, and records request latency per host
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class PooledHttpSession:
+    """requests.Session wrapper with connection pooling, timeouts, retries and latency metrics"""
+
+    def __init__(self, pool_size: int = None, timeout: Optional[Tuple[float, float]] = None, retries: int = None):
+        """
+        Args:
+            pool_size: Connections kept alive per host
+            timeout: Default (connect, read) timeout in seconds
+            retries: Retries for connection errors and 429/5xx responses
+        """
+        self.pool_size = pool_size or Settings.HTTP_POOL_SIZE
+        self.timeout = timeout or (Settings.HTTP_CONNECT_TIMEOUT, Settings.HTTP_READ_TIMEOUT)
+        retries = Settings.HTTP_RETRIES if retries is None else retries
+
+        # Connection errors are retried for every method (request was never sent);
+        # read errors and 429/5xx responses only for idempotent methods, so GAS
+        # uploads (POST) are not sent twice
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update({'Connection': 'keep-alive'})
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the shared session"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST through the shared session"""
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request with the default timeout, recording latency for the host"""
+        kwargs.setdefault('timeout', self.timeout)
+        host = urlparse(url).netloc
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            self._record(host, time.perf_counter() - start, error=True)
+            raise
+        self._record(host, time.perf_counter() - start, error=response.status_code >= 400)
+        return response
+
+    def _record(self, host: str, latency: float, error: bool = False):
+        with self._lock:
+            stats = self._metrics.setdefault(host, {
+                'requests': 0, 'errors': 0, 'total_latency': 0.0, 'max_latency': 0.0
+            })
+            stats['requests'] += 1
+            stats['errors'] += 1 if error else 0
+            stats['total_latency'] += latency
+            stats['max_latency'] = max(stats['max_latency'], latency)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-host request counts and latency (seconds, until response headers)"""
+        with self._lock:
+            return {
+                host: {**stats, 'avg_latency': stats['total_latency'] / stats['requests'] if stats['requests'] else 0.0}
+                for host, stats in self._metrics.items()
+            }
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
@@ -0,0 +1,303 @@
+"""
+Content-addressed local cache for Drive image and sprite URLs
+Blobs are stored by SHA-256 of their content and mapped from URLs in an index
+file, so an image is downloaded at most once no matter which character ID it
+belongs to. The cache is size-bounded (LRU) and re-validates stale entries with
+conditional requests (ETag / Last-Modified)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def to_direct_download_url(url: str) -> str:
+    """Convert Google Drive share/view URLs to direct download URLs"""
+    if 'drive.google.com' in url and '/file/d/' in url:
+        file_id = url.split('/file/d/')[1].split('/')[0]
+        return f"https://drive.google.com/uc?export=download&id={file_id}"
+    return url
+
+
+def _guess_extension(data: bytes) -> str:
+    """Pick a file extension from the image signature (pygame/PIL use it as a format hint)"""
+    if data.startswith(b'\x89PNG'):
+        return '.png'
+    if data.startswith(b'\xff\xd8'):
+        return '.jpg'
+    if data.startswith(b'GIF8'):
+        return '.gif'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return '.webp'
+    if data.startswith(b'BM'):
+        return '.bmp'
+    return '.bin'
+
+
+class ImageCache:
+    """URL -> local file cache with content-addressed blobs, LRU eviction and revalidation"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None,
+                 revalidate_after: Optional[float] = None, http=None):
+        """
+        Args:
+            cache_dir: Directory for blobs and the index file
+            max_bytes: Total blob size kept before least recently used entries are evicted
+            revalidate_after: Seconds after which an entry is re-validated with the server
+            http: PooledHttpSession to download with (created on first use if None)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else Settings.IMAGE_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else int(Settings.IMAGE_CACHE_MAX_MB * 1024 * 1024)
+        self.revalidate_after = (revalidate_after if revalidate_after is not None
+                                 else Settings.IMAGE_CACHE_REVALIDATE_HOURS * 3600)
+        self.http = http
+        self.index_path = self.cache_dir / "index.json"
+
+        self._entries: Dict[str, Dict[str, Any]] = {}  # URL -> {hash, file, size, etag, last_modified, fetched_at, last_access}
+        self._lock = threading.RLock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self._loaded = False
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def resolve(self, url: str, http=None, revalidate: bool = True) -> Optional[str]:
+        """
+        Get a local file path for a URL, downloading it only if it is not cached
+
+        Args:
+            url: Image URL (Drive share URLs are converted to direct downloads)
+            http: Session to use instead of the cache's own
+            revalidate: Re-validate entries older than revalidate_after
+
+        Returns:
+            Local file path, or None if the image could not be obtained
+        """
+        if not url or not url.startswith(('http://', 'https://')):
+            return url or None
+
+        self._ensure_loaded()
+        with self._get_url_lock(url):
+            entry = self._get_entry(url)
+            if entry and not (revalidate and time.time() - entry['fetched_at'] > self.revalidate_after):
+                self.hits += 1
+                self._touch(url)
+                return entry['file']
+
+            if entry:
+                self.revalidations += 1
+            else:
+                self.misses += 1
+            return self._fetch(url, entry, http)
+
+    def contains(self, url: str) -> bool:
+        """Check whether a URL is cached (without network access)"""
+        if not url:
+            return False
+        self._ensure_loaded()
+        return self._get_entry(url) is not None
+
+    def get_file(self, url: str) -> Optional[str]:
+        """Get the cached file of a URL or key without network access (None if not cached)"""
+        if not url:
+            return None
+        self._ensure_loaded()
+        entry = self._get_entry(url)
+        if entry is None:
+            return None
+        self._touch(url)
+        return entry['file']
+
+    def put_file(self, url: str, file_path: str) -> Optional[str]:
+        """
+        Register a local file as the content of a URL (e.g. a sprite we just uploaded)
+
+        Returns:
+            Path of the cached blob
+        """
+        try:
+            self._ensure_loaded()
+            data = Path(file_path).read_bytes()
+            with self._get_url_lock(url):
+                return self._store(url, data, etag=None, last_modified=None)
+        except Exception as e:
+            logger.warning(f"Could not add {file_path} to image cache: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        self._ensure_loaded()
+        with self._lock:
+            blobs = {entry['hash']: entry['size'] for entry in self._entries.values()}
+            return {
+                'urls': len(self._entries),
+                'blobs': len(blobs),
+                'bytes': sum(blobs.values()),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'not_modified': self.not_modified,
+                'evictions': self.evictions
+            }
+
+    def _fetch(self, url: str, entry: Optional[Dict[str, Any]], http) -> Optional[str]:
+        """Download (or conditionally re-validate) a URL"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = self._get_http(http).get(to_direct_download_url(url), headers=headers)
+            if entry and response.status_code == 304:
+                self.not_modified += 1
+                with self._lock:
+                    entry['fetched_at'] = time.time()
+                    entry['last_access'] = time.time()
+                    self._save_index()
+                return entry['file']
+
+            response.raise_for_status()
+            if not response.content:
+                raise ValueError("empty response")
+            return self._store(url, response.content,
+                               etag=response.headers.get('ETag'),
+                               last_modified=response.headers.get('Last-Modified'))
+
+        except Exception as e:
+            if entry:
+                logger.warning(f"Could not re-validate {url}, using cached copy: {e}")
+                return entry['file']
+            logger.error(f"Failed to download image {url}: {e}")
+            return None
+
+    def _store(self, url: str, data: bytes, etag: Optional[str], last_modified: Optional[str]) -> str:
+        """Write a blob (once per content hash) and point the URL at it"""
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self.cache_dir / digest[:2] / f"{digest}{_guess_extension(data)}"
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_suffix(blob_path.suffix + '.tmp')
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, blob_path)
+
+        now = time.time()
+        with self._lock:
+            old = self._entries.get(url)
+            self._entries[url] = {
+                'hash': digest,
+                'file': str(blob_path),
+                'size': len(data),
+                'etag': etag,
+                'last_modified': last_modified,
+                'fetched_at': now,
+                'last_access': now
+            }
+            if old and old['hash'] != digest:
+                self._delete_blob_if_unused(old)
+            self._evict()
+            self._save_index()
+        return str(blob_path)
+
+    def _evict(self):
+        """Drop least recently used URLs until blobs fit in max_bytes (caller holds the lock)"""
+        blob_sizes = {entry['hash']: entry['size'] for entry in self._entries.values()}
+        total = sum(blob_sizes.values())
+        for url, entry in sorted(self._entries.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes or len(self._entries) <= 1:
+                break
+            del self._entries[url]
+            self.evictions += 1
+            if self._delete_blob_if_unused(entry):
+                total -= entry['size']
+
+    def _delete_blob_if_unused(self, entry: Dict[str, Any]) -> bool:
+        """Delete a blob no URL refers to any more (caller holds the lock)"""
+        if any(other['hash'] == entry['hash'] for other in self._entries.values()):
+            return False
+        try:
+            Path(entry['file']).unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not delete cached image {entry['file']}: {e}")
+        return True
+
+    def _get_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry and not Path(entry['file']).exists():
+                # Blob removed behind our back
+                del self._entries[url]
+                return None
+            return entry
+
+    def _touch(self, url: str):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry:
+                entry['last_access'] = time.time()
+
+    def _get_url_lock(self, url: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _get_http(self, http):
+        if http is not None:
+            return http
+        if self.http is None:
+            from src.services.http_session import PooledHttpSession
+            self.http = PooledHttpSession()
+        return self.http
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self.index_path.exists():
+                return
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+                logger.debug(f"Loaded image cache index: {len(self._entries)} URL(s)")
+            except Exception as e:
+                logger.warning(f"Image cache index unreadable, starting empty: {e}")
+                self._entries = {}
+
+    def _save_index(self):
+        """Write the index atomically (caller holds the lock); last_access is saved with it"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logger.error(f"Error saving image cache index: {e}")
+
+    def clear(self):
+        """Remove all cached images"""
+        with self._lock:
+            self._entries.clear()
+            self._loaded = True
+            if self.cache_dir.exists():
+                shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+# Global image cache instance
+image_cache = ImageCache()
@@ -43,6 +43,9 @@ class SettingsManager:
             'show_battle_animations': True,
             'japanese_ui': True,
             'auto_load_characters': True,
+
+            # Cached Japanese font path (resolved on first battle display)
+            'font_path': '',
         }
     
     def load_settings(self) -> Dict[str, Any]:
@@ -121,6 +124,9 @@ class SettingsManager:
         if 'sfx_volume' in settings:
             validated['sfx_volume'] = max(0.0, min(1.0, float(settings['sfx_volume'])))
         
+        if 'font_path' in settings:
+            validated['font_path'] = str(settings['font_path'] or '')
+        
         # Boolean settings
         for key in ['enable_sound', 'auto_save_battles', 'show_battle_animations', 
                    'japanese_ui', 'auto_load_characters']:
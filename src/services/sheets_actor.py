@@ -0,0 +1,258 @@
+"""
+Single I/O thread in front of SheetsManager
+Every call is queued and run in order on one dedicated thread, so the manager's
+mutable state (caches, ID checks, story sheets) is never touched by two threads
+at once. Callers get futures (submit) or block for the result (plain method
+calls through the proxy); identical reads waiting or running at the same time
+share one execution, and every caller gets its own copy of the result.
+
+Long jobs run in steps: methods listed in STEPPED_METHODS are replaced by their
+stepwise form (a generator), and the I/O thread advances it one step per turn,
+running queued calls in between. A foreground call waits at most for the step
+that is running (a sheet read or write, or PIPELINE_STEP_SECONDS of waiting on
+pipeline workers), never for the whole job. Write-queue flushes and the character loader use the background
+lane, which only runs when no foreground call is waiting
+"""
+
+import copy
+import inspect
+import itertools
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# SheetsManager methods that only read, so identical concurrent calls can share one result
+MERGEABLE_METHODS = {
+    'get_all_characters', 'get_character', 'get_character_by_name', 'get_character_id_by_name',
+    'search_characters', 'get_character_count', 'get_battle_history', 'get_battle_history_page',
+    'get_rankings', 'get_recent_battles', 'get_recent_battles_page', 'get_battle_log',
+    'get_character_battle_count', 'get_statistics', 'get_story_boss', 'get_story_progress',
+    'get_all_story_progress'
+}
+
+# SheetsManager methods that can take minutes (AI generation) -> their stepwise form
+STEPPED_METHODS = {
+    'get_all_characters': 'iter_all_characters',
+    'update_rankings': 'iter_update_rankings'
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Make call arguments hashable for use as a merge key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _copy_result(source: Future, target: Future):
+    """Resolve a merged caller's future with its own copy of the shared result"""
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        try:
+            target.set_result(copy.deepcopy(source.result()))
+        except Exception as e:
+            target.set_exception(e)
+
+
+class _BackgroundProxy:
+    """Forwards method calls to the actor's background lane"""
+
+    def __init__(self, actor: "SheetsActor"):
+        self._actor = actor
+
+    def __getattr__(self, name):
+        attr = getattr(self._actor.manager, name)
+        if name.startswith('_') or not inspect.ismethod(attr):
+            return attr
+        return lambda *args, **kwargs: self._actor.call_background(name, *args, **kwargs)
+
+
+class SheetsActor:
+    """Runs all calls of one SheetsManager on a dedicated thread
+
+    Attribute access is forwarded to the manager; method calls are executed on the
+    I/O thread and block until done, so the actor can replace the manager as
+    db_manager. Use submit() to get a Future instead of blocking, and the
+    background proxy (or submit_background) for long jobs that must not delay
+    foreground calls; a background call may run after foreground calls
+    submitted later.
+    """
+
+    FOREGROUND = 0
+    BACKGROUND = 1
+    _LAST = 2  # Runs once both lanes are empty (close)
+    _STOP = 3
+
+    def __init__(self, manager, autostart: bool = True):
+        """
+        Args:
+            manager: SheetsManager whose calls are serialized
+            autostart: Start the I/O thread immediately
+        """
+        self.manager = manager
+        self._queue: "queue.PriorityQueue[tuple]" = queue.PriorityQueue()
+        self._sequence = itertools.count()  # FIFO order within a lane
+        self._lock = threading.Lock()
+        self._inflight: Dict[Any, Future] = {}  # Merge key -> future of a queued or running read
+        self._thread: Optional[threading.Thread] = None
+
+        self.requests = 0
+        self.merged = 0
+        self.failures = 0
+        self.background = _BackgroundProxy(self)
+
+        mirror = getattr(manager, 'mirror', None)
+        if mirror is not None:
+            # Pulls are reported on the mirror's sync thread: drop the caches on the I/O thread instead
+            mirror.remove_listener(manager._on_mirror_pull)
+            mirror.add_listener(self._mirror_pulled)
+
+        if autostart:
+            self.start()
+
+    def start(self):
+        """Start the I/O thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="SheetsActor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Run what is queued, then stop the I/O thread"""
+        if self._thread and self._thread.is_alive():
+            self._queue.put((self._STOP, next(self._sequence), None))
+            self._thread.join(timeout)
+        self._thread = None
+
+    def close(self):
+        """Close the manager (pushing pending mirror changes) and stop the I/O thread"""
+        try:
+            self._call(self._LAST, 'close', (), {})
+        finally:
+            self.stop()
+
+    def submit(self, method: str, *args, **kwargs) -> Future:
+        """
+        Queue a SheetsManager call
+
+        Args:
+            method: SheetsManager method name
+            *args, **kwargs: Arguments of the call
+
+        Returns:
+            Future with the method's return value
+        """
+        return self._submit(self.FOREGROUND, method, args, kwargs)
+
+    def submit_background(self, method: str, *args, **kwargs) -> Future:
+        """Queue a SheetsManager call that runs only when no foreground call is waiting"""
+        return self._submit(self.BACKGROUND, method, args, kwargs)
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """Run a SheetsManager call on the I/O thread and wait for its result"""
+        return self._call(self.FOREGROUND, method, args, kwargs)
+
+    def call_background(self, method: str, *args, **kwargs) -> Any:
+        """Run a SheetsManager call on the background lane and wait for its result"""
+        return self._call(self.BACKGROUND, method, args, kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, merge and queue counters"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'merged': self.merged,
+                'failures': self.failures,
+                'queued': self._queue.qsize()
+            }
+
+    def _submit(self, lane: int, method: str, args: tuple, kwargs: dict) -> Future:
+        key = None
+        if method in MERGEABLE_METHODS:
+            try:
+                key = (lane, method, _freeze(args), _freeze(kwargs))
+                hash(key)
+            except TypeError:
+                key = None
+
+        with self._lock:
+            self.requests += 1
+            if key is not None and key in self._inflight:
+                # Share the queued or running call, but never the result object itself
+                self.merged += 1
+                future = Future()
+                self._inflight[key].add_done_callback(lambda source: _copy_result(source, future))
+                return future
+            if key is None:
+                # A write (or unmergeable read) orders later reads after it
+                self._inflight.clear()
+
+            future = Future()
+            if key is not None:
+                self._inflight[key] = future
+            stepped = STEPPED_METHODS.get(method)
+            if stepped and hasattr(self.manager, stepped):
+                method = stepped
+            self._queue.put((lane, next(self._sequence), (key, method, args, kwargs, future, None)))
+        return future
+
+    def _call(self, lane: int, method: str, args: tuple, kwargs: dict) -> Any:
+        if threading.current_thread() is self._thread or not (self._thread and self._thread.is_alive()):
+            # Already on the I/O thread (e.g. a progress callback) or not running: call directly
+            return getattr(self.manager, method)(*args, **kwargs)
+        return self._submit(lane, method, args, kwargs).result()
+
+    def _run(self):
+        while True:
+            lane, _, item = self._queue.get()
+            if item is None:
+                break
+            key, method, args, kwargs, future, steps = item
+            if steps is None and not future.set_running_or_notify_cancel():
+                self._finish(key, future)
+                continue
+            try:
+                if steps is None:
+                    result = getattr(self.manager, method)(*args, **kwargs)
+                    if not inspect.isgenerator(result):
+                        future.set_result(result)
+                        self._finish(key, future)
+                        continue
+                    steps = result
+                next(steps)
+            except StopIteration as stop:
+                future.set_result(stop.value)
+                self._finish(key, future)
+            except BaseException as e:
+                with self._lock:
+                    self.failures += 1
+                logger.error(f"Sheets call {method} failed: {e}")
+                future.set_exception(e)
+                self._finish(key, future)
+            else:
+                # Next step goes to the back of its lane, after calls queued meanwhile
+                self._queue.put((lane, next(self._sequence), (key, method, args, kwargs, future, steps)))
+
+    def _mirror_pulled(self, title: str):
+        """Mirror listener: queue the manager's cache invalidation behind the calls already queued"""
+        self.submit('_on_mirror_pull', title)
+
+    def _finish(self, key, future: Future):
+        with self._lock:
+            if key is not None and self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def __getattr__(self, name):
+        attr = getattr(self.manager, name)
+        if name.startswith('_') or not inspect.ismethod(attr):
+            return attr
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
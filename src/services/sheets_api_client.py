@@ -0,0 +1,309 @@
+"""
+Quota-aware client layer between SheetsManager and gspread
+Keeps reads and writes within a per-minute budget (token bucket), retries quota
+and transient errors with exponential backoff + jitter (writes only when the
+server can't have applied them), lets identical reads that are already in flight
+share one request, and records per-method metrics
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+# HTTP status codes worth retrying (quota exceeded and transient server errors)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Status codes that mean a write was rejected without being applied
+RETRYABLE_WRITE_STATUS_CODES = {429}
+
+# gspread Worksheet methods by API budget
+WORKSHEET_READ_METHODS = {
+    'get_all_records', 'get_all_values', 'get_values', 'get', 'batch_get',
+    'col_values', 'row_values', 'acell', 'cell', 'find', 'findall'
+}
+WORKSHEET_WRITE_METHODS = {
+    'update', 'update_cell', 'update_acell', 'batch_update', 'append_row', 'append_rows',
+    'insert_row', 'insert_rows', 'delete_rows', 'delete_row', 'clear', 'batch_clear', 'resize'
+}
+
+# gspread Spreadsheet methods by API budget
+SPREADSHEET_READ_METHODS = {'values_batch_get', 'values_get', 'fetch_sheet_metadata'}
+SPREADSHEET_WRITE_METHODS = {
+    'values_batch_update', 'values_update', 'values_append', 'values_clear', 'batch_update', 'del_worksheet'
+}
+
+
+class TokenBucket:
+    """Token bucket allowing `rate_per_minute` operations per minute with bursts up to `capacity`"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 6.0)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, waiting until one is available
+
+        Returns:
+            Seconds spent waiting (0 if a token was available)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                wait = (1.0 - self.tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+class _InFlightRead:
+    """Result slot shared by callers of an identical read"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SheetsApiClient:
+    """Executes Sheets API calls within the read/write quota with retries and metrics"""
+
+    def __init__(self, reads_per_minute: float = 60, writes_per_minute: float = 60,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 32.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            reads_per_minute: Read request budget per minute
+            writes_per_minute: Write request budget per minute
+            max_retries: Retries per call for quota/transient errors
+            base_delay: First backoff delay in seconds (doubles per retry)
+            max_delay: Upper bound of a single backoff delay
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.read_bucket = TokenBucket(reads_per_minute, clock=clock, sleep=sleep)
+        self.write_bucket = TokenBucket(writes_per_minute, clock=clock, sleep=sleep)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._in_flight: Dict[Any, _InFlightRead] = {}
+        self._in_flight_lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._metrics_lock = threading.Lock()
+
+    def read(self, method: str, func: Callable, *args, key: Any = None, **kwargs) -> Any:
+        """
+        Run a read call; concurrent calls with the same key share one request
+
+        Args:
+            method: Method name for metrics
+            func: Callable performing the request
+            key: Coalescing key (None disables coalescing)
+        """
+        if key is None:
+            return self._call('read', method, func, args, kwargs)
+
+        with self._in_flight_lock:
+            slot = self._in_flight.get(key)
+            owner = slot is None
+            if owner:
+                slot = _InFlightRead()
+                self._in_flight[key] = slot
+
+        if not owner:
+            self._record(method, coalesced=1)
+            slot.done.wait()
+            if slot.error is not None:
+                raise slot.error
+            return slot.result
+
+        try:
+            slot.result = self._call('read', method, func, args, kwargs)
+            return slot.result
+        except BaseException as e:
+            slot.error = e
+            raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+            slot.done.set()
+
+    def write(self, method: str, func: Callable, *args, **kwargs) -> Any:
+        """Run a write call (never coalesced)"""
+        return self._call('write', method, func, args, kwargs)
+
+    def _call(self, kind: str, method: str, func: Callable, args, kwargs) -> Any:
+        bucket = self.read_bucket if kind == 'read' else self.write_bucket
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            self._record(method, calls=1, throttle_wait=waited)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not self.is_retryable(e, write=(kind == 'write')):
+                    self._record(method, errors=1)
+                    raise
+
+                # Exponential backoff with full jitter
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+                attempt += 1
+                self._record(method, retries=1, backoff_wait=delay)
+                logger.warning(f"Sheets {method} failed ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                self._sleep(delay)
+
+    @staticmethod
+    def is_retryable(error: Exception, write: bool = False) -> bool:
+        """Check whether an error is a quota/transient error worth retrying
+
+        Args:
+            error: Error raised by the call
+            write: The call was a write. Writes such as append_rows are not idempotent,
+                so they are only retried when the request surely wasn't applied
+                (quota rejection, or the connection failed before anything was sent)
+        """
+        if isinstance(error, requests.exceptions.ConnectTimeout) or _connection_not_established(error):
+            return True
+        if not write and isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return True
+
+        status = getattr(error, 'code', None)
+        response = getattr(error, 'response', None)
+        if not isinstance(status, int) or status < 0:
+            status = getattr(response, 'status_code', None)
+        if status in (RETRYABLE_WRITE_STATUS_CODES if write else RETRYABLE_STATUS_CODES):
+            return True
+
+        message = str(error)
+        return 'RATE_LIMIT_EXCEEDED' in message or 'Quota exceeded' in message
+
+    def _record(self, method: str, **values):
+        with self._metrics_lock:
+            stats = self._metrics.setdefault(method, {
+                'calls': 0, 'retries': 0, 'errors': 0, 'coalesced': 0,
+                'throttle_wait': 0.0, 'backoff_wait': 0.0
+            })
+            for name, value in values.items():
+                stats[name] += value
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Get per-method counters (calls, retries, errors, coalesced reads, seconds waited)"""
+        with self._metrics_lock:
+            return {method: dict(stats) for method, stats in self._metrics.items()}
+
+    def reset_metrics(self):
+        """Clear all counters"""
+        with self._metrics_lock:
+            self._metrics.clear()
+
+    def wrap_spreadsheet(self, spreadsheet) -> 'QuotaAwareSpreadsheet':
+        """Wrap a gspread Spreadsheet so all its calls go through this client"""
+        return QuotaAwareSpreadsheet(spreadsheet, self)
+
+    def wrap_worksheet(self, worksheet) -> 'QuotaAwareWorksheet':
+        """Wrap a gspread Worksheet so all its calls go through this client"""
+        if isinstance(worksheet, QuotaAwareWorksheet):
+            return worksheet
+        return QuotaAwareWorksheet(worksheet, self)
+
+
+def _connection_not_established(error: Exception) -> bool:
+    """Check whether a requests ConnectionError failed while connecting (request never sent)"""
+    if not isinstance(error, requests.exceptions.ConnectionError):
+        return False
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, 'reason', reason)  # urllib3 MaxRetryError wraps the cause
+    return isinstance(reason, NewConnectionError)
+
+
+def _freeze(value: Any) -> Any:
+    """Make call arguments hashable for use in a coalescing key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class _QuotaAwareProxy:
+    """Forwards attribute access to the wrapped gspread object, routing API methods through the client"""
+
+    _metric_prefix = ''
+    _read_methods: set = set()
+    _write_methods: set = set()
+
+    def __init__(self, target, client: SheetsApiClient):
+        self._target = target
+        self._client = client
+
+    def _coalesce_key(self, name: str, args, kwargs):
+        raise NotImplementedError
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name in self._read_methods:
+            def read(*args, **kwargs):
+                try:
+                    key = self._coalesce_key(name, args, kwargs)
+                    hash(key)
+                except TypeError:
+                    key = None
+                return self._client.read(f"{self._metric_prefix}.{name}", attr, *args, key=key, **kwargs)
+            return read
+        if name in self._write_methods:
+            def write(*args, **kwargs):
+                return self._client.write(f"{self._metric_prefix}.{name}", attr, *args, **kwargs)
+            return write
+        return attr
+
+
+class QuotaAwareWorksheet(_QuotaAwareProxy):
+    """gspread Worksheet whose API calls go through a SheetsApiClient"""
+
+    _metric_prefix = 'Worksheet'
+    _read_methods = WORKSHEET_READ_METHODS
+    _write_methods = WORKSHEET_WRITE_METHODS
+
+    def _coalesce_key(self, name: str, args, kwargs):
+        return ('worksheet', self._target.id, name, _freeze(args), _freeze(kwargs))
+
+
+class QuotaAwareSpreadsheet(_QuotaAwareProxy):
+    """gspread Spreadsheet whose API calls (and worksheets) go through a SheetsApiClient"""
+
+    _metric_prefix = 'Spreadsheet'
+    _read_methods = SPREADSHEET_READ_METHODS
+    _write_methods = SPREADSHEET_WRITE_METHODS
+
+    def _coalesce_key(self, name: str, args, kwargs):
+        return ('spreadsheet', self._target.id, name, _freeze(args), _freeze(kwargs))
+
+    def worksheet(self, title: str) -> QuotaAwareWorksheet:
+        return self._client.wrap_worksheet(
+            self._client.read('Spreadsheet.worksheet', self._target.worksheet, title))
+
+    def worksheets(self, *args, **kwargs):
+        worksheets = self._client.read('Spreadsheet.worksheets', self._target.worksheets, *args, **kwargs)
+        return [self._client.wrap_worksheet(ws) for ws in worksheets]
+
+    def add_worksheet(self, *args, **kwargs) -> QuotaAwareWorksheet:
+        return self._client.wrap_worksheet(
+            self._client.write('Spreadsheet.add_worksheet', self._target.add_worksheet, *args, **kwargs))
@@ -0,0 +1,404 @@
+"""
+Worksheet backend interface for SheetsManager
+Describes the gspread calls SheetsManager relies on, holds the grid semantics
+shared by grid-backed worksheets (the local mirror and the in-memory fake), and
+provides an in-memory spreadsheet plus a recorder that counts calls and payload
+bytes per operation, so API usage can be measured without network access
+"""
+
+import json
+import threading
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from gspread.exceptions import WorksheetNotFound
+from gspread.utils import a1_range_to_grid_range, numericise_all, rowcol_to_a1
+
+# Worksheet write methods a grid-backed worksheet implements
+GRID_WRITE_METHODS = {
+    'update', 'batch_update', 'append_row', 'append_rows', 'update_cell', 'delete_rows', 'clear', 'batch_clear'
+}
+
+
+class WorksheetBackend(Protocol):
+    """Worksheet calls used by SheetsManager (gspread.Worksheet, MirroredWorksheet, InMemoryWorksheet)"""
+
+    title: str
+
+    def get_all_records(self, *args, **kwargs) -> List[Dict[str, Any]]: ...
+    def get_all_values(self, *args, **kwargs) -> List[List[str]]: ...
+    def get(self, range_name: Optional[str] = None, *args, **kwargs) -> List[List[str]]: ...
+    def batch_get(self, ranges: List[str], *args, **kwargs) -> List[List[List[str]]]: ...
+    def row_values(self, row: int, *args, **kwargs) -> List[str]: ...
+    def col_values(self, col: int, *args, **kwargs) -> List[str]: ...
+    def append_row(self, values: List[Any], *args, **kwargs) -> Dict[str, Any]: ...
+    def append_rows(self, values: List[List[Any]], *args, **kwargs) -> Dict[str, Any]: ...
+    def update(self, *args, **kwargs) -> Dict[str, Any]: ...
+    def update_cell(self, row: int, col: int, value: Any) -> Dict[str, Any]: ...
+    def batch_update(self, data: List[Dict[str, Any]], *args, **kwargs) -> Dict[str, Any]: ...
+    def batch_clear(self, ranges: List[str]) -> Dict[str, Any]: ...
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None) -> Dict[str, Any]: ...
+
+
+class SpreadsheetBackend(Protocol):
+    """Spreadsheet calls used by SheetsManager (gspread.Spreadsheet or InMemorySpreadsheet)"""
+
+    def worksheets(self) -> List[WorksheetBackend]: ...
+    def worksheet(self, title: str) -> WorksheetBackend: ...
+    def add_worksheet(self, title: str, rows: int, cols: int) -> WorksheetBackend: ...
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]: ...
+    def values_batch_update(self, body: Dict[str, Any]) -> Dict[str, Any]: ...
+
+
+def cell_value(value: Any) -> str:
+    """Normalize a written value to what Sheets returns when it is read back"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    return str(value)
+
+
+def trim_row(row: List[str]) -> List[str]:
+    end = len(row)
+    while end and row[end - 1] == '':
+        end -= 1
+    return row[:end]
+
+
+def trim_grid(grid: List[List[str]]) -> List[List[str]]:
+    grid = [trim_row(row) for row in grid]
+    while grid and not grid[-1]:
+        grid.pop()
+    return grid
+
+
+def split_range(range_name: str) -> Tuple[Optional[str], str]:
+    """Split "'Title'!A1:B2" into ('Title', 'A1:B2')"""
+    if '!' not in range_name:
+        return None, range_name
+    title, a1 = range_name.rsplit('!', 1)
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, a1
+
+
+def grid_bounds(a1: str) -> Tuple[int, Optional[int], int, Optional[int]]:
+    """0-based (start row, end row, start column, end column), ends exclusive or None if open"""
+    grid_range = a1_range_to_grid_range(a1)
+    return (grid_range.get('startRowIndex', 0), grid_range.get('endRowIndex'),
+            grid_range.get('startColumnIndex', 0), grid_range.get('endColumnIndex'))
+
+
+def range_and_values(args, kwargs) -> Tuple[str, List[List[Any]]]:
+    """Accept both update(range, values) and gspread 6's update(values, range_name)"""
+    values = kwargs.get('values')
+    range_name = kwargs.get('range_name')
+    for arg in args:
+        if isinstance(arg, str) and range_name is None:
+            range_name = arg
+        elif values is None:
+            values = arg
+    return range_name or 'A1', values or []
+
+
+def apply_write(title: str, grid: List[List[str]], method: str, args: tuple, kwargs: dict):
+    """Apply one gspread write call to a grid in place
+
+    Returns:
+        (response, first row index rewritten structurally or None, set of row indices changed)
+    """
+    touched = set()
+
+    def write_block(a1: str, values: List[List[Any]]):
+        start_row, _, start_col, _ = grid_bounds(a1)
+        for r, row_values in enumerate(values or []):
+            row_index = start_row + r
+            while len(grid) <= row_index:
+                grid.append([])
+            row = grid[row_index]
+            for c, value in enumerate(row_values):
+                col_index = start_col + c
+                while len(row) <= col_index:
+                    row.append('')
+                row[col_index] = cell_value(value)
+            grid[row_index] = trim_row(row)
+            touched.add(row_index)
+
+    if method == 'update':
+        range_name, values = range_and_values(args, kwargs)
+        write_block(split_range(range_name)[1], values)
+        return {'updatedRange': range_name}, None, touched
+
+    if method == 'batch_update':
+        data = args[0] if args else kwargs.get('data', [])
+        for item in data:
+            write_block(split_range(item['range'])[1], item['values'])
+        return {'totalUpdatedRows': len(touched)}, None, touched
+
+    if method == 'update_cell':
+        row, col, value = args[:3] if len(args) >= 3 else (kwargs['row'], kwargs['col'], kwargs['value'])
+        write_block(rowcol_to_a1(row, col), [[value]])
+        return {}, None, touched
+
+    if method in ('append_row', 'append_rows'):
+        rows = [args[0] if args else kwargs['values']] if method == 'append_row' else (
+            args[0] if args else kwargs['values'])
+        while grid and not grid[-1]:
+            grid.pop()
+        first = len(grid)
+        for values in rows:
+            grid.append(trim_row([cell_value(value) for value in values]))
+            touched.add(len(grid) - 1)
+        width = max((len(values) for values in rows), default=1)
+        updated_range = (f"'{title}'!A{first + 1}:"
+                         f"{rowcol_to_a1(first + len(rows), max(width, 1))}")
+        return {'updates': {'updatedRange': updated_range}}, None, touched
+
+    if method == 'delete_rows':
+        start = args[0] if args else kwargs['start_index']
+        end = args[1] if len(args) > 1 else kwargs.get('end_index') or start
+        del grid[start - 1:end]
+        return {}, start - 1, touched
+
+    if method == 'clear':
+        grid.clear()
+        return {}, 0, touched
+
+    if method == 'batch_clear':
+        for range_name in (args[0] if args else kwargs['ranges']):
+            start_row, end_row, start_col, end_col = grid_bounds(split_range(range_name)[1])
+            for row_index in range(start_row, min(end_row or len(grid), len(grid))):
+                row = grid[row_index]
+                for col_index in range(start_col, min(end_col or len(row), len(row))):
+                    row[col_index] = ''
+                grid[row_index] = trim_row(row)
+                touched.add(row_index)
+        return {}, None, touched
+
+    raise ValueError(f"Unsupported grid write: {method}")
+
+
+class GridReads:
+    """gspread read methods answered from a grid of cell values (subclasses provide _grid())"""
+
+    def _grid(self) -> List[List[str]]:
+        raise NotImplementedError
+
+    def get_all_values(self, *args, **kwargs) -> List[List[str]]:
+        grid = self._grid()
+        width = max((len(row) for row in grid), default=0)
+        return [row + [''] * (width - len(row)) for row in grid]
+
+    def get_values(self, range_name: Optional[str] = None, *args, **kwargs) -> List[List[str]]:
+        return self.get(range_name, *args, **kwargs) if range_name else self.get_all_values()
+
+    def get(self, range_name: Optional[str] = None, *args, **kwargs) -> List[List[str]]:
+        grid = self._grid()
+        if not range_name:
+            return trim_grid(grid)
+        start_row, end_row, start_col, end_col = grid_bounds(split_range(range_name)[1])
+        return trim_grid([row[start_col:end_col] for row in grid[start_row:end_row]])
+
+    def batch_get(self, ranges: List[str], *args, **kwargs) -> List[List[List[str]]]:
+        return [self.get(range_name) for range_name in ranges]
+
+    def row_values(self, row: int, *args, **kwargs) -> List[str]:
+        grid = self._grid()
+        return list(grid[row - 1]) if 0 < row <= len(grid) else []
+
+    def col_values(self, col: int, *args, **kwargs) -> List[str]:
+        column = [row[col - 1] if len(row) >= col else '' for row in self._grid()]
+        while column and column[-1] == '':
+            column.pop()
+        return column
+
+    def get_all_records(self, head: int = 1, expected_headers: Optional[List[str]] = None,
+                        value_render_option=None, default_blank: Any = '',
+                        numericise_ignore=(), allow_underscores_in_numeric_literals: bool = False,
+                        empty2zero: bool = False) -> List[Dict[str, Any]]:
+        values = self.get_all_values()
+        if len(values) < head:
+            return []
+        keys = values[head - 1]
+        ignore = [] if 'all' in numericise_ignore else list(numericise_ignore)
+        records = []
+        for row in values[head:]:
+            if 'all' not in numericise_ignore:
+                row = numericise_all(row, empty2zero=empty2zero, default_blank=default_blank,
+                                     allow_underscores_in_numeric_literals=allow_underscores_in_numeric_literals,
+                                     ignore=ignore)
+            records.append(dict(zip(keys, row)))
+        return records
+
+
+class InMemoryWorksheet(GridReads):
+    """Worksheet kept as an in-memory grid (stands in for gspread.Worksheet)"""
+
+    def __init__(self, title: str, values: Optional[List[List[Any]]] = None,
+                 sheet_id: int = 0, rows: int = 1000, cols: int = 26):
+        self.title = title
+        self.id = sheet_id
+        self.row_count = rows
+        self.col_count = cols
+        self._lock = threading.RLock()
+        self._values = trim_grid([[cell_value(value) for value in row] for row in values or []])
+
+    def _grid(self) -> List[List[str]]:
+        with self._lock:
+            return [list(row) for row in self._values]
+
+    def write(self, method: str, *args, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            return apply_write(self.title, self._values, method, args, kwargs)[0]
+
+    def __getattr__(self, name):
+        if name in GRID_WRITE_METHODS:
+            return lambda *args, **kwargs: self.write(name, *args, **kwargs)
+        raise AttributeError(name)
+
+
+class InMemorySpreadsheet:
+    """Spreadsheet of InMemoryWorksheets (stands in for gspread.Spreadsheet)"""
+
+    def __init__(self, worksheets: Optional[Dict[str, List[List[Any]]]] = None):
+        """
+        Args:
+            worksheets: Worksheet title -> initial values (header row first)
+        """
+        self.id = 'in-memory'
+        self._worksheets: Dict[str, InMemoryWorksheet] = {}
+        for title, values in (worksheets or {}).items():
+            self.add_worksheet(title, values=values)
+
+    def worksheets(self, *args, **kwargs) -> List[InMemoryWorksheet]:
+        return list(self._worksheets.values())
+
+    def worksheet(self, title: str) -> InMemoryWorksheet:
+        if title not in self._worksheets:
+            raise WorksheetNotFound(title)
+        return self._worksheets[title]
+
+    def add_worksheet(self, title: str, rows: int = 1000, cols: int = 26,
+                      values: Optional[List[List[Any]]] = None) -> InMemoryWorksheet:
+        worksheet = InMemoryWorksheet(title, values, sheet_id=len(self._worksheets), rows=rows, cols=cols)
+        self._worksheets[title] = worksheet
+        return worksheet
+
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        value_ranges = []
+        for range_name in ranges:
+            title, a1 = split_range(range_name)
+            if title is None:
+                title, a1 = range_name.strip("'").replace("''", "'"), None
+            value_ranges.append({'range': range_name, 'values': self.worksheet(title).get(a1)})
+        return {'valueRanges': value_ranges}
+
+    def values_batch_update(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        updated = 0
+        for item in body.get('data', []):
+            title, a1 = split_range(item['range'])
+            self.worksheet(title).write('update', a1, item['values'])
+            updated += len(item['values'])
+        return {'totalUpdatedRows': updated}
+
+
+def _payload_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str, ensure_ascii=False).encode('utf-8'))
+    except (TypeError, ValueError):
+        return 0
+
+
+class ApiCallRecorder:
+    """Counts calls and payload bytes per operation of wrapped spreadsheets and worksheets
+
+    Bytes are the JSON size of call arguments (sent) and results (received), which
+    approximates the request and response bodies of the Sheets API.
+    """
+
+    # Calls that would be API requests on a real spreadsheet/worksheet
+    SPREADSHEET_OPERATIONS = {'worksheets', 'worksheet', 'add_worksheet', 'values_batch_get', 'values_batch_update'}
+    WORKSHEET_OPERATIONS = {
+        'get_all_records', 'get_all_values', 'get_values', 'get', 'batch_get', 'row_values', 'col_values'
+    } | GRID_WRITE_METHODS
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, int]] = {}
+
+    def wrap(self, spreadsheet) -> '_RecordingProxy':
+        """Wrap a spreadsheet so its calls (and those of worksheets it returns) are recorded"""
+        return _RecordingProxy(spreadsheet, self, 'Spreadsheet', self.SPREADSHEET_OPERATIONS)
+
+    def record(self, operation: str, bytes_sent: int, bytes_received: int):
+        with self._lock:
+            stats = self._operations.setdefault(operation, {'calls': 0, 'bytes_sent': 0, 'bytes_received': 0})
+            stats['calls'] += 1
+            stats['bytes_sent'] += bytes_sent
+            stats['bytes_received'] += bytes_received
+
+    @property
+    def total_calls(self) -> int:
+        with self._lock:
+            return sum(stats['calls'] for stats in self._operations.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get totals and per-operation counters"""
+        with self._lock:
+            operations = {operation: dict(stats) for operation, stats in self._operations.items()}
+        return {
+            'calls': sum(stats['calls'] for stats in operations.values()),
+            'bytes_sent': sum(stats['bytes_sent'] for stats in operations.values()),
+            'bytes_received': sum(stats['bytes_received'] for stats in operations.values()),
+            'operations': operations
+        }
+
+    def reset(self):
+        """Clear all counters"""
+        with self._lock:
+            self._operations.clear()
+
+    def format_report(self, title: str) -> str:
+        """Human-readable table of the counters"""
+        stats = self.get_stats()
+        lines = [f"{title}: {stats['calls']} call(s), "
+                 f"{stats['bytes_sent']} B sent, {stats['bytes_received']} B received"]
+        for operation, op_stats in sorted(stats['operations'].items()):
+            lines.append(f"  {operation:<36} {op_stats['calls']:>4} call(s) "
+                         f"{op_stats['bytes_sent']:>8} B sent {op_stats['bytes_received']:>8} B received")
+        return '\n'.join(lines)
+
+
+class _RecordingProxy:
+    """Forwards attribute access to the wrapped object, recording calls listed in `operations`"""
+
+    def __init__(self, target, recorder: ApiCallRecorder, prefix: str, operations: set):
+        self._target = target
+        self._recorder = recorder
+        self._prefix = prefix
+        self._operations = operations
+
+    def _wrap_result(self, result):
+        if isinstance(result, list) and result and hasattr(result[0], 'col_values'):
+            return [self._wrap_worksheet(ws) for ws in result]
+        if hasattr(result, 'col_values'):
+            return self._wrap_worksheet(result)
+        return result
+
+    def _wrap_worksheet(self, worksheet) -> '_RecordingProxy':
+        return _RecordingProxy(worksheet, self._recorder, f"Worksheet[{worksheet.title}]",
+                               ApiCallRecorder.WORKSHEET_OPERATIONS)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name not in self._operations:
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            is_backend = hasattr(result, 'col_values') or (
+                isinstance(result, list) and result and hasattr(result[0], 'col_values'))
+            self._recorder.record(f"{self._prefix}.{name}", _payload_size([args, kwargs]),
+                                  0 if is_backend else _payload_size(result))
+            return self._wrap_result(result)
+        return call
@@ -0,0 +1,311 @@
+"""
+Read-through snapshot cache for Google Sheets worksheets
+Keeps the last get_all_records() result per worksheet for a short TTL so repeated
+lookups within one battle/save cycle don't each download the whole sheet, an
+ID -> row index so single-row writes don't need a full read first, an ID
+allocator that only reads column A, and the ranking order kept in memory
+"""
+
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WorksheetSnapshotCache:
+    """Per-worksheet snapshot of get_all_records() with TTL and write invalidation"""
+
+    def __init__(self, ttl: float = 30.0):
+        """
+        Args:
+            ttl: Seconds a snapshot stays valid (0 disables caching)
+        """
+        self.ttl = ttl
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(worksheet, expected_headers: Optional[List[str]] = None) -> str:
+        title = getattr(worksheet, 'title', None) or str(id(worksheet))
+        return f"{title}|{','.join(expected_headers)}" if expected_headers else title
+
+    def get_records(self, worksheet, expected_headers: Optional[List[str]] = None,
+                    loader: Optional[Callable[[], List[Dict[str, Any]]]] = None) -> List[Dict[str, Any]]:
+        """Get all records, served from the snapshot while it is fresh
+
+        Args:
+            worksheet: gspread Worksheet
+            expected_headers: Passed to get_all_records()
+            loader: Reads the records instead of get_all_records() (e.g. only some columns)
+        """
+        key = self._key(worksheet, expected_headers)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot and self.ttl > 0 and time.time() - snapshot['loaded_at'] < self.ttl:
+                self.hits += 1
+                return list(snapshot['records'])
+
+        # Fetch outside the lock (network call)
+        if loader:
+            records = loader()
+        elif expected_headers:
+            records = worksheet.get_all_records(expected_headers=expected_headers)
+        else:
+            records = worksheet.get_all_records()
+
+        with self._lock:
+            self.misses += 1
+            if self.ttl > 0:
+                self._snapshots[key] = {'records': list(records), 'loaded_at': time.time()}
+        return records
+
+    def peek(self, worksheet, loaded_after: float = 0.0) -> Optional[List[Dict[str, Any]]]:
+        """Get the fresh snapshot of a worksheet without reading it on a miss
+
+        Args:
+            worksheet: gspread Worksheet
+            loaded_after: Only use a snapshot loaded after this time.time() value
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(self._key(worksheet))
+            if (snapshot and self.ttl > 0 and time.time() - snapshot['loaded_at'] < self.ttl
+                    and snapshot['loaded_at'] > loaded_after):
+                self.hits += 1
+                return list(snapshot['records'])
+        return None
+
+    def prime(self, worksheet, records: List[Dict[str, Any]], expected_headers: Optional[List[str]] = None):
+        """Store records that were read some other way (e.g. a multi-sheet batch read) as the snapshot"""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._snapshots[self._key(worksheet, expected_headers)] = {'records': list(records), 'loaded_at': time.time()}
+
+    def patch_append(self, worksheet, record: Dict[str, Any]):
+        """Add a record we just appended to the cached snapshot(s) of the worksheet"""
+        with self._lock:
+            for snapshot in self._snapshots_for(worksheet):
+                snapshot['records'].append(dict(record))
+
+    def patch_row(self, worksheet, index: int, values: Dict[str, Any]):
+        """Update fields of the record at the given 0-based data index in the cached snapshot(s)"""
+        with self._lock:
+            for snapshot in self._snapshots_for(worksheet):
+                records = snapshot['records']
+                if 0 <= index < len(records):
+                    updated = dict(records[index])
+                    updated.update(values)
+                    records[index] = updated
+
+    def invalidate(self, worksheet=None):
+        """Drop the snapshot(s) for a worksheet, or all snapshots if worksheet is None"""
+        with self._lock:
+            if worksheet is None:
+                self._snapshots.clear()
+            else:
+                title = self._key(worksheet)
+                for key in [k for k in self._snapshots if k == title or k.startswith(f"{title}|")]:
+                    del self._snapshots[key]
+            self.invalidations += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total else 0.0,
+            'invalidations': self.invalidations,
+            'cached_sheets': len(self._snapshots),
+            'ttl': self.ttl
+        }
+
+    def _snapshots_for(self, worksheet) -> List[Dict[str, Any]]:
+        title = self._key(worksheet)
+        return [snap for key, snap in self._snapshots.items() if key == title or key.startswith(f"{title}|")]
+
+
+class CharacterRowIndex:
+    """Character ID -> sheet row number and name -> ID, built from one read of columns A:B"""
+
+    def __init__(self):
+        self._rows: Dict[str, int] = {}
+        self._names: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self.loaded = False
+        self.loads = 0
+
+    def load(self, values: List[List[Any]], first_row: int = 2):
+        """Rebuild the index from the values of columns A:B (without the header row)
+
+        Args:
+            values: Rows as returned by worksheet.get('A2:B')
+            first_row: Sheet row number of the first value row
+        """
+        with self._lock:
+            self._rows.clear()
+            self._names.clear()
+            for offset, row in enumerate(values or []):
+                if not row or row[0] in ('', None):
+                    continue
+                char_id = str(row[0])
+                self._rows[char_id] = first_row + offset
+                if len(row) > 1 and row[1]:
+                    self._names[str(row[1])] = char_id
+            self.loaded = True
+            self.loads += 1
+
+    def get_row(self, char_id) -> Optional[int]:
+        """Get the sheet row number of a character ID"""
+        with self._lock:
+            return self._rows.get(str(char_id))
+
+    def get_id(self, name: str) -> Optional[str]:
+        """Get the character ID for a name"""
+        with self._lock:
+            return self._names.get(name)
+
+    def add(self, char_id, name: str, row: int):
+        """Register an appended character row"""
+        with self._lock:
+            if not self.loaded:
+                return
+            self._rows[str(char_id)] = row
+            if name:
+                self._names[name] = str(char_id)
+
+    def set_name(self, char_id, name: str):
+        """Update the name of an indexed character"""
+        with self._lock:
+            char_id = str(char_id)
+            for old_name in [n for n, i in self._names.items() if i == char_id]:
+                del self._names[old_name]
+            if name:
+                self._names[name] = char_id
+
+    def remove(self, char_id):
+        """Forget a deleted character row and shift the rows below it up by one"""
+        with self._lock:
+            char_id = str(char_id)
+            removed_row = self._rows.pop(char_id, None)
+            for name in [n for n, i in self._names.items() if i == char_id]:
+                del self._names[name]
+            if removed_row is not None:
+                for key, row in self._rows.items():
+                    if row > removed_row:
+                        self._rows[key] = row - 1
+
+    def invalidate(self):
+        """Drop the index so it is rebuilt on next use"""
+        with self._lock:
+            self._rows.clear()
+            self._names.clear()
+            self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class SheetIdAllocator:
+    """Hands out sequential numeric IDs for a sheet from one read of column A
+
+    A local high-water mark covers IDs handed out but not yet appended (e.g. a
+    character whose images are still uploading), and re-reading column A on each
+    allocation picks up rows appended by other writers (LINE bot / GAS)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.high_water = 0  # Highest ID handed out by this process
+        self.reads = 0
+
+    def allocate(self, worksheet, count: int = 1) -> int:
+        """
+        Reserve count consecutive IDs
+
+        Args:
+            worksheet: Worksheet whose column A holds the numeric IDs (row 1 is the header)
+            count: Number of IDs to reserve
+
+        Returns:
+            First reserved ID
+        """
+        with self._lock:
+            column = worksheet.col_values(1)
+            self.reads += 1
+            sheet_max = 0
+            for value in column[1:]:
+                try:
+                    sheet_max = max(sheet_max, int(value))
+                except (ValueError, TypeError):
+                    continue
+            first_id = max(sheet_max, self.high_water) + 1
+            self.high_water = first_id + count - 1
+            return first_id
+
+    def release(self, first_id: int, count: int = 1):
+        """Give back IDs whose rows were not appended, if nothing was reserved after them"""
+        with self._lock:
+            if self.high_water == first_id + count - 1:
+                self.high_water = first_id - 1
+
+    def reset(self):
+        """Forget the high-water mark (after IDs were renumbered or rows deleted)"""
+        with self._lock:
+            self.high_water = 0
+
+
+class RankingTable:
+    """Ranking entries kept in rank order (rating, then win rate) with bisect inserts
+
+    Also remembers the rows the Rankings sheet currently shows, so an update only
+    writes the rows whose rank or values changed
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._order: List[tuple] = []  # Sorted (sort key, character ID)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, tuple] = {}
+        self.sheet_rows: Optional[List[List[Any]]] = None  # Rows 2.. as last written/read (None = unknown)
+
+    @staticmethod
+    def _sort_key(entry: Dict[str, Any], position: int) -> tuple:
+        # Highest rating first, then highest win rate, then sheet order of the character
+        return -entry['rating'], -entry['win_rate'], position
+
+    def upsert(self, entry: Dict[str, Any], position: int):
+        """Add or update a character's entry, moving it only if its sort key changed"""
+        with self._lock:
+            char_id = str(entry['char_id'])
+            key = self._sort_key(entry, position)
+            old_key = self._keys.get(char_id)
+            if old_key != key:
+                if old_key is not None:
+                    del self._order[bisect.bisect_left(self._order, (old_key, char_id))]
+                bisect.insort(self._order, (key, char_id))
+                self._keys[char_id] = key
+            self._entries[char_id] = dict(entry)
+
+    def retain(self, char_ids):
+        """Drop entries of characters not in char_ids (deleted characters)"""
+        with self._lock:
+            keep = {str(char_id) for char_id in char_ids}
+            for char_id in [c for c in self._entries if c not in keep]:
+                del self._order[bisect.bisect_left(self._order, (self._keys.pop(char_id), char_id))]
+                del self._entries[char_id]
+
+    def rows(self, columns: List[str]) -> List[List[Any]]:
+        """Rows in rank order: rank followed by the given entry fields"""
+        with self._lock:
+            return [[rank] + [self._entries[char_id][column] for column in columns]
+                    for rank, (_, char_id) in enumerate(self._order, start=1)]
+
+    def __len__(self) -> int:
+        return len(self._order)
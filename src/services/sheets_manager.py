@@ -2,22 +2,37 @@
 Google Sheets manager for character data management with Google Drive integration
 """
 
+import hashlib
 import logging
 import gspread
 import io
+import queue
+import re
 import requests
-import base64
+import shutil
+import threading
+import time
 import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Generator
 from datetime import datetime
 from PIL import Image
 from src.models import Character, Battle
 from config.settings import Settings
 from src.services.ai_analyzer import AIAnalyzer
+from src.services.sheets_cache import WorksheetSnapshotCache, CharacterRowIndex, SheetIdAllocator, RankingTable
+from gspread.utils import numericise_all, rowcol_to_a1
+from src.services.sheets_api_client import SheetsApiClient
+from src.services.http_session import PooledHttpSession
+from src.services.image_cache import image_cache
+from src.services.gas_upload import Base64JsonBody, UploadStats, prepare_upload_image
+from src.services.sheets_mirror import SheetsMirror
+from src.services.battle_log_store import BattleLogStore
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,48 +41,88 @@ logger = logging.getLogger(__name__)
 class SheetsManager:
     """Manage character data using Google Sheets"""
 
-    def __init__(self):
+    CHARACTER_HEADERS = [
+        'ID', 'Name', 'Image URL', 'Sprite URL', 'HP', 'Attack',
+        'Defense', 'Speed', 'Magic', 'Luck', 'Description', 'Created At',
+        'Wins', 'Losses', 'Draws'
+    ]
+    BATTLE_HISTORY_HEADERS = [
+        'Battle ID', 'Date', 'Fighter 1 ID', 'Fighter 1 Name', 'Fighter 2 ID', 'Fighter 2 Name',
+        'Winner ID', 'Winner Name', 'Total Turns', 'Duration (s)',
+        'F1 Final HP', 'F2 Final HP', 'F1 Damage Dealt', 'F2 Damage Dealt', 'Result Type', 'Battle Log'
+    ]
+    BATTLE_HISTORY_STATS_RANGE = 'A1:O'  # Columns read for history records (P holds legacy battle logs)
+    RANKING_HEADERS = [
+        'Rank', 'Character ID', 'Character Name', 'Total Battles',
+        'Wins', 'Losses', 'Draws', 'Win Rate (%)', 'Avg Damage Dealt', 'Rating'
+    ]
+    RANKING_COLUMNS = [  # Ranking entry fields for columns B:J (A is the rank)
+        'char_id', 'name', 'total_battles', 'wins', 'losses', 'draws', 'win_rate', 'avg_damage', 'rating'
+    ]
+    STORY_BOSS_HEADERS = [
+        'Level', 'Name', 'Image URL', 'Sprite URL', 'HP', 'Attack', 'Defense', 'Speed', 'Magic', 'Luck', 'Description'
+    ]
+    STORY_PROGRESS_HEADERS = [
+        'Character ID', 'Current Level', 'Completed', 'EndlessAccess', 'Victories', 'Attempts', 'Last Played'
+    ]
+    PIPELINE_STEP_SECONDS = 0.1  # Longest a step of iter_all_characters waits on pipeline workers
+
+    def __init__(self, spreadsheet=None):
+        """
+        Args:
+            spreadsheet: Spreadsheet backend to use instead of connecting to Google
+                (e.g. an InMemorySpreadsheet for tests and benchmarks; Drive uploads are unavailable)
+        """
         self.client = None
         self.sheet = None
         self.worksheet = None
         self.battle_history_sheet = None
         self.ranking_sheet = None
+        self._character_headers_verified = False  # Characters header row checked this session
         self.last_id_integrity_check = 0  # Timestamp of last ID integrity check
         self.id_integrity_check_interval = 300  # Check every 5 minutes (300 seconds)
+        self._id_fingerprint = None  # (row count, hash of column A) at the last successful check
+        self._verified_id_count = 0  # Leading rows verified to hold IDs 1..n
         self.drive_service = None
         self.credentials = None
         self.online_mode = False  # Track if connected to Google Sheets/Drive
-        self._initialize_client()
+        self._damage_stats = None  # Character ID -> [total damage dealt, battle count] (loaded lazily)
+        self.cache = WorksheetSnapshotCache(ttl=Settings.SHEETS_CACHE_TTL)  # get_all_records() snapshots
+        self.row_index = CharacterRowIndex()  # Character ID -> row, name -> ID (loaded lazily)
+        self.character_ids = SheetIdAllocator()  # Next character ID from column A only
+        self.battle_ids = SheetIdAllocator()  # Next battle ID from column A only
+        self._stats_written_at = 0.0  # When this process last wrote Wins/Losses/Draws
+        self._history_last_row = None  # Last data row of BattleHistory (None = unknown, read column A)
+        self.rankings = RankingTable()  # Ranking order in memory and the rows the Rankings sheet shows
+        self.api_client = SheetsApiClient(  # Quota budget, retries and metrics for all Sheets calls
+            reads_per_minute=Settings.SHEETS_READS_PER_MINUTE,
+            writes_per_minute=Settings.SHEETS_WRITES_PER_MINUTE,
+            max_retries=Settings.SHEETS_MAX_RETRIES
+        )
+        self.http = PooledHttpSession()  # Keep-alive connections for Drive downloads and GAS calls
+        self.image_cache = image_cache  # Downloaded images/sprites by URL (content-addressed)
+        self.upload_stats = UploadStats()  # GAS upload volume and throughput
+        self.mirror = None  # Local SQLite mirror (Settings.SHEETS_LOCAL_MIRROR)
+        self.battle_logs = BattleLogStore()  # Battle logs by battle ID (not stored in the sheet)
+        self._stage_limits = {  # Concurrency per pipeline stage when characters are processed in parallel
+            'download': threading.BoundedSemaphore(Settings.CHARACTER_PIPELINE_DOWNLOADS),
+            'cpu': threading.BoundedSemaphore(Settings.CHARACTER_PIPELINE_CPU),
+            'upload': threading.BoundedSemaphore(Settings.CHARACTER_PIPELINE_UPLOADS)
+        }
+        self._pipeline_local = threading.local()  # Sheet writes of the pipeline job running on this thread
+        if spreadsheet is not None:
+            self._initialize_backend(spreadsheet)
+        else:
+            self._initialize_client()
 
     def _initialize_client(self):
         """Initialize Google Sheets and Google Drive clients"""
         try:
-            # Define the scope
-            scope = [
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive'
-            ]
-
-            # Load credentials
-            creds_path = Settings.GOOGLE_CREDENTIALS_PATH
-            if not creds_path.exists():
-                logger.error(f"Google credentials file not found: {creds_path}")
-                raise FileNotFoundError(f"Please place your Google credentials JSON file at {creds_path}")
-
-            self.credentials = Credentials.from_service_account_file(str(creds_path), scopes=scope)
-
-            # Initialize Google Sheets client
-            self.client = gspread.authorize(self.credentials)
+            # Open the spreadsheet and its worksheets
+            self._open_spreadsheet(self._connect())
 
-            # Open the spreadsheet
-            self.sheet = self.client.open_by_key(Settings.SPREADSHEET_ID)
-            self.worksheet = self.sheet.worksheet(Settings.WORKSHEET_NAME)
-
-            # Initialize or create additional worksheets
-            self._initialize_worksheets()
-
-            # Initialize Google Drive API client
-            self.drive_service = build('drive', 'v3', credentials=self.credentials)
+            if Settings.SHEETS_LOCAL_MIRROR:
+                self._attach_mirror()
 
             logger.info(f"Successfully connected to Google Sheets: {Settings.SPREADSHEET_ID}")
             logger.info(f"Successfully connected to Google Drive API")
@@ -75,16 +130,74 @@ class SheetsManager:
 
         except Exception as e:
             logger.warning(f"Failed to initialize Google Sheets/Drive client: {e}")
+            if Settings.SHEETS_LOCAL_MIRROR and self._open_saved_mirror():
+                return
             logger.warning("Falling back to offline mode (local database will be used)")
             self.online_mode = False
             # Don't raise exception - allow fallback to local database
 
-    def _initialize_worksheets(self):
-        """Initialize or create additional worksheets"""
+    def _connect(self):
+        """Authorize with the service account, set up Drive and open the spreadsheet
+
+        Returns:
+            gspread Spreadsheet (not yet quota-aware)
+        """
+        # Define the scope
+        scope = [
+            'https://www.googleapis.com/auth/spreadsheets',
+            'https://www.googleapis.com/auth/drive'
+        ]
+
+        # Load credentials
+        creds_path = Settings.GOOGLE_CREDENTIALS_PATH
+        if not creds_path.exists():
+            logger.error(f"Google credentials file not found: {creds_path}")
+            raise FileNotFoundError(f"Please place your Google credentials JSON file at {creds_path}")
+
+        self.credentials = Credentials.from_service_account_file(str(creds_path), scopes=scope)
+
+        # Initialize Google Sheets client
+        self.client = gspread.authorize(self.credentials)
+        spreadsheet = self.client.open_by_key(Settings.SPREADSHEET_ID)
+
+        # Initialize Google Drive API client
+        self.drive_service = build('drive', 'v3', credentials=self.credentials)
+        return spreadsheet
+
+    def _initialize_backend(self, spreadsheet):
+        """Use a given spreadsheet backend (no Google credentials or Drive)"""
         try:
-            # Get all existing worksheets
-            existing_sheets = [ws.title for ws in self.sheet.worksheets()]
+            self._open_spreadsheet(spreadsheet)
+            self.online_mode = True
+            logger.info(f"Using spreadsheet backend: {type(spreadsheet).__name__}")
+        except Exception as e:
+            logger.warning(f"Failed to open spreadsheet backend: {e}")
+            self.online_mode = False
+
+    def _open_spreadsheet(self, spreadsheet):
+        """Wrap a spreadsheet in the quota-aware client and initialize all worksheets"""
+        # Worksheets obtained from the spreadsheet go through the quota-aware client
+        self.sheet = self.api_client.wrap_spreadsheet(spreadsheet)
+        self._open_worksheets()
+
+    def _open_worksheets(self):
+        """Get the worksheets of self.sheet, creating missing ones, and load their data"""
+        # All worksheet handles from one metadata read
+        existing_sheets = {ws.title: ws for ws in self.sheet.worksheets()}
+        if Settings.WORKSHEET_NAME not in existing_sheets:
+            raise gspread.exceptions.WorksheetNotFound(Settings.WORKSHEET_NAME)
+        self.worksheet = existing_sheets[Settings.WORKSHEET_NAME]
 
+        # Initialize or create additional worksheets
+        self._initialize_worksheets(existing_sheets)
+
+    def _initialize_worksheets(self, existing_sheets: Dict[str, Any]):
+        """Initialize or create additional worksheets
+
+        Args:
+            existing_sheets: Worksheet title -> worksheet, from spreadsheet.worksheets()
+        """
+        try:
             # Create Battle History sheet if it doesn't exist
             if Settings.BATTLE_HISTORY_SHEET not in existing_sheets:
                 self.battle_history_sheet = self.sheet.add_worksheet(
@@ -94,7 +207,7 @@ class SheetsManager:
                 )
                 logger.info(f"Created new worksheet: {Settings.BATTLE_HISTORY_SHEET}")
             else:
-                self.battle_history_sheet = self.sheet.worksheet(Settings.BATTLE_HISTORY_SHEET)
+                self.battle_history_sheet = existing_sheets[Settings.BATTLE_HISTORY_SHEET]
 
             # Create Rankings sheet if it doesn't exist
             if Settings.RANKING_SHEET not in existing_sheets:
@@ -105,32 +218,316 @@ class SheetsManager:
                 )
                 logger.info(f"Created new worksheet: {Settings.RANKING_SHEET}")
             else:
-                self.ranking_sheet = self.sheet.worksheet(Settings.RANKING_SHEET)
+                self.ranking_sheet = existing_sheets[Settings.RANKING_SHEET]
 
-            # Initialize StoryBosses and StoryProgress sheets
-            self._init_story_sheet()
-            self._init_story_progress_sheet()
+            # Create StoryBosses and StoryProgress sheets if they don't exist (headers are written below)
+            if "StoryBosses" not in existing_sheets:
+                self.story_sheet = self.sheet.add_worksheet(title="StoryBosses", rows=100, cols=11)
+                logger.info("Created StoryBosses sheet")
+            else:
+                self.story_sheet = existing_sheets["StoryBosses"]
 
-            # Ensure headers for all sheets
-            self._ensure_battle_history_headers()
-            self._ensure_ranking_headers()
+            if "StoryProgress" not in existing_sheets:
+                self.story_progress_sheet = self.sheet.add_worksheet(title="StoryProgress", rows=1000, cols=7)
+                logger.info("Created StoryProgress sheet")
+            else:
+                self.story_progress_sheet = existing_sheets["StoryProgress"]
+
+            # Headers and data of all sheets in one read, header fixes in one write
+            self._load_startup_snapshot()
 
         except Exception as e:
             logger.error(f"Error initializing worksheets: {e}")
 
+    def _load_startup_snapshot(self):
+        """Read all five worksheets with one values_batch_get and prime the caches from it
+
+        Wrong headers and old StoryProgress rows are fixed with one values_batch_update,
+        so reaching the first screen costs one read (plus one write if anything was fixed).
+        """
+        sheets = [
+            # (worksheet, A1 range or None for the whole sheet, expected headers)
+            (self.worksheet, None, self.CHARACTER_HEADERS),
+            (self.battle_history_sheet, self.BATTLE_HISTORY_STATS_RANGE, self.BATTLE_HISTORY_HEADERS),
+            (self.ranking_sheet, None, self.RANKING_HEADERS),
+            (self.story_sheet, None, self.STORY_BOSS_HEADERS),
+            (self.story_progress_sheet, None, self.STORY_PROGRESS_HEADERS)
+        ]
+        ranges = [f"'{ws.title}'!{a1}" if a1 else f"'{ws.title}'" for ws, a1, _ in sheets]
+        ranges.append(f"'{self.battle_history_sheet.title}'!1:1")  # Full header row (the data range stops at O)
+
+        response = self.sheet.values_batch_get(ranges)
+        value_ranges = [value_range.get('values', []) for value_range in response.get('valueRanges', [])]
+        values = [[list(row) for row in rows] for rows in value_ranges[:len(sheets)]]
+        history_headers = value_ranges[len(sheets)][0] if len(value_ranges) > len(sheets) and value_ranges[len(sheets)] else []
+
+        # Header fixes (and StoryProgress migration) as one batch update
+        data = []
+        for (worksheet, _, expected_headers), rows in zip(sheets, values):
+            current_headers = history_headers if worksheet is self.battle_history_sheet else (rows[0] if rows else [])
+            if current_headers == expected_headers:
+                continue
+            logger.warning(f"{worksheet.title} headers incorrect. Current: {current_headers}")
+
+            if worksheet is self.story_progress_sheet and len(rows) > 1:
+                for row_num, new_row in self._story_progress_migration_rows(rows):
+                    data.append({'range': f"'{worksheet.title}'!A{row_num}:G{row_num}", 'values': [new_row]})
+                    rows[row_num - 1] = [str(value) for value in new_row]
+            if len(current_headers) > len(expected_headers):
+                # Blank out extra header cells (e.g. column H of the old 8-column StoryProgress format)
+                extra = f"{rowcol_to_a1(1, len(expected_headers) + 1)}:{rowcol_to_a1(1, len(current_headers))}"
+                data.append({'range': f"'{worksheet.title}'!{extra}",
+                             'values': [[''] * (len(current_headers) - len(expected_headers))]})
+
+            data.append({'range': f"'{worksheet.title}'!A1:{rowcol_to_a1(1, len(expected_headers))}",
+                         'values': [expected_headers]})
+            if rows:
+                rows[0] = list(expected_headers)
+            else:
+                rows.append(list(expected_headers))
+
+        if data:
+            self.sheet.values_batch_update({'valueInputOption': 'RAW', 'data': data})
+            logger.info(f"Fixed headers/rows of {len(data)} range(s) in one batch")
+        self._character_headers_verified = True
+        self.story_progress_headers_verified = True
+
+        # Prime the snapshot cache and indexes
+        characters, history, rankings, bosses, progress = values
+        self.cache.prime(self.worksheet, self._rows_to_records(self.CHARACTER_HEADERS, characters[1:]))
+        self.row_index.load([row[:2] for row in characters[1:]])
+        self.cache.prime(self.battle_history_sheet, self._rows_to_records(self.BATTLE_HISTORY_HEADERS[:15], history[1:]))
+        self._history_last_row = len(history)
+        self.cache.prime(self.ranking_sheet, self._rows_to_records(self.RANKING_HEADERS, rankings[1:]))
+        self.cache.prime(self.story_sheet, self._rows_to_records(self.STORY_BOSS_HEADERS, bosses[1:]))
+        self.cache.prime(self.story_progress_sheet,
+                         self._rows_to_records(self.STORY_PROGRESS_HEADERS, progress[1:]),
+                         self.STORY_PROGRESS_HEADERS)
+        logger.info(f"Loaded {sum(len(rows) for rows in values)} row(s) from {len(sheets)} worksheets in one request")
+
+        # Clean up orphaned character records (uses the rows just read)
+        existing_char_ids = {str(row[0]).strip() for row in characters[1:] if row and str(row[0]).strip()}
+        self._cleanup_orphaned_story_progress(progress, existing_char_ids)
+
+    def _attach_mirror(self):
+        """Serve reads from the local SQLite mirror and push writes to Sheets in the background"""
+        try:
+            mirror = SheetsMirror()
+            mirror.attach(self.sheet, [
+                self.worksheet, self.battle_history_sheet, self.ranking_sheet,
+                getattr(self, 'story_sheet', None), getattr(self, 'story_progress_sheet', None)
+            ])
+            self.sheet = mirror.wrap_spreadsheet(self.sheet)
+            self.worksheet = mirror.wrap_worksheet(self.worksheet)
+            self.battle_history_sheet = mirror.wrap_worksheet(self.battle_history_sheet)
+            self.ranking_sheet = mirror.wrap_worksheet(self.ranking_sheet)
+            self.story_sheet = mirror.wrap_worksheet(getattr(self, 'story_sheet', None))
+            self.story_progress_sheet = mirror.wrap_worksheet(getattr(self, 'story_progress_sheet', None))
+            mirror.add_listener(self._on_mirror_pull)
+            mirror.start()
+            self.mirror = mirror
+            logger.info(f"Sheets mirror active: {Settings.SHEETS_MIRROR_PATH}")
+        except Exception as e:
+            logger.error(f"Error starting sheets mirror, reading from Sheets directly: {e}")
+            self.mirror = None
+
+    def _mirror_titles(self) -> List[str]:
+        return [Settings.WORKSHEET_NAME, Settings.BATTLE_HISTORY_SHEET, Settings.RANKING_SHEET,
+                "StoryBosses", "StoryProgress"]
+
+    def _open_saved_mirror(self) -> bool:
+        """Start from the mirror saved by an earlier run when Sheets can't be reached
+
+        Play continues on the local copy; the sync thread keeps trying to connect and
+        then pushes the changes made meanwhile.
+
+        Returns:
+            True if the saved mirror is in use, False if there is none
+        """
+        if not Settings.SHEETS_MIRROR_PATH.exists():
+            return False
+        try:
+            mirror = SheetsMirror()
+            if not mirror.open_saved(self._mirror_titles()):
+                mirror.close()
+                return False
+
+            self.sheet = mirror.wrap_spreadsheet(None)
+            self._open_worksheets()
+            mirror.set_connector(self._reconnect)
+            mirror.add_listener(self._on_mirror_pull)
+            mirror.start()
+            self.mirror = mirror
+            self.online_mode = True
+            logger.warning(f"Google Sheets unreachable, using the saved mirror {mirror.db_path} "
+                           f"(changes are pushed once the connection is back)")
+            return True
+        except Exception as e:
+            logger.error(f"Error opening saved sheets mirror: {e}")
+            return False
+
+    def _reconnect(self):
+        """Connector for a mirror opened offline: (quota-aware spreadsheet, worksheets to mirror)"""
+        spreadsheet = self.api_client.wrap_spreadsheet(self._connect())
+        existing_sheets = {ws.title: ws for ws in spreadsheet.worksheets()}
+        return spreadsheet, [existing_sheets.get(title) for title in self._mirror_titles()]
+
+    def _on_mirror_pull(self, title: str):
+        """Drop derived caches of a sheet the mirror just pulled remote changes into
+
+        Registered as a mirror listener; SheetsActor re-registers it so it runs on the
+        I/O thread that owns the caches, not on the mirror's sync thread.
+        """
+        for worksheet in [self.worksheet, self.battle_history_sheet, self.ranking_sheet,
+                          getattr(self, 'story_sheet', None), getattr(self, 'story_progress_sheet', None)]:
+            if worksheet is not None and worksheet.title == title:
+                self.refresh(worksheet)
+        if self.battle_history_sheet is not None and self.battle_history_sheet.title == title:
+            self._invalidate_damage_stats()
+
+    def get_mirror_stats(self) -> Optional[Dict[str, Any]]:
+        """Get local mirror sync statistics (None if the mirror is not used)"""
+        return self.mirror.get_stats() if self.mirror else None
+
+    def close(self):
+        """Push pending mirror changes and stop background syncing"""
+        if self.mirror:
+            self.mirror.close()
+            self.mirror = None
+
+    def _get_records(self, worksheet, expected_headers: Optional[List[str]] = None, fresh: bool = False) -> List[Dict[str, Any]]:
+        """Get all records of a worksheet through the snapshot cache
+
+        Args:
+            worksheet: gspread Worksheet
+            expected_headers: Passed to get_all_records() (for sheets with duplicate headers)
+            fresh: If True, drop the cached snapshot and read from the sheet
+        """
+        if fresh:
+            self.cache.invalidate(worksheet)
+        if worksheet is not None and worksheet is self.battle_history_sheet:
+            return self.cache.get_records(worksheet, loader=self._load_battle_history_records)
+        return self.cache.get_records(worksheet, expected_headers)
+
+    def _load_battle_history_records(self) -> List[Dict[str, Any]]:
+        """Read BattleHistory records without column P (old rows still carry their full battle log there)"""
+        values = self.battle_history_sheet.get(self.BATTLE_HISTORY_STATS_RANGE)
+        if not values:
+            return []
+        return self._rows_to_records(list(values[0]), values[1:])
+
+    @staticmethod
+    def _rows_to_records(headers: List[str], rows) -> List[Dict[str, Any]]:
+        """Convert value rows to records the way get_all_records() does (numbers parsed)"""
+        records = []
+        for row in rows:
+            row = list(row) + [''] * (len(headers) - len(row))
+            records.append(dict(zip(headers, numericise_all(row[:len(headers)]))))
+        return records
+
+    def refresh(self, worksheet=None):
+        """Drop cached snapshots so the next read fetches fresh data (e.g. endless mode polling)
+
+        Args:
+            worksheet: Worksheet to refresh, or None for all worksheets
+        """
+        self.cache.invalidate(worksheet)
+        if worksheet is None or worksheet is self.worksheet:
+            self.row_index.invalidate()
+        if worksheet is None or worksheet is self.battle_history_sheet:
+            self._history_last_row = None
+        if worksheet is not None and worksheet is self.ranking_sheet:
+            self.rankings.sheet_rows = None  # Edited elsewhere; re-read before the next diff
+
+    def _load_row_index(self):
+        """Build the character row index from one read of columns A:B"""
+        self.row_index.load(self.worksheet.get('A2:B'))
+        logger.debug(f"Character row index loaded: {len(self.row_index)} row(s)")
+
+    @staticmethod
+    def _appended_rows(response) -> Optional[Tuple[int, int]]:
+        """Get the first and last sheet row written by append_row(s) from its API response"""
+        try:
+            updated_range = response['updates']['updatedRange']
+            match = re.search(r'![A-Z]+(\d+)(?::[A-Z]+(\d+))?$', updated_range)
+            if not match:
+                return None
+            first = int(match.group(1))
+            return first, int(match.group(2) or first)
+        except (KeyError, TypeError):
+            return None
+
+    def _appended_row_number(self, response) -> Optional[int]:
+        """Get the sheet row number written by append_row from its API response"""
+        rows = self._appended_rows(response)
+        return rows[0] if rows else None
+
+    def _find_character_row(self, character_id) -> Optional[int]:
+        """Get the sheet row number of a character without reading the whole sheet
+
+        Args:
+            character_id: Character ID (string or int)
+
+        Returns:
+            Row number (2 = first data row), or None if the character does not exist
+        """
+        was_loaded = self.row_index.loaded
+        if not was_loaded:
+            self._load_row_index()
+
+        row_num = self.row_index.get_row(character_id)
+        if row_num is None and was_loaded:
+            # Row may have been added by another client (LINE/GAS) since the index was built
+            self._load_row_index()
+            row_num = self.row_index.get_row(character_id)
+        return row_num
+
+    def get_character_id_by_name(self, name: str) -> Optional[str]:
+        """Get a character ID by name from the row index (no full sheet read)"""
+        try:
+            if not self.row_index.loaded:
+                self._load_row_index()
+            return self.row_index.get_id(name)
+        except Exception as e:
+            logger.error(f"Error looking up character ID by name: {e}")
+            return None
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get snapshot cache statistics (hits = full-sheet reads saved)"""
+        return self.cache.get_stats()
+
+    @contextmanager
+    def _pipeline_stage(self, stage: str):
+        """Limit how many threads run a stage ('download', 'cpu' or 'upload') at the same time"""
+        with self._stage_limits[stage]:
+            yield
+
+    def get_api_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Get per-method Sheets API counters (calls, retries, errors, throttle waits)"""
+        return self.api_client.get_metrics()
+
+    def get_http_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-host latency of Drive/GAS HTTP requests"""
+        return self.http.get_metrics()
+
+    def get_upload_stats(self) -> Dict[str, Any]:
+        """Get GAS upload count, bytes sent and throughput (bytes/second)"""
+        return self.upload_stats.get_stats()
+
     def _ensure_headers(self):
-        """Ensure the spreadsheet has proper headers"""
+        """Ensure the spreadsheet has proper headers (checked once per session)"""
         try:
+            if self._character_headers_verified:
+                return
+
             headers = self.worksheet.row_values(1)
-            expected_headers = [
-                'ID', 'Name', 'Image URL', 'Sprite URL', 'HP', 'Attack',
-                'Defense', 'Speed', 'Magic', 'Luck', 'Description', 'Created At',
-                'Wins', 'Losses', 'Draws'
-            ]
+            expected_headers = self.CHARACTER_HEADERS
 
             if not headers or headers != expected_headers:
                 self.worksheet.update('A1:O1', [expected_headers])
+                self.cache.invalidate(self.worksheet)
                 logger.info("Headers initialized in spreadsheet")
+            self._character_headers_verified = True
 
         except Exception as e:
             logger.error(f"Error ensuring headers: {e}")
@@ -139,14 +536,11 @@ class SheetsManager:
         """Ensure the battle history sheet has proper headers"""
         try:
             headers = self.battle_history_sheet.row_values(1) if self.battle_history_sheet else []
-            expected_headers = [
-                'Battle ID', 'Date', 'Fighter 1 ID', 'Fighter 1 Name', 'Fighter 2 ID', 'Fighter 2 Name',
-                'Winner ID', 'Winner Name', 'Total Turns', 'Duration (s)',
-                'F1 Final HP', 'F2 Final HP', 'F1 Damage Dealt', 'F2 Damage Dealt', 'Result Type', 'Battle Log'
-            ]
+            expected_headers = self.BATTLE_HISTORY_HEADERS
 
             if not headers or headers != expected_headers:
                 self.battle_history_sheet.update('A1:P1', [expected_headers])
+                self.cache.invalidate(self.battle_history_sheet)
                 logger.info("Battle history headers initialized")
 
         except Exception as e:
@@ -156,13 +550,11 @@ class SheetsManager:
         """Ensure the ranking sheet has proper headers"""
         try:
             headers = self.ranking_sheet.row_values(1) if self.ranking_sheet else []
-            expected_headers = [
-                'Rank', 'Character ID', 'Character Name', 'Total Battles',
-                'Wins', 'Losses', 'Draws', 'Win Rate (%)', 'Avg Damage Dealt', 'Rating'
-            ]
+            expected_headers = self.RANKING_HEADERS
 
             if not headers or headers != expected_headers:
                 self.ranking_sheet.update('A1:J1', [expected_headers])
+                self.cache.invalidate(self.ranking_sheet)
                 logger.info("Ranking headers initialized")
 
         except Exception as e:
@@ -194,35 +586,40 @@ class SheetsManager:
             if file_name is None:
                 file_name = path.name
 
-            # Determine MIME type
-            mime_type = 'image/png' if path.suffix.lower() in ['.png'] else 'image/jpeg'
-
-            # Read file and encode to base64
-            with open(path, 'rb') as f:
-                file_data = f.read()
-                b64_data = base64.b64encode(file_data).decode('utf-8')
-
-            # Prepare payload for GAS
-            payload = {
-                'secret': Settings.GAS_SHARED_SECRET,
-                'image': b64_data,
-                'mimeType': mime_type,
-                'filename': file_name,
-                'source': 'python_app'  # Distinguish from LINE bot uploads
-            }
+            # Shrink oversized images first, then stream the base64 JSON body instead of building it in memory
+            upload_path, mime_type, is_temp = prepare_upload_image(path, Settings.GAS_UPLOAD_MAX_SIZE)
+            try:
+                body = Base64JsonBody({
+                    'secret': Settings.GAS_SHARED_SECRET,
+                    'mimeType': mime_type,
+                    'filename': file_name,
+                    'source': 'python_app'  # Distinguish from LINE bot uploads
+                }, upload_path, file_field='image')
+
+                # Send request to GAS
+                started = time.perf_counter()
+                response = self.http.post(
+                    Settings.GAS_WEBHOOK_URL,
+                    data=body,
+                    headers={'Content-Type': 'application/json'},
+                    timeout=(Settings.HTTP_CONNECT_TIMEOUT, 30)
+                )
+                elapsed = time.perf_counter() - started
+            finally:
+                if is_temp:
+                    upload_path.unlink(missing_ok=True)
 
-            # Send request to GAS
-            response = requests.post(
-                Settings.GAS_WEBHOOK_URL,
-                json=payload,
-                timeout=30
-            )
+            ok = response.status_code == 200
+            throughput = self.upload_stats.record(body.bytes_sent, elapsed, ok)
+            logger.debug(f"GAS upload of {file_name}: {body.bytes_sent // 1024} KB in {elapsed:.2f}s "
+                         f"({throughput / 1024:.1f} KB/s)")
 
-            if response.status_code == 200:
+            if ok:
                 result = response.json()
                 if result.get('ok'):
                     url = result.get('url')
-                    logger.info(f"✓ Successfully uploaded {file_name} via GAS: {url}")
+                    logger.info(f"✓ Successfully uploaded {file_name} via GAS: {url} "
+                                f"({throughput / 1024:.1f} KB/s)")
                     return url
                 else:
                     error_msg = result.get('error', 'Unknown error')
@@ -264,7 +661,8 @@ class SheetsManager:
             return None
 
         # Upload via GAS (uses user's storage)
-        gas_url = self.upload_to_drive_via_gas(file_path, file_name)
+        with self._pipeline_stage('upload'):
+            gas_url = self.upload_to_drive_via_gas(file_path, file_name)
         if gas_url:
             return gas_url
         else:
@@ -333,7 +731,7 @@ class SheetsManager:
             }
 
             logger.info(f"Sending delete request to GAS for file: {file_id}")
-            response = requests.post(Settings.GAS_WEBHOOK_URL, json=payload, timeout=30)
+            response = self.http.post(Settings.GAS_WEBHOOK_URL, json=payload, timeout=(Settings.HTTP_CONNECT_TIMEOUT, 30))
 
             if response.status_code == 200:
                 result = response.json()
@@ -391,7 +789,8 @@ class SheetsManager:
 
     def download_from_url(self, url: str, save_path: str) -> bool:
         """
-        Download a file from a URL and save it locally
+        Download a file from a URL and save it locally (served from the image cache
+        if the URL was downloaded before)
 
         Args:
             url: URL of the file (Google Drive or any HTTP URL)
@@ -401,27 +800,14 @@ class SheetsManager:
             True if download succeeded, False otherwise
         """
         try:
-            # Convert Google Drive view URLs to direct download URLs
-            if 'drive.google.com' in url:
-                if '/file/d/' in url:
-                    # Extract file ID from share URL
-                    file_id = url.split('/file/d/')[1].split('/')[0]
-                    url = f"https://drive.google.com/uc?export=download&id={file_id}"
-                elif 'id=' in url:
-                    # Already in direct download format
-                    pass
-
-            # Download file
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
+            cached_path = self._resolve_image(url)
+            if not cached_path:
+                return False
 
             # Save to file
             save_path = Path(save_path)
             save_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            shutil.copyfile(cached_path, save_path)
 
             logger.info(f"Successfully downloaded file from {url} to {save_path}")
             return True
@@ -430,6 +816,13 @@ class SheetsManager:
             logger.error(f"Failed to download file from {url}: {e}")
             return False
 
+    def _resolve_image(self, url: str) -> Optional[str]:
+        """Get the local cached file for an image URL, downloading it at most once"""
+        if self.image_cache.contains(url):
+            return self.image_cache.resolve(url, http=self.http)
+        with self._pipeline_stage('download'):
+            return self.image_cache.resolve(url, http=self.http)
+
     def save_character(self, character: Character) -> bool:
         """
         Save character to spreadsheet (create new or update existing)
@@ -444,10 +837,10 @@ class SheetsManager:
             # Check if character already exists by name (since ID format differs)
             # Use silent=True to suppress "not found" warning for new characters
             if character.name:
-                existing = self.get_character_by_name(character.name, silent=True)
-                if existing:
+                existing_id = self.get_character_id_by_name(character.name)
+                if existing_id:
                     # Update with existing sheet ID
-                    character.id = existing.id
+                    character.id = existing_id
                     return self.update_character(character)
 
             # Create new character
@@ -462,19 +855,17 @@ class SheetsManager:
         try:
             self._ensure_headers()
 
-            # Get next ID
-            all_records = self.worksheet.get_all_records()
-            next_id = len(all_records) + 1
-
             # Upload image files to Google Drive if they exist locally
+            # (named by creation time: the ID is only reserved right before the append)
             image_url = character.image_path
             sprite_url = character.sprite_path
+            upload_name = f"char_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
 
             if character.image_path and Path(character.image_path).exists():
                 # Upload original image
                 uploaded_url = self.upload_to_drive(
                     character.image_path,
-                    f"char_{next_id}_original{Path(character.image_path).suffix}"
+                    f"{upload_name}_original{Path(character.image_path).suffix}"
                 )
                 if uploaded_url:
                     image_url = uploaded_url
@@ -486,7 +877,7 @@ class SheetsManager:
                 # Upload sprite image (always PNG for transparency)
                 uploaded_url = self.upload_to_drive(
                     character.sprite_path,
-                    f"char_{next_id}_sprite.png"
+                    f"{upload_name}_sprite.png"
                 )
                 if uploaded_url:
                     sprite_url = uploaded_url
@@ -495,8 +886,11 @@ class SheetsManager:
                     logger.warning(f"⚠ Failed to upload sprite to Drive, using local path: {character.sprite_path}")
 
             # Prepare row data with Drive URLs
-            # Calculate losses and draws from battle_count and win_count
-            losses = character.battle_count - character.win_count
+            # Calculate losses from battle_count, win_count and draw_count
+            losses = character.battle_count - character.win_count - character.draw_count
+
+            # Reserve next ID (reads column A only)
+            next_id = self.character_ids.allocate(self.worksheet)
 
             row = [
                 next_id,
@@ -513,11 +907,21 @@ class SheetsManager:
                 datetime.now().isoformat(),
                 character.win_count,
                 losses,
-                0  # draws (not tracked in current model)
+                character.draw_count
             ]
 
-            # Append to sheet
-            self.worksheet.append_row(row)
+            # Append to sheet (an ID that was not appended goes back to the allocator)
+            try:
+                response = self.worksheet.append_row(row)
+            except Exception:
+                self.character_ids.release(next_id)
+                raise
+            self.cache.patch_append(self.worksheet, dict(zip(self.CHARACTER_HEADERS, row)))
+            appended_row = self._appended_row_number(response)
+            if appended_row:
+                self.row_index.add(next_id, character.name, appended_row)
+            else:
+                self.row_index.invalidate()
             character.id = str(next_id)  # Convert to string to match Character model
 
             logger.info(f"Character created: {character.name} (ID: {next_id})")
@@ -545,7 +949,7 @@ class SheetsManager:
                 logger.warning(f"Invalid character ID format: {character_id}")
                 return None
 
-            all_records = self.worksheet.get_all_records()
+            all_records = self._get_records(self.worksheet)
 
             for record in all_records:
                 if record.get('ID') == char_id:
@@ -565,6 +969,16 @@ class SheetsManager:
             progress_callback: Optional callback function(current, total, char_name, step)
                                to report progress during AI generation and sprite processing
         """
+        return self._run_steps(self.iter_all_characters(progress_callback))
+
+    def iter_all_characters(self, progress_callback=None) -> Generator[None, None, List[Character]]:
+        """get_all_characters() in steps: yields between pieces of work, returns the characters
+
+        AI generation and sprite processing run on pipeline workers, which hand their
+        sheet writes back to this generator, so every step (and every sheet write) runs
+        on the thread that advances it. SheetsActor advances one step at a time and runs
+        other calls in between.
+        """
         try:
             # Fix ID integrity before processing (throttled to avoid API quota)
             import time
@@ -576,10 +990,10 @@ class SheetsManager:
             else:
                 logger.debug(f"Skipping ID integrity check (last check: {int(current_time - self.last_id_integrity_check)}s ago)")
 
-            # Force fresh data from spreadsheet (avoid cache issues during endless mode)
-            # Note: gspread caches worksheet data, so we need to refresh it
-            logger.debug("Fetching fresh data from spreadsheet...")
-            all_records = self.worksheet.get_all_records()
+            # Served from the snapshot cache for up to SHEETS_CACHE_TTL seconds
+            # (endless mode calls refresh() before polling for new characters)
+            logger.debug("Fetching character data from spreadsheet...")
+            all_records = self._get_records(self.worksheet)
             logger.debug(f"Retrieved {len(all_records)} records from spreadsheet")
 
             characters = []
@@ -615,10 +1029,16 @@ class SheetsManager:
             if records_needing_sprite:
                 logger.info(f"Found {len(records_needing_sprite)} character(s) needing sprite processing")
 
-            # Second pass: process all records
+            # Second pass: records needing AI generation, sprite processing or a sprite download
+            # run on a bounded thread pool (stage limits in _pipeline_stage); the rest convert inline
+            yield  # Records read; conversion and generation follow
+
+            report = self._serialize_callback(progress_callback)
+            results: List[Optional[Character]] = [None] * len(all_records)
+            jobs = []
             generation_count = 0
             sprite_count = 0
-            for record in all_records:
+            for index, record in enumerate(all_records):
                 # Check various conditions for needing generation
                 hp_value = record.get('HP')
                 name_value = record.get('Name')
@@ -640,39 +1060,49 @@ class SheetsManager:
                 if needs_generation:
                     generation_count += 1
                     logger.info(f"Detected character with empty stats: ID {record.get('ID')} (HP={repr(hp_value)}, Name={repr(name_value)})")
+                    jobs.append((index, self._run_generation_job,
+                                 (record, report, generation_count, len(records_needing_generation))))
+                    continue
 
-                    # Generate stats using AI with progress callback
-                    generated_char = self._generate_stats_for_character(
-                        record,
-                        progress_callback=progress_callback,
-                        current=generation_count,
-                        total=len(records_needing_generation)
-                    )
-                    if generated_char:
-                        logger.info(f"✓ Successfully generated character: {generated_char.name} (ID: {generated_char.id})")
-                        characters.append(generated_char)
-                    else:
-                        logger.error(f"✗ Failed to generate character for ID {record.get('ID')} - skipping")
-                        # Skip this character - it will be retried on next get_all_characters() call
+                # Check if sprite needs processing
+                image_url = str(record.get('Image URL', '')) if record.get('Image URL') else None
+                sprite_url = str(record.get('Sprite URL', '')) if record.get('Sprite URL') else None
+                needs_sprite = (sprite_url == image_url and sprite_url and image_url)
+
+                if needs_sprite:
+                    sprite_count += 1
+                    jobs.append((index, self._run_sprite_job,
+                                 (record, report, sprite_count, len(records_needing_sprite))))
+                elif self._needs_sprite_download(record):
+                    jobs.append((index, self._record_to_character, (record,)))
                 else:
-                    # Check if sprite needs processing
-                    image_url = str(record.get('Image URL', '')) if record.get('Image URL') else None
-                    sprite_url = str(record.get('Sprite URL', '')) if record.get('Sprite URL') else None
-                    needs_sprite = (sprite_url == image_url and sprite_url and image_url)
-
-                    if needs_sprite:
-                        sprite_count += 1
-                        if progress_callback:
-                            progress_callback(
-                                sprite_count,
-                                len(records_needing_sprite),
-                                record.get('Name', f"ID {record.get('ID')}"),
-                                "スプライト処理中"
-                            )
-
-                    char = self._record_to_character(record, progress_callback=progress_callback if needs_sprite else None)
-                    if char:
-                        characters.append(char)
+                    results[index] = self._record_to_character(record)
+
+            if jobs:
+                if not self.row_index.loaded:
+                    self._load_row_index()  # Shared by all workers writing back to the sheet
+
+                workers = max(1, min(Settings.CHARACTER_PIPELINE_WORKERS, len(jobs)))
+                logger.info(f"Processing {len(jobs)} character(s) with {workers} worker(s)")
+                sheet_writes = queue.Queue()
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="CharacterPipeline") as executor:
+                    futures = {executor.submit(self._run_pipeline_job, sheet_writes, job, *args): index
+                               for index, job, args in jobs}
+                    pending = set(futures)
+                    while pending:
+                        done, pending = wait(pending, timeout=self.PIPELINE_STEP_SECONDS,
+                                             return_when=FIRST_COMPLETED)
+                        self._apply_sheet_writes(sheet_writes)
+                        for future in done:
+                            try:
+                                results[futures[future]] = future.result()
+                            except Exception as job_error:
+                                logger.error(f"Error processing character record: {job_error}")
+                        if pending:
+                            yield
+                self._apply_sheet_writes(sheet_writes)
+
+            characters = [char for char in results if char]
 
             logger.info(f"Retrieved {len(characters)} characters")
             return characters
@@ -681,11 +1111,108 @@ class SheetsManager:
             logger.error(f"Error getting all characters: {e}")
             return []
 
+    @staticmethod
+    def _run_steps(steps: Generator) -> Any:
+        """Run a stepwise method (iter_*) to completion and return its result"""
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+    def _run_pipeline_job(self, sheet_writes: "queue.Queue", job, *args):
+        """Run a pipeline job on a worker thread, queueing its sheet writes for the caller's thread"""
+        self._pipeline_local.sheet_writes = sheet_writes
+        try:
+            return job(*args)
+        finally:
+            self._pipeline_local.sheet_writes = None
+
+    def _sheet_write(self, write, *args):
+        """Write to the sheet now, or queue the write when called from a pipeline worker"""
+        sheet_writes = getattr(self._pipeline_local, 'sheet_writes', None)
+        if sheet_writes is None:
+            return write(*args)
+        sheet_writes.put((write, args))
+        return None
+
+    @staticmethod
+    def _apply_sheet_writes(sheet_writes: "queue.Queue"):
+        """Run the sheet writes pipeline workers have queued so far"""
+        while True:
+            try:
+                write, args = sheet_writes.get_nowait()
+            except queue.Empty:
+                return
+            write(*args)
+
+    def _run_generation_job(self, record: Dict[str, Any], progress_callback, current: int, total: int) -> Optional[Character]:
+        """Pipeline job: generate stats (and sprite) for a record with empty stats"""
+        generated_char = self._generate_stats_for_character(
+            record,
+            progress_callback=progress_callback,
+            current=current,
+            total=total
+        )
+        if generated_char:
+            logger.info(f"✓ Successfully generated character: {generated_char.name} (ID: {generated_char.id})")
+        else:
+            # Skip this character - it will be retried on next get_all_characters() call
+            logger.error(f"✗ Failed to generate character for ID {record.get('ID')} - skipping")
+        return generated_char
+
+    def _run_sprite_job(self, record: Dict[str, Any], progress_callback, current: int, total: int) -> Optional[Character]:
+        """Pipeline job: create the sprite for a record whose Sprite URL is still the original image"""
+        if progress_callback:
+            progress_callback(current, total, record.get('Name', f"ID {record.get('ID')}"), "スプライト処理中")
+        return self._record_to_character(record, progress_callback=progress_callback)
+
+    def _needs_sprite_download(self, record: Dict[str, Any]) -> bool:
+        """Check whether converting a record will download from Drive (sprite not in the image cache yet)"""
+        sprite_url = str(record.get('Sprite URL', '') or '')
+        if sprite_url.startswith('http'):
+            return not self.image_cache.contains(sprite_url)
+        image_url = str(record.get('Image URL', '') or '')
+        return image_url.startswith('http') and not self.image_cache.contains(self._local_sprite_key(image_url))
+
+    @staticmethod
+    def _local_sprite_key(image_url: str) -> str:
+        """Image cache key of the sprite made locally from an image URL"""
+        return f"sprite-of:{image_url}"
+
+    def _create_local_sprite(self, image_url: str, original_path) -> Tuple[bool, str, Optional[str]]:
+        """Make a transparent sprite from a character image and cache it under the image URL
+
+        Sprites are keyed by the source image, never by character ID, so renumbered or
+        reused IDs can't pick up another character's sprite.
+
+        Returns:
+            (success, message, cached sprite path)
+        """
+        from src.services.image_processor import ImageProcessor
+        stem = f"sprite_{hashlib.sha256(image_url.encode('utf-8')).hexdigest()[:16]}"
+        with self._pipeline_stage('cpu'):
+            success, message, sprite_output = ImageProcessor().process_character_image(
+                str(original_path), str(Settings.SPRITES_DIR), stem)
+        if success and sprite_output:
+            sprite_output = self.image_cache.put_file(self._local_sprite_key(image_url), sprite_output) or sprite_output
+        return success, message, sprite_output
+
+    @staticmethod
+    def _serialize_callback(progress_callback):
+        """Wrap a progress callback so pipeline workers never call it concurrently"""
+        if progress_callback is None:
+            return None
+        lock = threading.Lock()
+
+        def report(*args):
+            with lock:
+                progress_callback(*args)
+        return report
+
     def update_character(self, character: Character) -> bool:
         """Update an existing character"""
         try:
-            all_records = self.worksheet.get_all_records()
-
             # Convert character.id to int for comparison with spreadsheet ID
             try:
                 char_id = int(character.id) if isinstance(character.id, str) else character.id
@@ -693,53 +1220,53 @@ class SheetsManager:
                 logger.error(f"Invalid character ID format: {character.id}")
                 return False
 
-            for idx, record in enumerate(all_records):
-                if record.get('ID') == char_id:
-                    # Row number in sheet (accounting for header)
-                    row_num = idx + 2
-
-                    # Prepare updated row
-                    # Calculate losses from battle_count and win_count
-                    losses = character.battle_count - character.win_count
-
-                    # Preserve existing Image URL and Sprite URL from the sheet (don't overwrite with local paths)
-                    existing_image_url = record.get('Image URL', '')
-                    existing_sprite_url = record.get('Sprite URL', '')
-
-                    # Only use character's paths if they are URLs (http/https), otherwise keep existing
-                    image_url = existing_image_url
-                    sprite_url = existing_sprite_url
-
-                    if character.image_path and (character.image_path.startswith('http://') or character.image_path.startswith('https://')):
-                        image_url = character.image_path
-                    if character.sprite_path and (character.sprite_path.startswith('http://') or character.sprite_path.startswith('https://')):
-                        sprite_url = character.sprite_path
-
-                    row = [
-                        character.id,
-                        character.name,
-                        image_url,  # Preserve existing URL or use new URL (never local path)
-                        sprite_url,  # Preserve existing URL or use new URL (never local path)
-                        character.hp,
-                        character.attack,
-                        character.defense,
-                        character.speed,
-                        character.magic,
-                        character.luck,
-                        character.description or '',
-                        record.get('Created At', ''),  # Keep original creation time
-                        character.win_count,
-                        losses,
-                        0  # draws (not tracked in current model)
-                    ]
+            row_num = self._find_character_row(char_id)
+            if not row_num:
+                logger.warning(f"Character not found for update: ID {character.id}")
+                return False
 
-                    # Update the row
-                    self.worksheet.update(f'A{row_num}:O{row_num}', [row])
-                    logger.info(f"✓ Character updated: {character.name} (ID: {character.id}) - Image URLs preserved")
-                    return True
+            # Calculate losses from battle_count and win_count
+            losses = character.battle_count - character.win_count - character.draw_count
+
+            # Image URL, Sprite URL and Created At are left untouched in the sheet unless
+            # the character carries new URLs (never overwrite them with local paths)
+            data = [
+                {'range': f'B{row_num}', 'values': [[character.name]]},
+                {'range': f'E{row_num}:K{row_num}', 'values': [[
+                    character.hp,
+                    character.attack,
+                    character.defense,
+                    character.speed,
+                    character.magic,
+                    character.luck,
+                    character.description or ''
+                ]]},
+                {'range': f'M{row_num}:O{row_num}', 'values': [[
+                    character.win_count,
+                    losses,
+                    character.draw_count
+                ]]}
+            ]
+            patch = {
+                'Name': character.name, 'HP': character.hp, 'Attack': character.attack,
+                'Defense': character.defense, 'Speed': character.speed, 'Magic': character.magic,
+                'Luck': character.luck, 'Description': character.description or '',
+                'Wins': character.win_count, 'Losses': losses, 'Draws': character.draw_count
+            }
 
-            logger.warning(f"Character not found for update: ID {character.id}")
-            return False
+            if character.image_path and (character.image_path.startswith('http://') or character.image_path.startswith('https://')):
+                data.append({'range': f'C{row_num}', 'values': [[character.image_path]]})
+                patch['Image URL'] = character.image_path
+            if character.sprite_path and (character.sprite_path.startswith('http://') or character.sprite_path.startswith('https://')):
+                data.append({'range': f'D{row_num}', 'values': [[character.sprite_path]]})
+                patch['Sprite URL'] = character.sprite_path
+
+            # Update the row (single API call, no preceding read)
+            self.worksheet.batch_update(data)
+            self.cache.patch_row(self.worksheet, row_num - 2, patch)
+            self.row_index.set_name(char_id, character.name)
+            logger.info(f"✓ Character updated: {character.name} (ID: {character.id}) - Image URLs preserved")
+            return True
 
         except Exception as e:
             logger.error(f"Error updating character: {e}")
@@ -772,7 +1299,7 @@ class SheetsManager:
                 logger.info(f"Force deleting character {char_id} with {battle_count} battle(s)")
 
                 # Get all battle history records
-                battle_records = self.battle_history_sheet.get_all_records()
+                battle_records = self._get_records(self.battle_history_sheet)
                 char_id_str = str(char_id)
 
                 # Find and delete rows in reverse order to avoid index shifting
@@ -785,17 +1312,20 @@ class SheetsManager:
                         # Row number in sheet (accounting for header)
                         row_num = idx + 2
                         rows_to_delete.append(row_num)
+                        self.battle_logs.delete(record.get('Battle ID'))
 
                 # Delete rows in reverse order to avoid index shifting
                 for row_num in sorted(rows_to_delete, reverse=True):
                     self.battle_history_sheet.delete_rows(row_num)
+                self.refresh(self.battle_history_sheet)
 
                 logger.info(f"Deleted {len(rows_to_delete)} battle history record(s) for character {char_id}")
+                self._invalidate_damage_stats()
 
             # Delete from Rankings sheet if it exists
             if self.ranking_sheet:
                 try:
-                    ranking_records = self.ranking_sheet.get_all_records()
+                    ranking_records = self._get_records(self.ranking_sheet)
                     char_id_str = str(char_id)
 
                     # Find and delete ranking rows in reverse order
@@ -811,6 +1341,8 @@ class SheetsManager:
                     # Delete rows in reverse order to avoid index shifting
                     for row_num in sorted(ranking_rows_to_delete, reverse=True):
                         self.ranking_sheet.delete_rows(row_num)
+                    if ranking_rows_to_delete:
+                        self.cache.invalidate(self.ranking_sheet)
 
                     if ranking_rows_to_delete:
                         logger.info(f"Deleted {len(ranking_rows_to_delete)} ranking record(s) for character {char_id}")
@@ -818,7 +1350,7 @@ class SheetsManager:
                     logger.warning(f"Error deleting from ranking sheet: {ranking_e}")
 
             # Delete the character from Characters sheet
-            all_records = self.worksheet.get_all_records()
+            all_records = self._get_records(self.worksheet)
 
             for idx, record in enumerate(all_records):
                 if record.get('ID') == char_id:
@@ -830,6 +1362,9 @@ class SheetsManager:
                     # Row number in sheet (accounting for header)
                     row_num = idx + 2
                     self.worksheet.delete_rows(row_num)
+                    self.cache.invalidate(self.worksheet)
+                    self.row_index.remove(char_id)
+                    self.character_ids.reset()
                     logger.info(f"Character deleted from sheet: ID {char_id}")
 
                     # Delete images from Google Drive if URLs are available
@@ -930,6 +1465,7 @@ class SheetsManager:
             # Update battle_count and win_count based on new wins/losses/draws
             character.battle_count += wins + losses + draws
             character.win_count += wins
+            character.draw_count += draws
 
             return self.update_character(character)
 
@@ -948,8 +1484,8 @@ class SheetsManager:
             image_url = str(record.get('Image URL', '')) if record.get('Image URL') else None
             sprite_url = str(record.get('Sprite URL', '')) if record.get('Sprite URL') else None
 
-            # Handle sprite image
-            local_sprite_path = Settings.SPRITES_DIR / f"char_{record.get('ID')}_sprite.png"
+            # Sprite made locally from this image by an earlier run whose upload failed (no Sprite URL in the sheet)
+            local_sprite = self.image_cache.get_file(self._local_sprite_key(image_url)) if image_url else None
 
             # Check if sprite_url is same as image_url (manual registration from LINE/GAS)
             # In this case, sprite has not been processed yet
@@ -959,34 +1495,27 @@ class SheetsManager:
                 logger.info(f"Character {record.get('ID')}: Sprite URL equals Image URL, needs processing")
 
             if sprite_url and sprite_url.startswith('http') and not sprite_needs_processing:
-                # Sprite URL exists and is different from image URL - download it
-                if not local_sprite_path.exists():
+                # Sprite URL exists and is different from image URL - resolve it through the image cache
+                # (keyed by URL, so renumbered character IDs can't pick up another character's sprite)
+                if not self.image_cache.contains(sprite_url):
                     logger.info(f"Character {record.get('ID')}: Downloading sprite from {sprite_url}")
-                    self.download_from_url(sprite_url, str(local_sprite_path))
-                sprite_path = str(local_sprite_path) if local_sprite_path.exists() else sprite_url
-            elif (sprite_needs_processing or not local_sprite_path.exists()) and image_url and image_url.startswith('http'):
+                sprite_path = self._resolve_image(sprite_url) or sprite_url
+            elif (sprite_needs_processing or (not sprite_url and not local_sprite)) and image_url and image_url.startswith('http'):
                 # Need to create sprite from original image
                 logger.info(f"Character {record.get('ID')}: Creating sprite from image URL")
-                temp_image_path = Settings.CHARACTERS_DIR / f"char_{record.get('ID')}_temp.png"
 
                 try:
-                    # Download original image temporarily
-                    if self.download_from_url(image_url, str(temp_image_path)):
+                    # Original image (cached by URL)
+                    original_path = self._resolve_image(image_url)
+                    if original_path:
                         # Validate downloaded file
-                        if not temp_image_path.exists() or temp_image_path.stat().st_size == 0:
+                        if not Path(original_path).exists() or Path(original_path).stat().st_size == 0:
                             logger.warning(f"Downloaded file is empty or doesn't exist for character {record.get('ID')}")
                             sprite_path = sprite_url if sprite_url else ''
                         else:
                             # Process image to create sprite with transparency
-                            from src.services.image_processor import ImageProcessor
-                            processor = ImageProcessor()
-
                             try:
-                                success, message, sprite_output = processor.process_character_image(
-                                    str(temp_image_path),
-                                    str(Settings.SPRITES_DIR),
-                                    f"char_{record.get('ID')}"
-                                )
+                                success, message, sprite_output = self._create_local_sprite(image_url, original_path)
 
                                 if success and sprite_output:
                                     sprite_path = sprite_output
@@ -999,15 +1528,12 @@ class SheetsManager:
                                             f"char_{record.get('ID')}_sprite.png"
                                         )
                                         if uploaded_sprite_url:
+                                            # Our upload is the content of the new URL - no need to download it later
+                                            sprite_path = self.image_cache.put_file(uploaded_sprite_url, sprite_output) or sprite_output
+
                                             # Update Sprite URL in sheet
-                                            char_id = int(record.get('ID'))
-                                            all_records_for_update = self.worksheet.get_all_records()
-                                            for idx, rec in enumerate(all_records_for_update):
-                                                if rec.get('ID') == char_id:
-                                                    row_num = idx + 2  # +2 for header and 0-indexing
-                                                    self.worksheet.update_cell(row_num, 4, uploaded_sprite_url)  # Column 4 is Sprite URL
-                                                    logger.info(f"✓ Updated Sprite URL in sheet for character {char_id}")
-                                                    break
+                                            self._sheet_write(self._update_sprite_url_in_sheet,
+                                                              int(record.get('ID')), uploaded_sprite_url)
                                     except Exception as upload_error:
                                         logger.warning(f"Failed to upload sprite to Drive: {upload_error}")
                                 else:
@@ -1022,15 +1548,8 @@ class SheetsManager:
                 except Exception as e:
                     logger.error(f"Sprite processing failed for character {record.get('ID')}: {e}")
                     sprite_path = sprite_url if sprite_url else ''
-                finally:
-                    # Clean up temporary file
-                    if temp_image_path.exists():
-                        try:
-                            temp_image_path.unlink()
-                        except Exception as cleanup_error:
-                            logger.warning(f"Failed to cleanup temp file: {cleanup_error}")
             else:
-                sprite_path = sprite_url if sprite_url else str(local_sprite_path) if local_sprite_path.exists() else ''
+                sprite_path = sprite_url if sprite_url else local_sprite or ''
 
             # Use URL directly for original image (no local download needed)
             image_path = image_url if image_url else ''
@@ -1055,7 +1574,8 @@ class SheetsManager:
                 luck=int(record.get('Luck', 50)),
                 description=str(record.get('Description', '')) if record.get('Description') else '',
                 battle_count=battle_count,
-                win_count=win_count
+                win_count=win_count,
+                draw_count=draws
             )
         except Exception as e:
             logger.error(f"Error converting record to character: {e}")
@@ -1081,27 +1601,20 @@ class SheetsManager:
                 logger.error(f"No image URL found for character {char_id}")
                 return None
 
-            # Download image from URL to local cache
-            local_path = Settings.CHARACTERS_DIR / f"char_{char_id}_original.png"
-            logger.info(f"  Local path: {local_path}")
-            logger.info(f"  File exists: {local_path.exists()}")
-
-            if not local_path.exists():
+            # Download image from URL to the local image cache
+            if not self.image_cache.contains(image_url):
                 logger.info(f"Downloading image from {image_url}")
                 if progress_callback:
                     progress_callback(current, total, None, "画像をダウンロード中...")
-
-                download_success = self.download_from_url(image_url, str(local_path))
-                if download_success:
-                    logger.info(f"✓ Image downloaded successfully to {local_path}")
-                else:
-                    logger.error(f"✗ Failed to download image for character {char_id}")
             else:
-                logger.info(f"Using existing local image: {local_path}")
+                logger.info(f"Using cached image for {image_url}")
 
-            if not local_path.exists():
-                logger.error(f"Failed to download image for character {char_id}")
+            cached_path = self._resolve_image(image_url)
+            if not cached_path or not Path(cached_path).exists():
+                logger.error(f"✗ Failed to download image for character {char_id}")
                 return None
+            local_path = Path(cached_path)
+            logger.info(f"  Local path: {local_path}")
 
             # Use AI analyzer to generate stats BEFORE sprite processing
             # (AI analysis needs the original image)
@@ -1110,7 +1623,8 @@ class SheetsManager:
                 progress_callback(current, total, None, "AIが画像を分析中...")
 
             ai_analyzer = AIAnalyzer()
-            char_stats = ai_analyzer.analyze_character(str(local_path))
+            with self._pipeline_stage('upload'):  # Request carries the image, same limit as Drive uploads
+                char_stats = ai_analyzer.analyze_character(str(local_path))
 
             if not char_stats:
                 logger.error(f"✗ AI analysis failed for character {char_id}")
@@ -1123,17 +1637,10 @@ class SheetsManager:
             if progress_callback:
                 progress_callback(current, total, char_stats.name, "スプライトを作成中...")
 
-            from src.services.image_processor import ImageProcessor
-            image_processor = ImageProcessor()
-
             # Create sprite with transparency
             sprite_path = None
             sprite_url = None
-            success, message, sprite_output = image_processor.process_character_image(
-                str(local_path),
-                str(Settings.SPRITES_DIR),
-                f"char_{char_id}"
-            )
+            success, message, sprite_output = self._create_local_sprite(image_url, local_path)
 
             if success and sprite_output:
                 sprite_path = sprite_output
@@ -1147,17 +1654,11 @@ class SheetsManager:
                 sprite_url = self.upload_to_drive(sprite_path, f"char_{char_id}_sprite.png")
                 if sprite_url:
                     logger.info(f"✓ Uploaded sprite to Drive: {sprite_url}")
+                    # Our upload is the content of the new URL - no need to download it later
+                    sprite_path = self.image_cache.put_file(sprite_url, sprite_path) or sprite_path
                 else:
                     logger.warning(f"Failed to upload sprite to Drive, using local path")
                     sprite_url = sprite_path
-
-                # Delete original image after sprite creation (no longer needed locally)
-                try:
-                    if local_path.exists():
-                        local_path.unlink()
-                        logger.info(f"✓ Deleted original image after sprite creation: {local_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete original image: {e}")
             else:
                 logger.warning(f"Failed to create sprite: {message}, using original image")
                 sprite_path = str(local_path)
@@ -1255,7 +1756,7 @@ class SheetsManager:
             if progress_callback:
                 progress_callback(current, total, analyzed_char.name, "スプレッドシートを更新中...")
 
-            self._update_character_stats_in_sheet(char_id, analyzed_char, sprite_url)
+            self._sheet_write(self._update_character_stats_in_sheet, char_id, analyzed_char, sprite_url)
 
             logger.info(f"✓ Successfully generated stats for character '{analyzed_char.name}' (ID: {char_id})")
             if progress_callback:
@@ -1269,6 +1770,20 @@ class SheetsManager:
             logger.error(traceback.format_exc())
             return None
 
+    def _update_sprite_url_in_sheet(self, char_id: int, sprite_url: str) -> bool:
+        """Write a character's Sprite URL (column D) and patch the cached snapshot"""
+        try:
+            row_num = self._find_character_row(char_id)
+            if not row_num:
+                return False
+            self.worksheet.update_cell(row_num, 4, sprite_url)  # Column 4 is Sprite URL
+            self.cache.patch_row(self.worksheet, row_num - 2, {'Sprite URL': sprite_url})
+            logger.info(f"✓ Updated Sprite URL in sheet for character {char_id}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to update Sprite URL in sheet: {e}")
+            return False
+
     def _update_character_stats_in_sheet(self, char_id: int, character: Character, sprite_url: str = None) -> bool:
         """Update character stats in spreadsheet using batch update for efficiency
 
@@ -1278,45 +1793,41 @@ class SheetsManager:
             sprite_url: Optional sprite URL to update (if None, preserve existing)
         """
         try:
-            all_records = self.worksheet.get_all_records()
-
-            for idx, record in enumerate(all_records):
-                if record.get('ID') == char_id:
-                    row_num = idx + 2  # +2 because of header row and 0-indexing
-
-                    # Get existing Image URL and Sprite URL (don't overwrite them unless specified)
-                    existing_image_url = record.get('Image URL', '')
-                    existing_sprite_url = record.get('Sprite URL', '')
-
-                    # Use provided sprite_url if available, otherwise preserve existing
-                    final_sprite_url = sprite_url if sprite_url else existing_sprite_url
-
-                    # Use update() with range to update multiple cells at once
-                    # Columns: B=Name, C=Image URL, D=Sprite URL, E=HP, F=Attack, G=Defense, H=Speed, I=Magic, J=Luck, K=Description
-                    cell_range = f'B{row_num}:K{row_num}'
-                    values = [[
-                        character.name,           # B: Name
-                        existing_image_url,       # C: Image URL (preserve existing)
-                        final_sprite_url,         # D: Sprite URL (use new if provided, otherwise preserve)
-                        character.hp,             # E: HP
-                        character.attack,         # F: Attack
-                        character.defense,        # G: Defense
-                        character.speed,          # H: Speed
-                        character.magic,          # I: Magic
-                        character.luck,           # J: Luck
-                        character.description     # K: Description
-                    ]]
-
-                    # Use update() with range for batch update (single API call)
-                    self.worksheet.update(cell_range, values, value_input_option='USER_ENTERED')
-
-                    logger.info(f"✓ Updated stats in spreadsheet for character {char_id} (Name: {character.name})")
-                    if sprite_url:
-                        logger.info(f"✓ Updated sprite URL: {sprite_url}")
-                    return True
+            row_num = self._find_character_row(char_id)
+            if not row_num:
+                logger.warning(f"Character not found in spreadsheet: ID {char_id}")
+                return False
 
-            logger.warning(f"Character not found in spreadsheet: ID {char_id}")
-            return False
+            # Columns: B=Name, D=Sprite URL, E=HP, F=Attack, G=Defense, H=Speed, I=Magic, J=Luck, K=Description
+            # Image URL (C) is never touched; Sprite URL only when a new one is provided
+            stats = [
+                character.hp,             # E: HP
+                character.attack,         # F: Attack
+                character.defense,        # G: Defense
+                character.speed,          # H: Speed
+                character.magic,          # I: Magic
+                character.luck,           # J: Luck
+                character.description     # K: Description
+            ]
+            data = [
+                {'range': f'B{row_num}', 'values': [[character.name]]},
+                {'range': f'E{row_num}:K{row_num}', 'values': [stats]}
+            ]
+            patch = dict(zip(self.CHARACTER_HEADERS[4:11], stats))
+            patch['Name'] = character.name
+            if sprite_url:
+                data.append({'range': f'D{row_num}', 'values': [[sprite_url]]})
+                patch['Sprite URL'] = sprite_url
+
+            # Single API call for all ranges
+            self.worksheet.batch_update(data, value_input_option='USER_ENTERED')
+            self.cache.patch_row(self.worksheet, row_num - 2, patch)
+            self.row_index.set_name(char_id, character.name)
+
+            logger.info(f"✓ Updated stats in spreadsheet for character {char_id} (Name: {character.name})")
+            if sprite_url:
+                logger.info(f"✓ Updated sprite URL: {sprite_url}")
+            return True
 
         except Exception as e:
             logger.error(f"Error updating character stats in sheet: {e}")
@@ -1336,7 +1847,7 @@ class SheetsManager:
             Character object if found, None otherwise
         """
         try:
-            all_records = self.worksheet.get_all_records()
+            all_records = self._get_records(self.worksheet)
 
             for record in all_records:
                 if record.get('Name') == name:
@@ -1362,7 +1873,7 @@ class SheetsManager:
     def get_character_count(self) -> int:
         """Get total number of characters"""
         try:
-            all_records = self.worksheet.get_all_records()
+            all_records = self._get_records(self.worksheet)
             return len(all_records)
         except Exception as e:
             logger.error(f"Error getting character count: {e}")
@@ -1378,7 +1889,7 @@ class SheetsManager:
         """
         try:
             logger.info("Starting bulk import of characters...")
-            all_records = self.worksheet.get_all_records()
+            all_records = self._get_records(self.worksheet)
             characters = []
 
             for record in all_records:
@@ -1403,6 +1914,18 @@ class SheetsManager:
                               winner_id, winner_name, total_turns, duration,
                               f1_final_hp, f2_final_hp, f1_damage_dealt, f2_damage_dealt, result_type
 
+        Returns:
+            True if successful, False otherwise (or offline mode)
+        """
+        return self.record_battle_histories([battle_data])
+
+    def record_battle_histories(self, battles: List[Dict[str, Any]]) -> bool:
+        """
+        Record several battle results to the BattleHistory sheet in one append call
+
+        Args:
+            battles: List of battle_data dictionaries (see record_battle_history)
+
         Returns:
             True if successful, False otherwise (or offline mode)
         """
@@ -1411,48 +1934,71 @@ class SheetsManager:
             logger.debug("Offline mode: Skipping battle history recording")
             return False
 
+        if not battles:
+            return True
+
         try:
             if not self.battle_history_sheet:
                 logger.error("Battle history sheet not initialized")
                 return False
 
-            # Get next battle ID
-            all_records = self.battle_history_sheet.get_all_records()
-            next_battle_id = len(all_records) + 1
+            # Reserve battle IDs (reads column A only, not the logs)
+            next_battle_id = self.battle_ids.allocate(self.battle_history_sheet, len(battles))
 
-            # Prepare battle log (join with newlines for readability)
-            battle_log = battle_data.get('battle_log', [])
-            battle_log_str = '\n'.join(battle_log) if battle_log else ''
+            rows = [self._build_battle_history_row(battle_data, next_battle_id + i)
+                    for i, battle_data in enumerate(battles)]
 
-            # Prepare row data
-            row = [
-                next_battle_id,
-                datetime.now().isoformat(),
-                battle_data.get('fighter1_id', ''),
-                battle_data.get('fighter1_name', ''),
-                battle_data.get('fighter2_id', ''),
-                battle_data.get('fighter2_name', ''),
-                battle_data.get('winner_id', ''),
-                battle_data.get('winner_name', ''),
-                battle_data.get('total_turns', 0),
-                battle_data.get('duration', 0.0),
-                battle_data.get('f1_final_hp', 0),
-                battle_data.get('f2_final_hp', 0),
-                battle_data.get('f1_damage_dealt', 0),
-                battle_data.get('f2_damage_dealt', 0),
-                battle_data.get('result_type', 'Unknown'),
-                battle_log_str
-            ]
+            # Append to sheet (IDs that were not appended go back to the allocator)
+            try:
+                response = self.battle_history_sheet.append_rows(rows)
+            except Exception:
+                self.battle_ids.release(next_battle_id, len(rows))
+                raise
+            appended = self._appended_rows(response)
+            self._history_last_row = appended[1] if appended else None
+            for row in rows:
+                self.cache.patch_append(self.battle_history_sheet, dict(zip(self.BATTLE_HISTORY_HEADERS, row)))
+
+            # Battle logs go to the local log store, keyed by battle ID
+            for row, battle_data in zip(rows, battles):
+                if battle_data.get('battle_log'):
+                    self.battle_logs.save(row[0], battle_data['battle_log'])
+
+            if len(rows) == 1:
+                logger.info(f"Battle history recorded: Battle ID {next_battle_id}")
+            else:
+                logger.info(f"Battle history recorded: Battle IDs {next_battle_id}-{next_battle_id + len(rows) - 1}")
 
-            # Append to sheet
-            self.battle_history_sheet.append_row(row)
-            logger.info(f"Battle history recorded: Battle ID {next_battle_id}")
+            # Keep damage aggregates in sync without re-reading the history
+            for battle_data in battles:
+                self._add_damage_stats(battle_data.get('fighter1_id'), battle_data.get('f1_damage_dealt', 0))
+                self._add_damage_stats(battle_data.get('fighter2_id'), battle_data.get('f2_damage_dealt', 0))
             return True
 
         except Exception as e:
             logger.error(f"Error recording battle history: {e}")
             return False
 
+    def _build_battle_history_row(self, battle_data: Dict[str, Any], battle_id: int) -> List[Any]:
+        """Build a BattleHistory row (columns A-O) from battle_data; the battle log is stored separately"""
+        return [
+            battle_id,
+            datetime.now().isoformat(),
+            battle_data.get('fighter1_id', ''),
+            battle_data.get('fighter1_name', ''),
+            battle_data.get('fighter2_id', ''),
+            battle_data.get('fighter2_name', ''),
+            battle_data.get('winner_id', ''),
+            battle_data.get('winner_name', ''),
+            battle_data.get('total_turns', 0),
+            battle_data.get('duration', 0.0),
+            battle_data.get('f1_final_hp', 0),
+            battle_data.get('f2_final_hp', 0),
+            battle_data.get('f1_damage_dealt', 0),
+            battle_data.get('f2_damage_dealt', 0),
+            battle_data.get('result_type', 'Unknown')
+        ]
+
     def get_battle_history(self, limit: int = None) -> List[Dict[str, Any]]:
         """
         Get battle history records
@@ -1468,26 +2014,94 @@ class SheetsManager:
                 logger.warning("Battle history sheet not initialized")
                 return []
 
-            all_records = self.battle_history_sheet.get_all_records()
-
             if limit:
-                # Return most recent records
-                return all_records[-limit:]
+                # Only the last rows are read
+                return self.get_battle_history_page(limit)[0]
 
-            return all_records
+            return self._get_records(self.battle_history_sheet)
 
         except Exception as e:
             logger.error(f"Error getting battle history: {e}")
             return []
 
+    def get_battle_history_page(self, limit: int, cursor: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Get one page of battle history records, newest page first
+
+        Only the rows of the page are read (an A1 range ending at the last known row),
+        so the cost does not depend on how long the history is.
+
+        Args:
+            limit: Number of records per page
+            cursor: Cursor returned with the previous (newer) page, None for the latest battles
+
+        Returns:
+            (records in sheet order, cursor for the next older page or None if there are no older battles)
+        """
+        try:
+            if not self.battle_history_sheet or limit <= 0:
+                return [], None
+
+            # A fresh snapshot already holds every row
+            snapshot = self.cache.peek(self.battle_history_sheet)
+            if snapshot is not None:
+                end = min(cursor - 2, len(snapshot)) if cursor else len(snapshot)
+                start = max(0, end - limit)
+                return snapshot[start:end], (start + 2 if start > 0 else None)
+
+            if cursor:
+                end_row = cursor - 1
+                start_row = max(2, end_row - limit + 1)
+                if end_row < 2:
+                    return [], None
+                records = self._read_battle_history_rows(f'A{start_row}:O{end_row}')
+            else:
+                records, start_row = self._read_battle_history_tail(limit)
+
+            return records, (start_row if start_row > 2 else None)
+
+        except Exception as e:
+            logger.error(f"Error getting battle history page: {e}")
+            return [], None
+
+    def _read_battle_history_tail(self, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Read the last limit rows of BattleHistory; returns (records, first row number)"""
+        for _ in range(2):
+            if self._history_last_row is None:
+                self._history_last_row = len(self.battle_history_sheet.col_values(1))
+            start_row = max(2, self._history_last_row - limit + 1)
+
+            # Open-ended range also returns rows other clients appended since
+            records = self._read_battle_history_rows(f'A{start_row}:O')
+            expected = self._history_last_row - start_row + 1
+            if len(records) >= expected:
+                skip = len(records) - limit if len(records) > limit else 0
+                self._history_last_row = start_row + len(records) - 1
+                return records[skip:], start_row + skip
+
+            # Rows were deleted elsewhere; re-read the row count
+            self._history_last_row = None
+        return records, start_row
+
+    def _read_battle_history_rows(self, range_name: str) -> List[Dict[str, Any]]:
+        """Read a BattleHistory row range as records"""
+        return self._rows_to_records(self.BATTLE_HISTORY_HEADERS[:15], self.battle_history_sheet.get(range_name))
+
     def update_rankings(self) -> bool:
         """
         Update the Rankings sheet based on current character statistics
         Automatically calculates win rates, ratings, and sorts by performance
 
+        The sheet is never cleared: rows whose rank or values changed are written
+        with one ranged batch_update, so viewers never see an empty sheet.
+
         Returns:
             True if successful, False otherwise (or offline mode)
         """
+        return self._run_steps(self.iter_update_rankings())
+
+    def iter_update_rankings(self) -> Generator[None, None, bool]:
+        """update_rankings() in steps (reading the characters may run AI generation)"""
         # Skip in offline mode
         if not self.online_mode:
             logger.debug("Offline mode: Skipping rankings update")
@@ -1499,20 +2113,23 @@ class SheetsManager:
                 return False
 
             # Get all characters
-            characters = self.get_all_characters()
+            characters = yield from self.iter_all_characters()
 
             if not characters:
                 logger.warning("No characters to rank")
                 return False
 
-            # Calculate rankings
-            rankings = []
-            for char in characters:
+            # Load damage aggregates once for all characters (single history read at most; if it
+            # fails, every character gets 0 instead of each retrying the read)
+            damage_stats = self._get_damage_stats()
+
+            # Update the in-memory ranking order
+            for position, char in enumerate(characters):
                 # Convert from battle_count/win_count to wins/losses/draws format
                 total_battles = char.battle_count
                 wins = char.win_count
-                losses = char.battle_count - char.win_count  # Assume no draws in current model
-                draws = 0
+                draws = char.draw_count
+                losses = char.battle_count - char.win_count - draws
 
                 win_rate = (wins / total_battles * 100) if total_battles > 0 else 0
 
@@ -1520,9 +2137,9 @@ class SheetsManager:
                 rating = wins * 3 + draws * 1
 
                 # Get average damage from battle history
-                avg_damage = self._calculate_avg_damage(char.id)
+                avg_damage = self._calculate_avg_damage(char.id, damage_stats)
 
-                rankings.append({
+                self.rankings.upsert({
                     'char_id': char.id,
                     'name': char.name,
                     'total_battles': total_battles,
@@ -1532,61 +2149,129 @@ class SheetsManager:
                     'win_rate': round(win_rate, 2),
                     'avg_damage': round(avg_damage, 2),
                     'rating': rating
-                })
-
-            # Sort by rating (descending), then by win rate
-            rankings.sort(key=lambda x: (x['rating'], x['win_rate']), reverse=True)
-
-            # Clear existing rankings (except header)
-            self.ranking_sheet.clear()
-            self._ensure_ranking_headers()
-
-            # Prepare rows for batch update
-            rows = []
-            for rank, entry in enumerate(rankings, start=1):
-                row = [
-                    rank,
-                    entry['char_id'],
-                    entry['name'],
-                    entry['total_battles'],
-                    entry['wins'],
-                    entry['losses'],
-                    entry['draws'],
-                    entry['win_rate'],
-                    entry['avg_damage'],
-                    entry['rating']
-                ]
-                rows.append(row)
-
-            # Batch update all rows at once
-            if rows:
-                self.ranking_sheet.update(f'A2:J{len(rows) + 1}', rows)
+                }, position)
+            self.rankings.retain(char.id for char in characters)
+
+            # Rows sorted by rating (descending), then by win rate
+            rows = self.rankings.rows(self.RANKING_COLUMNS)
+
+            # Write only the changed rows (and blank rows left over from removed characters)
+            old_rows = self._ranking_sheet_rows()
+            changed = [
+                row_idx for row_idx in range(max(len(rows), len(old_rows)))
+                if row_idx >= len(rows) or row_idx >= len(old_rows)
+                or [self._ranking_cell(v) for v in rows[row_idx]] != [self._ranking_cell(v) for v in old_rows[row_idx]]
+            ]
+            blank_row = [''] * len(self.RANKING_HEADERS)
+            updates = []
+            for row_idx in changed:
+                if updates and updates[-1]['end'] == row_idx:
+                    updates[-1]['values'].append(rows[row_idx] if row_idx < len(rows) else blank_row)
+                    updates[-1]['end'] = row_idx + 1
+                else:
+                    updates.append({'start': row_idx, 'end': row_idx + 1,
+                                    'values': [rows[row_idx] if row_idx < len(rows) else blank_row]})
 
-            logger.info(f"Rankings updated: {len(rankings)} characters ranked")
+            if updates:
+                try:
+                    self.ranking_sheet.batch_update([
+                        {'range': f"A{block['start'] + 2}:J{block['end'] + 1}", 'values': block['values']}
+                        for block in updates
+                    ])
+                except Exception:
+                    self.rankings.sheet_rows = None  # Unknown what the sheet shows now
+                    raise
+                self.cache.invalidate(self.ranking_sheet)
+            self.rankings.sheet_rows = rows
+
+            logger.info(f"Rankings updated: {len(rows)} characters ranked, {len(changed)} row(s) written")
             return True
 
         except Exception as e:
             logger.error(f"Error updating rankings: {e}")
             return False
 
-    def _calculate_avg_damage(self, character_id: int) -> float:
-        """Calculate average damage dealt by a character from battle history"""
+    def _ranking_sheet_rows(self) -> List[List[Any]]:
+        """Rows 2.. the Rankings sheet currently shows (read once, then tracked in memory)"""
+        if self.rankings.sheet_rows is None:
+            records = self.cache.peek(self.ranking_sheet)
+            if records is not None:
+                rows = [[record.get(header, '') for header in self.RANKING_HEADERS] for record in records]
+            else:
+                rows = [list(row) for row in self.ranking_sheet.get('A2:J')]
+            while rows and not any(str(value) for value in rows[-1]):
+                rows.pop()
+            self.rankings.sheet_rows = rows
+        return self.rankings.sheet_rows
+
+    @staticmethod
+    def _ranking_cell(value) -> Any:
+        """Normalize a ranking cell for comparison (written numbers vs. values read back)"""
+        if value is None:
+            return ''
         try:
-            if not self.battle_history_sheet:
-                return 0.0
+            return float(value)
+        except (TypeError, ValueError):
+            return str(value)
 
-            all_records = self.battle_history_sheet.get_all_records()
-            total_damage = 0
-            battle_count = 0
+    def _get_damage_stats(self) -> Dict[str, List[float]]:
+        """Get damage aggregates for all characters, computed in one pass over the battle history
 
-            for record in all_records:
-                if record.get('Fighter 1 ID') == character_id:
-                    total_damage += record.get('F1 Damage Dealt', 0)
-                    battle_count += 1
-                elif record.get('Fighter 2 ID') == character_id:
-                    total_damage += record.get('F2 Damage Dealt', 0)
-                    battle_count += 1
+        Returns:
+            Dictionary of character ID (str) -> [total damage dealt, battle count]
+        """
+        if self._damage_stats is not None:
+            return self._damage_stats
 
+        damage_stats = {}
+        try:
+            if self.battle_history_sheet:
+                for record in self._get_records(self.battle_history_sheet):
+                    for id_key, damage_key in (('Fighter 1 ID', 'F1 Damage Dealt'), ('Fighter 2 ID', 'F2 Damage Dealt')):
+                        char_id = str(record.get(id_key, ''))
+                        if not char_id:
+                            continue
+                        entry = damage_stats.setdefault(char_id, [0, 0])
+                        try:
+                            entry[0] += float(record.get(damage_key, 0) or 0)
+                        except (ValueError, TypeError):
+                            pass
+                        entry[1] += 1
+            self._damage_stats = damage_stats
+            logger.debug(f"Damage aggregates loaded for {len(damage_stats)} character(s)")
+
+        except Exception as e:
+            logger.error(f"Error loading damage aggregates: {e}")
+
+        return damage_stats
+
+    def _add_damage_stats(self, character_id, damage):
+        """Add one battle to the cached damage aggregates (no-op until they are loaded)"""
+        if self._damage_stats is None or character_id in (None, ''):
+            return
+
+        entry = self._damage_stats.setdefault(str(character_id), [0, 0])
+        try:
+            entry[0] += float(damage or 0)
+        except (ValueError, TypeError):
+            pass
+        entry[1] += 1
+
+    def _invalidate_damage_stats(self):
+        """Drop cached damage aggregates (after history rows are deleted or IDs are renumbered)"""
+        self._damage_stats = None
+
+    def _calculate_avg_damage(self, character_id: int, damage_stats: Optional[Dict[str, List[float]]] = None) -> float:
+        """Calculate average damage dealt by a character from battle history
+
+        Args:
+            character_id: Character ID
+            damage_stats: Aggregates already loaded by the caller (default: _get_damage_stats())
+        """
+        try:
+            if damage_stats is None:
+                damage_stats = self._get_damage_stats()
+            total_damage, battle_count = damage_stats.get(str(character_id), (0, 0))
             return total_damage / battle_count if battle_count > 0 else 0.0
 
         except Exception as e:
@@ -1608,7 +2293,7 @@ class SheetsManager:
                 logger.warning("Rankings sheet not initialized")
                 return []
 
-            all_records = self.ranking_sheet.get_all_records()
+            all_records = self._get_records(self.ranking_sheet)
 
             if limit:
                 return all_records[:limit]
@@ -1648,6 +2333,112 @@ class SheetsManager:
             logger.error(f"Error updating character stats: {e}")
             return False
 
+    def apply_stat_increments(self, increments: Dict[str, Dict[str, int]]) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Add wins/losses/draws to several characters with one batched write
+
+        Current values come from the cached Characters snapshot when it was loaded
+        after this process's last stats write, otherwise from one read of just the
+        M:O cells of those characters' rows.
+
+        Args:
+            increments: Character ID -> {'wins': n, 'losses': n, 'draws': n}
+
+        Returns:
+            (IDs updated, IDs not found in the sheet), or None if nothing was written
+        """
+        if not self.online_mode:
+            logger.debug("Offline mode: Skipping stat increments")
+            return None
+
+        if not increments:
+            return [], []
+
+        try:
+            current, missing = self._current_battle_stats(list(increments))
+
+            data = []
+            patches = []
+            for char_id, delta in increments.items():
+                if str(char_id) not in current:
+                    continue
+
+                row_num, (wins, losses, draws) = current[str(char_id)]
+                wins += delta.get('wins', 0)
+                losses += delta.get('losses', 0)
+                draws += delta.get('draws', 0)
+
+                data.append({
+                    'range': f"'{self.worksheet.title}'!M{row_num}:O{row_num}",  # M=Wins, N=Losses, O=Draws
+                    'values': [[wins, losses, draws]]
+                })
+                patches.append((row_num - 2, {'Wins': wins, 'Losses': losses, 'Draws': draws}))
+
+            if data:
+                self.sheet.values_batch_update({'valueInputOption': 'RAW', 'data': data})
+                self._stats_written_at = time.time()
+                for idx, values in patches:
+                    self.cache.patch_row(self.worksheet, idx, values)
+                logger.info(f"✓ Updated battle stats for {len(data)} character(s) in one batch")
+
+            if missing:
+                logger.warning(f"Characters not found for stats update: {missing}")
+            return [str(char_id) for char_id in increments if str(char_id) in current], missing
+
+        except Exception as e:
+            logger.error(f"Error applying stat increments: {e}")
+            return None
+
+    def _current_battle_stats(self, character_ids: List[str]) -> Tuple[Dict[str, Tuple[int, List[int]]], List[str]]:
+        """Get the sheet row and current [wins, losses, draws] of characters
+
+        Returns:
+            (character ID -> (row number, [wins, losses, draws]), IDs not found)
+        """
+        def as_int(value) -> int:
+            try:
+                return int(value or 0)
+            except (TypeError, ValueError):
+                return 0
+
+        current = {}
+        # A snapshot read before our last stats write may predate other clients' increments too
+        records = self.cache.peek(self.worksheet, loaded_after=self._stats_written_at)
+        if records is not None:
+            row_index = {str(record.get('ID')): idx for idx, record in enumerate(records)}
+            for char_id in character_ids:
+                idx = row_index.get(str(char_id))
+                if idx is not None:
+                    record = records[idx]
+                    current[str(char_id)] = (idx + 2, [as_int(record.get(key)) for key in ('Wins', 'Losses', 'Draws')])
+        else:
+            rows = {str(char_id): self._find_character_row(char_id) for char_id in character_ids}
+            rows = {char_id: row_num for char_id, row_num in rows.items() if row_num is not None}
+            if rows:
+                values = self.worksheet.batch_get([f'M{row_num}:O{row_num}' for row_num in rows.values()])
+                for (char_id, row_num), cells in zip(rows.items(), values):
+                    row = list(cells[0]) if cells else []
+                    row += [0] * (3 - len(row))
+                    current[char_id] = (row_num, [as_int(value) for value in row[:3]])
+
+        missing = [char_id for char_id in character_ids if str(char_id) not in current]
+        return current, missing
+
+    def apply_battle_result(self, battle: Battle) -> Dict[str, bool]:
+        """
+        Add one battle's win/loss/draw to both fighters with a single batched write
+
+        Args:
+            battle: Finished battle (no winner = draw for both fighters)
+
+        Returns:
+            Character ID -> True if that fighter's stats were updated
+        """
+        increments = battle.stat_increments()
+        result = self.apply_stat_increments(increments)
+        updated = set(result[0]) if result else set()
+        return {str(char_id): str(char_id) in updated for char_id in increments}
+
     def save_battle(self, battle: Battle) -> bool:
         """
         Save battle to Google Sheets (via battle history) and update character stats
@@ -1656,7 +2447,8 @@ class SheetsManager:
             battle: Battle object to save
 
         Returns:
-            True if successful, False otherwise
+            True if the stats of at least one fighter were written (a fighter deleted
+            meanwhile is skipped, see apply_battle_result for per-fighter results)
         """
         try:
             # In online mode, battle history is recorded via record_battle_history()
@@ -1665,10 +2457,14 @@ class SheetsManager:
                 logger.debug("Offline mode: Skipping battle save")
                 return False
 
-            # Update character stats (similar to DatabaseManager)
-            if battle.character1_id and battle.character2_id:
-                self.update_character_stats(battle.character1_id, battle.winner_id == battle.character1_id)
-                self.update_character_stats(battle.character2_id, battle.winner_id == battle.character2_id)
+            # Update both fighters' stats in one write
+            results = self.apply_battle_result(battle)
+            if not any(results.values()):
+                return False
+            missing = [char_id for char_id, updated in results.items() if not updated]
+            if missing:
+                # The other fighter is already written; a deleted character can't be updated
+                logger.warning(f"Battle {battle.id}: stats not updated for missing character(s) {missing}")
 
             # Battle history is already recorded in the calling code
             logger.debug(f"Battle {battle.id} saved and character stats updated")
@@ -1696,74 +2492,122 @@ class SheetsManager:
 
             # Get battle history records
             battle_records = self.get_battle_history(limit=limit)
+            battles = self._records_to_battles(battle_records)
 
-            battles = []
-            for record in battle_records:
+            logger.info(f"Retrieved {len(battles)} battles from battle history")
+            return battles
+
+        except Exception as e:
+            logger.error(f"Error getting recent battles: {e}")
+            return []
+
+    def get_recent_battles_page(self, limit: int = 10, cursor: Optional[int] = None) -> Tuple[List[Battle], Optional[int]]:
+        """
+        Get one page of battles from battle history (see get_battle_history_page)
+
+        Args:
+            limit: Number of battles per page
+            cursor: Cursor returned with the previous page, None for the latest battles
+
+        Returns:
+            (Battle objects in sheet order, cursor for the next older page or None)
+        """
+        if not self.online_mode or not self.battle_history_sheet:
+            return [], None
+        records, next_cursor = self.get_battle_history_page(limit, cursor)
+        return self._records_to_battles(records), next_cursor
+
+    def _records_to_battles(self, battle_records: List[Dict[str, Any]]) -> List[Battle]:
+        """Convert battle history records to Battle objects"""
+        battles = []
+        for record in battle_records:
+            try:
+                # Parse date
                 try:
-                    # Parse date
-                    try:
-                        if isinstance(record.get('Date'), str):
-                            created_at = datetime.fromisoformat(record.get('Date'))
-                        else:
-                            created_at = datetime.now()
-                    except Exception:
+                    if isinstance(record.get('Date'), str):
+                        created_at = datetime.fromisoformat(record.get('Date'))
+                    else:
                         created_at = datetime.now()
+                except Exception:
+                    created_at = datetime.now()
+
+                # Construct Battle object from history record
+                # Keep IDs as strings for Battle model compatibility
+                fighter1_id = record.get('Fighter 1 ID', '')
+                fighter2_id = record.get('Fighter 2 ID', '')
+                winner_id_raw = record.get('Winner ID', '')
+
+                # Get total turns from record
+                total_turns = int(record.get('Total Turns', 0))
+
+                # Create dummy turns to preserve turn count
+                # (actual turn details are not stored in battle history)
+                from src.models.battle import BattleTurn
+                dummy_turns = []
+                for i in range(total_turns):
+                    dummy_turn = BattleTurn(
+                        turn_number=i + 1,
+                        attacker_id=str(fighter1_id) if i % 2 == 0 else str(fighter2_id),
+                        defender_id=str(fighter2_id) if i % 2 == 0 else str(fighter1_id),
+                        action_type="unknown",
+                        damage=0,
+                        attacker_hp_after=0,
+                        defender_hp_after=0
+                    )
+                    dummy_turns.append(dummy_turn)
+
+                battle = Battle(
+                    id=str(record.get('Battle ID', str(uuid.uuid4()))),
+                    character1_id=str(fighter1_id) if fighter1_id else '',
+                    character2_id=str(fighter2_id) if fighter2_id else '',
+                    winner_id=str(winner_id_raw) if winner_id_raw else None,
+                    duration=float(record.get('Duration (s)', 0)),
+                    created_at=created_at,
+                    char1_final_hp=int(record.get('F1 Final HP', 0)),
+                    char2_final_hp=int(record.get('F2 Final HP', 0)),
+                    char1_damage_dealt=int(record.get('F1 Damage Dealt', 0)),
+                    char2_damage_dealt=int(record.get('F2 Damage Dealt', 0)),
+                    result_type=str(record.get('Result Type', 'Unknown')),
+                    battle_log=[],  # Loaded on demand with get_battle_log()
+                    turns=dummy_turns  # Dummy turns to preserve turn count
+                )
+                battles.append(battle)
 
-                    # Construct Battle object from history record
-                    # Keep IDs as strings for Battle model compatibility
-                    fighter1_id = record.get('Fighter 1 ID', '')
-                    fighter2_id = record.get('Fighter 2 ID', '')
-                    winner_id_raw = record.get('Winner ID', '')
+            except Exception as parse_e:
+                logger.warning(f"Error parsing battle history record: {parse_e}")
+                continue
 
-                    # Parse battle log (split by newlines)
-                    battle_log_str = record.get('Battle Log', '')
-                    battle_log = battle_log_str.split('\n') if battle_log_str else []
+        return battles
 
-                    # Get total turns from record
-                    total_turns = int(record.get('Total Turns', 0))
-
-                    # Create dummy turns to preserve turn count
-                    # (actual turn details are not stored in battle history)
-                    from src.models.battle import BattleTurn
-                    dummy_turns = []
-                    for i in range(total_turns):
-                        dummy_turn = BattleTurn(
-                            turn_number=i + 1,
-                            attacker_id=str(fighter1_id) if i % 2 == 0 else str(fighter2_id),
-                            defender_id=str(fighter2_id) if i % 2 == 0 else str(fighter1_id),
-                            action_type="unknown",
-                            damage=0,
-                            attacker_hp_after=0,
-                            defender_hp_after=0
-                        )
-                        dummy_turns.append(dummy_turn)
-
-                    battle = Battle(
-                        id=str(record.get('Battle ID', str(uuid.uuid4()))),
-                        character1_id=str(fighter1_id) if fighter1_id else '',
-                        character2_id=str(fighter2_id) if fighter2_id else '',
-                        winner_id=str(winner_id_raw) if winner_id_raw else None,
-                        duration=float(record.get('Duration (s)', 0)),
-                        created_at=created_at,
-                        char1_final_hp=int(record.get('F1 Final HP', 0)),
-                        char2_final_hp=int(record.get('F2 Final HP', 0)),
-                        char1_damage_dealt=int(record.get('F1 Damage Dealt', 0)),
-                        char2_damage_dealt=int(record.get('F2 Damage Dealt', 0)),
-                        result_type=str(record.get('Result Type', 'Unknown')),
-                        battle_log=battle_log,  # Load from battle history
-                        turns=dummy_turns  # Dummy turns to preserve turn count
-                    )
-                    battles.append(battle)
+    def get_battle_log(self, battle_id) -> List[str]:
+        """
+        Get the battle log of a battle history entry (loaded on demand)
 
-                except Exception as parse_e:
-                    logger.warning(f"Error parsing battle history record: {parse_e}")
-                    continue
+        Args:
+            battle_id: Battle ID from the BattleHistory sheet
 
-            logger.info(f"Retrieved {len(battles)} battles from battle history")
-            return battles
+        Returns:
+            Log entries, or an empty list if no log is stored
+        """
+        try:
+            battle_log = self.battle_logs.load(battle_id)
+            if battle_log is not None:
+                return battle_log
+
+            # Battles recorded before logs moved out of the sheet keep them in column P
+            if not self.online_mode or not self.battle_history_sheet:
+                return []
+            for idx, record in enumerate(self._get_records(self.battle_history_sheet)):
+                if str(record.get('Battle ID')) == str(battle_id):
+                    values = self.battle_history_sheet.get(f'P{idx + 2}')
+                    battle_log_str = str(values[0][0]) if values and values[0] else ''
+                    battle_log = battle_log_str.split('\n') if battle_log_str else []
+                    self.battle_logs.save(battle_id, battle_log)
+                    return battle_log
+            return []
 
         except Exception as e:
-            logger.error(f"Error getting recent battles: {e}")
+            logger.error(f"Error getting battle log {battle_id}: {e}")
             return []
 
     def get_character_battle_count(self, character_id: str) -> int:
@@ -1782,7 +2626,7 @@ class SheetsManager:
                 return 0
 
             # Get all battle history records
-            battle_records = self.battle_history_sheet.get_all_records()
+            battle_records = self._get_records(self.battle_history_sheet)
 
             # Convert character_id to string for comparison
             char_id_str = str(character_id)
@@ -1819,7 +2663,7 @@ class SheetsManager:
 
             # Battle statistics from battle history
             if self.battle_history_sheet:
-                battle_records = self.battle_history_sheet.get_all_records()
+                battle_records = self._get_records(self.battle_history_sheet)
                 stats['total_battles'] = len(battle_records)
             else:
                 stats['total_battles'] = 0
@@ -1886,7 +2730,7 @@ class SheetsManager:
                 return None
 
             logger.info(f"Getting story boss Lv{level}...")
-            records = self.story_sheet.get_all_records()
+            records = self._get_records(self.story_sheet)
             logger.info(f"Found {len(records)} records in StoryBosses sheet")
             
             for record in records:
@@ -1895,14 +2739,10 @@ class SheetsManager:
                     image_url = str(record.get('Image URL', '')) if record.get('Image URL') else ''
                     sprite_url = str(record.get('Sprite URL', '')) if record.get('Sprite URL') else ''
 
-                    # Download sprite if it's a URL
+                    # Download sprite if it's a URL (once per URL, via the image cache)
                     sprite_path = sprite_url
                     if sprite_url and sprite_url.startswith('http'):
-                        local_sprite = Settings.SPRITES_DIR / f"boss_lv{level}_sprite.png"
-                        if not local_sprite.exists():
-                            self.download_from_url(sprite_url, str(local_sprite))
-                        if local_sprite.exists():
-                            sprite_path = str(local_sprite)
+                        sprite_path = self._resolve_image(sprite_url) or sprite_url
 
                     return StoryBoss(
                         level=level,
@@ -1939,7 +2779,7 @@ class SheetsManager:
                 logger.error("Story sheet is not available (offline mode or initialization failed)")
                 return False
 
-            records = self.story_sheet.get_all_records()
+            records = self._get_records(self.story_sheet)
 
             # Check if boss already exists
             for idx, record in enumerate(records):
@@ -1960,6 +2800,7 @@ class SheetsManager:
                         boss.description
                     ]]
                     self.story_sheet.update(f'A{row_num}:K{row_num}', values)
+                    self.cache.invalidate(self.story_sheet)
                     logger.info(f"Updated story boss Lv{boss.level}: HP={boss.hp}, ATK={boss.attack}, DEF={boss.defense}, SPD={boss.speed}, MAG={boss.magic}, LCK={boss.luck}")
                     return True
 
@@ -1978,6 +2819,7 @@ class SheetsManager:
                 boss.description
             ]
             self.story_sheet.append_row(row_values)
+            self.cache.invalidate(self.story_sheet)
             logger.info(f"Added new story boss Lv{boss.level}: HP={boss.hp}, ATK={boss.attack}, DEF={boss.defense}, SPD={boss.speed}, MAG={boss.magic}, LCK={boss.luck}")
             return True
 
@@ -1990,9 +2832,6 @@ class SheetsManager:
     def get_story_progress(self, character_id: str):
         """Get story mode progress for a character"""
         try:
-            from src.models.story_boss import StoryProgress
-            from datetime import datetime
-
             if not hasattr(self, 'story_progress_sheet') or self.story_progress_sheet is None:
                 self._init_story_progress_sheet()
 
@@ -2001,60 +2840,96 @@ class SheetsManager:
                 return None
 
             # Use expected_headers to handle duplicate header values
-            expected_headers = ['Character ID', 'Current Level', 'Completed', 'EndlessAccess', 'Victories', 'Attempts', 'Last Played']
-            records = self.story_progress_sheet.get_all_records(expected_headers=expected_headers)
+            records = self._get_records(self.story_progress_sheet, self.STORY_PROGRESS_HEADERS)
             for record in records:
                 if str(record.get('Character ID')) == str(character_id):
-                    # Parse victories count - reconstruct victories list based on current level and completed status
-                    victories_count = 0
-                    victories_value = record.get('Victories', 0)
-                    try:
-                        if isinstance(victories_value, str) and victories_value.upper() in ['TRUE', 'FALSE', '']:
-                            victories_count = 0
-                        else:
-                            victories_count = int(victories_value)
-                    except (ValueError, TypeError):
-                        logger.warning(f"Could not parse victories value: {victories_value}")
-                        victories_count = 0
-                    
-                    # Reconstruct victories list based on current level
-                    # If a player is at level 3, they must have defeated levels 1 and 2
-                    current_level = int(record.get('Current Level', 1))
-                    victories = list(range(1, current_level)) if current_level > 1 else []
-                    
-                    # If victories_count is higher than expected, use it to extend the list
-                    # This handles cases where player defeated higher level bosses
-                    if victories_count > len(victories):
-                        # Assume they defeated up to victories_count levels
-                        victories = list(range(1, victories_count + 1))
-
-                    # Parse attempts field safely
-                    attempts = 0
-                    attempts_value = record.get('Attempts', 0)
-                    try:
-                        if isinstance(attempts_value, str) and attempts_value.upper() in ['TRUE', 'FALSE', '']:
-                            attempts = 0
-                        else:
-                            attempts = int(attempts_value)
-                    except (ValueError, TypeError):
-                        logger.warning(f"Could not parse attempts value: {attempts_value}")
-                        attempts = 0
-
-                    return StoryProgress(
-                        character_id=str(character_id),
-                        current_level=current_level,
-                        completed=record.get('Completed', 'FALSE') == 'TRUE',
-                        endless_access=record.get('EndlessAccess', 'FALSE') == 'TRUE',
-                        victories=victories,
-                        attempts=attempts,
-                        last_played=datetime.fromisoformat(record.get('Last Played', datetime.now().isoformat()))
-                    )
+                    return self._record_to_story_progress(record)
             return None
 
         except Exception as e:
             logger.error(f"Error getting story progress: {e}")
             return None
 
+    def get_all_story_progress(self) -> Optional[Dict[str, Any]]:
+        """Get story mode progress for all characters with a single sheet read
+
+        Returns:
+            Dict of character ID (str) -> StoryProgress, or None if the sheet is unavailable
+        """
+        try:
+            if not hasattr(self, 'story_progress_sheet') or self.story_progress_sheet is None:
+                self._init_story_progress_sheet()
+
+            if not self.story_progress_sheet:
+                logger.warning("Story progress sheet is not available (offline mode or initialization failed)")
+                return None
+
+            progress_map = {}
+            for record in self._get_records(self.story_progress_sheet, self.STORY_PROGRESS_HEADERS):
+                character_id = str(record.get('Character ID', ''))
+                if not character_id:
+                    continue
+                try:
+                    progress_map[character_id] = self._record_to_story_progress(record)
+                except Exception as record_error:
+                    logger.warning(f"Skipping invalid story progress for character {character_id}: {record_error}")
+
+            logger.debug(f"Loaded story progress for {len(progress_map)} character(s)")
+            return progress_map
+
+        except Exception as e:
+            logger.error(f"Error getting all story progress: {e}")
+            return None
+
+    def _record_to_story_progress(self, record: Dict[str, Any]):
+        """Convert a StoryProgress sheet record to a StoryProgress object"""
+        from src.models.story_boss import StoryProgress
+
+        # Parse victories count - reconstruct victories list based on current level and completed status
+        victories_count = 0
+        victories_value = record.get('Victories', 0)
+        try:
+            if isinstance(victories_value, str) and victories_value.upper() in ['TRUE', 'FALSE', '']:
+                victories_count = 0
+            else:
+                victories_count = int(victories_value)
+        except (ValueError, TypeError):
+            logger.warning(f"Could not parse victories value: {victories_value}")
+            victories_count = 0
+
+        # Reconstruct victories list based on current level
+        # If a player is at level 3, they must have defeated levels 1 and 2
+        current_level = int(record.get('Current Level', 1))
+        victories = list(range(1, current_level)) if current_level > 1 else []
+
+        # If victories_count is higher than expected, use it to extend the list
+        # This handles cases where player defeated higher level bosses
+        if victories_count > len(victories):
+            # Assume they defeated up to victories_count levels
+            victories = list(range(1, victories_count + 1))
+
+        # Parse attempts field safely
+        attempts = 0
+        attempts_value = record.get('Attempts', 0)
+        try:
+            if isinstance(attempts_value, str) and attempts_value.upper() in ['TRUE', 'FALSE', '']:
+                attempts = 0
+            else:
+                attempts = int(attempts_value)
+        except (ValueError, TypeError):
+            logger.warning(f"Could not parse attempts value: {attempts_value}")
+            attempts = 0
+
+        return StoryProgress(
+            character_id=str(record.get('Character ID')),
+            current_level=current_level,
+            completed=record.get('Completed', 'FALSE') == 'TRUE',
+            endless_access=record.get('EndlessAccess', 'FALSE') == 'TRUE',
+            victories=victories,
+            attempts=attempts,
+            last_played=datetime.fromisoformat(record.get('Last Played', datetime.now().isoformat()))
+        )
+
     def save_story_progress(self, progress) -> bool:
         """Save story mode progress"""
         try:
@@ -2074,8 +2949,7 @@ class SheetsManager:
                 self.story_progress_headers_verified = True
 
             # Use expected_headers to handle duplicate header values
-            expected_headers = ['Character ID', 'Current Level', 'Completed', 'EndlessAccess', 'Victories', 'Attempts', 'Last Played']
-            records = self.story_progress_sheet.get_all_records(expected_headers=expected_headers)
+            records = self._get_records(self.story_progress_sheet, self.STORY_PROGRESS_HEADERS)
             
             # Calculate victories count (simple number, not a list)
             victories_count = len(progress.victories)
@@ -2095,6 +2969,7 @@ class SheetsManager:
                         datetime.now().isoformat()
                     ]]
                     self.story_progress_sheet.update(f'A{row_num}:G{row_num}', values)
+                    self.cache.invalidate(self.story_progress_sheet)
                     logger.info(f"Updated story progress for character {progress.character_id} (Victories: {victories_count}, Current Level: {progress.current_level})")
                     return True
 
@@ -2109,6 +2984,7 @@ class SheetsManager:
                 datetime.now().isoformat()
             ]]
             self.story_progress_sheet.append_row(values[0])
+            self.cache.invalidate(self.story_progress_sheet)
             logger.info(f"Added new story progress for character {progress.character_id} (Victories: {victories_count}, Current Level: {progress.current_level})")
             return True
 
@@ -2133,8 +3009,7 @@ class SheetsManager:
             except:
                 # Create the sheet if it doesn't exist
                 self.story_sheet = self.sheet.add_worksheet(title="StoryBosses", rows=100, cols=11)
-                headers = ['Level', 'Name', 'Image URL', 'Sprite URL', 'HP', 'Attack', 'Defense', 'Speed', 'Magic', 'Luck', 'Description']
-                self.story_sheet.update('A1:K1', [headers])
+                self.story_sheet.update('A1:K1', [self.STORY_BOSS_HEADERS])
                 logger.info("Created StoryBosses sheet")
 
         except Exception as e:
@@ -2147,7 +3022,7 @@ class SheetsManager:
             if not self.story_sheet:
                 return
             
-            expected_headers = ['Level', 'Name', 'Image URL', 'Sprite URL', 'HP', 'Attack', 'Defense', 'Speed', 'Magic', 'Luck', 'Description']
+            expected_headers = self.STORY_BOSS_HEADERS
             current_headers = self.story_sheet.row_values(1)
             
             # Check if headers are correct
@@ -2155,6 +3030,7 @@ class SheetsManager:
                 logger.warning(f"StoryBosses headers incorrect. Current: {current_headers}")
                 logger.info(f"Fixing StoryBosses headers to: {expected_headers}")
                 self.story_sheet.update('A1:K1', [expected_headers])
+                self.cache.invalidate(self.story_sheet)
                 logger.info("StoryBosses headers updated successfully")
             else:
                 logger.info("StoryBosses headers are correct")
@@ -2186,8 +3062,7 @@ class SheetsManager:
             except:
                 # Create the sheet if it doesn't exist
                 self.story_progress_sheet = self.sheet.add_worksheet(title="StoryProgress", rows=1000, cols=7)
-                headers = ['Character ID', 'Current Level', 'Completed', 'EndlessAccess', 'Victories', 'Attempts', 'Last Played']
-                self.story_progress_sheet.update('A1:G1', [headers])
+                self.story_progress_sheet.update('A1:G1', [self.STORY_PROGRESS_HEADERS])
                 self.story_progress_headers_verified = True
                 logger.info("Created StoryProgress sheet")
 
@@ -2201,7 +3076,7 @@ class SheetsManager:
             if not self.story_progress_sheet:
                 return
 
-            expected_headers = ['Character ID', 'Current Level', 'Completed', 'EndlessAccess', 'Victories', 'Attempts', 'Last Played']
+            expected_headers = self.STORY_PROGRESS_HEADERS
             current_headers = self.story_progress_sheet.row_values(1)
 
             # Check if headers need updating
@@ -2240,6 +3115,7 @@ class SheetsManager:
                     clear_range = f'H1:{chr(65 + len(current_headers) - 1)}1'
                     self.story_progress_sheet.batch_clear([clear_range])
                 
+                self.cache.invalidate(self.story_progress_sheet)
                 logger.info("StoryProgress headers updated successfully")
 
         except Exception as e:
@@ -2263,84 +3139,111 @@ class SheetsManager:
             # Check current header to determine format
             current_headers = all_values[0] if len(all_values) > 0 else []
             logger.info(f"Current headers: {current_headers}")
+
+            # Update all rows in one request
+            updates = [{'range': f'A{row_num}:G{row_num}', 'values': [new_row]}
+                       for row_num, new_row in self._story_progress_migration_rows(all_values)]
+            if updates:
+                self.story_progress_sheet.batch_update(updates)
             
-            # Process each row (skip header at index 0)
-            for row_idx in range(1, len(all_values)):
-                row = all_values[row_idx]
-                
-                if len(row) < 2:  # Need at least Character ID and Level
-                    continue  # Skip incomplete rows
-                
-                # Parse based on current format
-                character_id = row[0] if len(row) > 0 else ''
-                
-                if not character_id or character_id.strip() == '':
-                    continue  # Skip empty rows
-                
-                current_level = row[1] if len(row) > 1 else '1'
-                completed = row[2] if len(row) > 2 else 'FALSE'
-                endless_access = row[3] if len(row) > 3 else 'FALSE'
-                
-                # Calculate proper victories count based on current level
-                # If at level 3, must have defeated levels 1 and 2, so victories = 2
-                try:
-                    level = int(current_level) if current_level else 1
-                    victories_count = max(0, level - 1)  # Level 1 = 0 victories, Level 2 = 1 victory, etc.
-                except:
-                    victories_count = 0
-                
-                # Determine format and extract attempts and last_played
-                attempts = '0'
-                last_played = datetime.now().isoformat()
-                
-                if len(row) >= 8:
-                    # 8-column format: [ID, Level, Completed, EndlessAccess, Victories(count), Defeated Bosses, Attempts, Last Played]
-                    attempts = row[6] if len(row) > 6 and row[6] else '0'
-                    last_played = row[7] if len(row) > 7 and row[7] else datetime.now().isoformat()
-                elif len(row) >= 7:
-                    # 7-column format: [ID, Level, Completed, EndlessAccess, Victories(count), Attempts, Last Played]
-                    attempts = row[5] if len(row) > 5 and row[5] else '0'
-                    last_played = row[6] if len(row) > 6 and row[6] else datetime.now().isoformat()
-                elif len(row) >= 6:
-                    # Partial data
-                    attempts = row[5] if len(row) > 5 and row[5] else '0'
-                    last_played = datetime.now().isoformat()
-                
-                # Ensure attempts is a valid number
-                try:
-                    int(attempts)
-                except:
-                    attempts = '0'
-                
-                # Ensure last_played is valid ISO format
-                if not last_played or last_played == '':
-                    last_played = datetime.now().isoformat()
-                
-                # Update row with new simplified format
-                new_row = [
-                    character_id,
-                    current_level,
-                    completed,
-                    endless_access,
-                    victories_count,  # Calculated from current_level
-                    attempts,
-                    last_played
-                ]
-                
-                # Update the row
-                row_num = row_idx + 1  # +1 because sheets are 1-indexed
-                self.story_progress_sheet.update(f'A{row_num}:G{row_num}', [new_row])
-                logger.info(f"Migrated row {row_num}: ID={character_id}, Level={current_level}, Victories={victories_count}, Attempts={attempts}")
-            
-            logger.info(f"Successfully migrated {len(all_values) - 1} rows to simplified format")
+            self.cache.invalidate(self.story_progress_sheet)
+            logger.info(f"Successfully migrated {len(updates)} rows to simplified format")
             
         except Exception as e:
             logger.error(f"Error migrating story progress data: {e}")
             import traceback
             logger.error(traceback.format_exc())
+
+    @staticmethod
+    def _story_progress_migration_rows(all_values: List[List[str]]) -> List[Tuple[int, list]]:
+        """Convert StoryProgress rows (8-column or partial format) to the 7-column format
+
+        Args:
+            all_values: Sheet values including the header row
+
+        Returns:
+            (sheet row number, new row) for each row to rewrite
+        """
+        migrated = []
+
+        # Process each row (skip header at index 0)
+        for row_idx in range(1, len(all_values)):
+            row = all_values[row_idx]
+
+            if len(row) < 2:  # Need at least Character ID and Level
+                continue  # Skip incomplete rows
+
+            # Parse based on current format
+            character_id = row[0] if len(row) > 0 else ''
+
+            if not character_id or character_id.strip() == '':
+                continue  # Skip empty rows
+
+            current_level = row[1] if len(row) > 1 else '1'
+            completed = row[2] if len(row) > 2 else 'FALSE'
+            endless_access = row[3] if len(row) > 3 else 'FALSE'
+
+            # Calculate proper victories count based on current level
+            # If at level 3, must have defeated levels 1 and 2, so victories = 2
+            try:
+                level = int(current_level) if current_level else 1
+                victories_count = max(0, level - 1)  # Level 1 = 0 victories, Level 2 = 1 victory, etc.
+            except:
+                victories_count = 0
+
+            # Determine format and extract attempts and last_played
+            attempts = '0'
+            last_played = datetime.now().isoformat()
+
+            if len(row) >= 8:
+                # 8-column format: [ID, Level, Completed, EndlessAccess, Victories(count), Defeated Bosses, Attempts, Last Played]
+                attempts = row[6] if len(row) > 6 and row[6] else '0'
+                last_played = row[7] if len(row) > 7 and row[7] else datetime.now().isoformat()
+            elif len(row) >= 7:
+                # 7-column format: [ID, Level, Completed, EndlessAccess, Victories(count), Attempts, Last Played]
+                attempts = row[5] if len(row) > 5 and row[5] else '0'
+                last_played = row[6] if len(row) > 6 and row[6] else datetime.now().isoformat()
+            elif len(row) >= 6:
+                # Partial data
+                attempts = row[5] if len(row) > 5 and row[5] else '0'
+                last_played = datetime.now().isoformat()
+
+            # Ensure attempts is a valid number
+            try:
+                int(attempts)
+            except:
+                attempts = '0'
+
+            # Ensure last_played is valid ISO format
+            if not last_played or last_played == '':
+                last_played = datetime.now().isoformat()
+
+            # Update row with new simplified format
+            new_row = [
+                character_id,
+                current_level,
+                completed,
+                endless_access,
+                victories_count,  # Calculated from current_level
+                attempts,
+                last_played
+            ]
+
+            # Queue the row update
+            row_num = row_idx + 1  # +1 because sheets are 1-indexed
+            migrated.append((row_num, new_row))
+            logger.info(f"Migrated row {row_num}: ID={character_id}, Level={current_level}, Victories={victories_count}, Attempts={attempts}")
+
+        return migrated
     
-    def _cleanup_orphaned_story_progress(self):
-        """Remove story progress records for characters that no longer exist"""
+    def _cleanup_orphaned_story_progress(self, all_values: Optional[List[List[str]]] = None,
+                                         existing_char_ids: Optional[set] = None):
+        """Remove story progress records for characters that no longer exist
+
+        Args:
+            all_values: StoryProgress values including the header row (read from the sheet if None)
+            existing_char_ids: IDs of existing characters (read from the sheet if None)
+        """
         try:
             if not self.story_progress_sheet:
                 return
@@ -2348,12 +3251,14 @@ class SheetsManager:
             logger.info("Cleaning up orphaned story progress records...")
             
             # Get all existing character IDs
-            all_characters = self.get_all_characters()
-            existing_char_ids = {str(char.id) for char in all_characters}
+            if existing_char_ids is None:
+                all_characters = self.get_all_characters()
+                existing_char_ids = {str(char.id) for char in all_characters}
             logger.info(f"Found {len(existing_char_ids)} existing characters")
             
             # Get all story progress records
-            all_values = self.story_progress_sheet.get_all_values()
+            if all_values is None:
+                all_values = self.story_progress_sheet.get_all_values()
             
             if len(all_values) <= 1:
                 logger.info("No story progress data to clean up")
@@ -2393,6 +3298,7 @@ class SheetsManager:
                     except Exception as e:
                         logger.warning(f"Failed to delete row {row_num}: {e}")
                 
+                self.cache.invalidate(self.story_progress_sheet)
                 logger.info(f"Successfully cleaned up {len(rows_to_delete)} orphaned story progress record(s)")
             else:
                 logger.info("No orphaned story progress records found")
@@ -2402,244 +3308,144 @@ class SheetsManager:
             import traceback
             logger.error(traceback.format_exc())
 
+    @staticmethod
+    def _id_column_fingerprint(ids: List[str]) -> tuple:
+        """Row count plus a hash of the ID column"""
+        return len(ids), hashlib.sha1('\n'.join(ids).encode('utf-8')).hexdigest()
+
     def _fix_id_integrity(self):
         """Fix character ID integrity issues (duplicates, gaps, wrong order)
         Also updates references in BattleHistory, Rankings, and StoryProgress sheets
+
+        Only column A is read. The check is skipped when its fingerprint is unchanged,
+        rows already verified as 1..n are not re-checked, and repairs write only the
+        cells whose ID changed.
         """
         try:
             if not self.online_mode:
                 return
 
-            logger.info("Checking character ID integrity...")
-            all_records = self.worksheet.get_all_records()
-
-            if not all_records:
+            ids = [str(value) for value in self.worksheet.col_values(1)[1:]]  # Without header
+            if self._id_column_fingerprint(ids) == self._id_fingerprint:
+                logger.debug("Character IDs unchanged since last check")
                 return
 
-            # Check for duplicate IDs
-            ids = [record.get('ID') for record in all_records]
-            id_counts = {}
-            for id_val in ids:
-                id_counts[id_val] = id_counts.get(id_val, 0) + 1
-
-            duplicates = [id_val for id_val, count in id_counts.items() if count > 1]
-
-            if duplicates:
-                logger.warning(f"Found duplicate IDs: {duplicates}")
+            logger.info("Checking character ID integrity...")
 
-            # Check for gaps or incorrect sequence
-            expected_id = 1
-            needs_fixing = False
+            # Rows verified earlier only need re-checking if they changed
+            verified = self._verified_id_count
+            if ids[:verified] != [str(i) for i in range(1, verified + 1)]:
+                verified = 0
 
-            for record in all_records:
-                current_id = record.get('ID')
-                if current_id != expected_id:
-                    needs_fixing = True
-                    break
-                expected_id += 1
+            first_bad = next((idx for idx in range(verified, len(ids)) if ids[idx] != str(idx + 1)), None)
 
-            # Fix if needed
-            if duplicates or needs_fixing:
-                logger.info("Fixing character IDs...")
+            if first_bad is not None:
+                duplicates = sorted({i for i in ids if ids.count(i) > 1})
+                if duplicates:
+                    logger.warning(f"Found duplicate IDs: {duplicates}")
+                logger.info(f"Fixing character IDs from row {first_bad + 2}...")
 
-                # Create ID mapping (old_id -> new_id)
+                # Create ID mapping (old_id -> new_id) and cell updates for the rows that change
                 id_mapping = {}
-                for idx, record in enumerate(all_records):
-                    old_id = record.get('ID')
-                    new_id = idx + 1
-                    if old_id != new_id:
-                        id_mapping[old_id] = new_id
-
-                # Get all data (including header)
-                all_values = self.worksheet.get_all_values()
-
-                if len(all_values) <= 1:  # Only header or empty
-                    return
-
-                # Update IDs in Characters sheet (column A, starting from row 2)
                 updates = []
-                for idx in range(1, len(all_values)):  # Skip header
-                    new_id = idx
-                    updates.append([new_id])
+                for idx in range(first_bad, len(ids)):
+                    new_id = idx + 1
+                    if ids[idx] != str(new_id):
+                        try:
+                            id_mapping[int(ids[idx])] = new_id
+                        except ValueError:
+                            pass
+                        updates.append({'range': f'A{idx + 2}', 'values': [[new_id]]})
 
-                # Batch update all IDs at once
-                if updates:
-                    cell_range = f"A2:A{len(all_values)}"
-                    self.worksheet.update(cell_range, updates)
-                    logger.info(f"✓ Fixed {len(updates)} character IDs in Characters sheet (1 to {len(updates)})")
+                self.worksheet.batch_update(updates)
+                self.cache.invalidate(self.worksheet)
+                self.row_index.invalidate()
+                self.character_ids.reset()
+                logger.info(f"✓ Fixed {len(updates)} character ID(s) in Characters sheet")
 
-                # Update BattleHistory sheet
                 if id_mapping:
                     self._update_battle_history_ids(id_mapping)
-
-                # Update Rankings sheet
-                if id_mapping:
+                    self._invalidate_damage_stats()
                     self._update_rankings_ids(id_mapping)
-
-                # Update StoryProgress sheet
-                if id_mapping:
                     self._update_story_progress_ids(id_mapping)
 
+                ids = [str(i) for i in range(1, len(ids) + 1)]
             else:
                 logger.info("Character IDs are correct")
 
+            self._verified_id_count = len(ids)
+            self._id_fingerprint = self._id_column_fingerprint(ids)
+
         except Exception as e:
             logger.error(f"Error fixing ID integrity: {e}")
             import traceback
             logger.error(traceback.format_exc())
 
-    def _update_battle_history_ids(self, id_mapping: dict):
-        """Update character IDs in BattleHistory sheet (optimized with batch update)"""
-        try:
-            if not hasattr(self, 'battle_history_sheet') or self.battle_history_sheet is None:
-                return
-
-            logger.info("Updating BattleHistory sheet IDs...")
-            all_values = self.battle_history_sheet.get_all_values()
-
-            if len(all_values) <= 1:  # Only header or empty
-                return
-
-            # Columns: Battle ID, Date, Fighter 1 ID, Fighter 1 Name, Fighter 2 ID, ...
-            # Fighter 1 ID is column C (index 2), Fighter 2 ID is column E (index 4)
-            # Winner ID is column F (index 5)
+    def _remap_id_columns(self, worksheet, columns: List[str], id_mapping: dict) -> int:
+        """Rewrite the character ID cells of the given columns that appear in id_mapping
 
-            # Collect all updates for batch processing
-            updated_rows = []
+        Reads only those columns (one batch read) and writes only the changed cells.
 
-            for row_idx in range(1, len(all_values)):  # Skip header
-                row = list(all_values[row_idx])  # Convert to list for modification
-                if len(row) < 6:
+        Returns:
+            Number of cells updated
+        """
+        column_values = worksheet.batch_get([f'{column}2:{column}' for column in columns])
+        updates = []
+        for column, values in zip(columns, column_values):
+            for offset, row in enumerate(values):
+                if not row or row[0] in ('', None):
+                    continue
+                try:
+                    old_id = int(row[0])
+                except (ValueError, TypeError):
                     continue
+                if old_id in id_mapping:
+                    updates.append({'range': f'{column}{offset + 2}', 'values': [[id_mapping[old_id]]]})
 
-                row_updated = False
+        if updates:
+            worksheet.batch_update(updates, value_input_option='USER_ENTERED')
+            self.cache.invalidate(worksheet)
+        return len(updates)
 
-                # Update Fighter 1 ID (column C, index 2)
-                if len(row) > 2 and row[2]:
-                    try:
-                        old_id = int(row[2])
-                        if old_id in id_mapping:
-                            row[2] = id_mapping[old_id]
-                            row_updated = True
-                    except (ValueError, TypeError):
-                        pass
-
-                # Update Fighter 2 ID (column E, index 4)
-                if len(row) > 4 and row[4]:
-                    try:
-                        old_id = int(row[4])
-                        if old_id in id_mapping:
-                            row[4] = id_mapping[old_id]
-                            row_updated = True
-                    except (ValueError, TypeError):
-                        pass
-
-                # Update Winner ID (column F, index 5)
-                if len(row) > 5 and row[5]:
-                    try:
-                        old_id = int(row[5])
-                        if old_id in id_mapping:
-                            row[5] = id_mapping[old_id]
-                            row_updated = True
-                    except (ValueError, TypeError):
-                        pass
-
-                if row_updated:
-                    updated_rows.append(row)
-                else:
-                    updated_rows.append(list(all_values[row_idx]))  # Keep original
+    def _update_battle_history_ids(self, id_mapping: dict):
+        """Update character IDs in BattleHistory sheet (only the changed ID cells)"""
+        try:
+            if not hasattr(self, 'battle_history_sheet') or self.battle_history_sheet is None:
+                return
 
-            # Batch update all rows at once (1 API call instead of N)
-            if any(updated_rows[i] != list(all_values[i + 1]) for i in range(len(updated_rows))):
-                cell_range = f'A2:P{len(updated_rows) + 1}'  # P covers all 15 columns
-                self.battle_history_sheet.update(cell_range, updated_rows, value_input_option='USER_ENTERED')
-                logger.info(f"✓ Updated BattleHistory sheet IDs (batch update: {len(updated_rows)} rows)")
+            # Fighter 1 ID (C), Fighter 2 ID (E), Winner ID (G)
+            updated = self._remap_id_columns(self.battle_history_sheet, ['C', 'E', 'G'], id_mapping)
+            if updated:
+                logger.info(f"✓ Updated {updated} BattleHistory ID cell(s)")
 
         except Exception as e:
             logger.error(f"Error updating BattleHistory IDs: {e}")
 
     def _update_rankings_ids(self, id_mapping: dict):
-        """Update character IDs in Rankings sheet (optimized with batch update)"""
+        """Update character IDs in Rankings sheet (only the changed ID cells)"""
         try:
             if not hasattr(self, 'ranking_sheet') or self.ranking_sheet is None:
                 return
 
-            logger.info("Updating Rankings sheet IDs...")
-            all_values = self.ranking_sheet.get_all_values()
-
-            if len(all_values) <= 1:  # Only header or empty
-                return
-
-            # Columns: Rank, Character ID, Character Name, ...
-            # Character ID is column B (index 1)
-
-            # Collect all updates for batch processing
-            updated_rows = []
-
-            for row_idx in range(1, len(all_values)):  # Skip header
-                row = list(all_values[row_idx])  # Convert to list for modification
-                if len(row) < 2:
-                    continue
-
-                # Update Character ID (column B, index 1)
-                if row[1]:
-                    try:
-                        old_id = int(row[1])
-                        if old_id in id_mapping:
-                            row[1] = id_mapping[old_id]
-                    except (ValueError, TypeError):
-                        pass
-
-                updated_rows.append(row)
-
-            # Batch update all rows at once (1 API call instead of N)
-            if any(updated_rows[i] != list(all_values[i + 1]) for i in range(len(updated_rows))):
-                cell_range = f'A2:J{len(updated_rows) + 1}'  # J covers all 10 columns
-                self.ranking_sheet.update(cell_range, updated_rows, value_input_option='USER_ENTERED')
-                logger.info(f"✓ Updated Rankings sheet IDs (batch update: {len(updated_rows)} rows)")
+            # Character ID (B)
+            updated = self._remap_id_columns(self.ranking_sheet, ['B'], id_mapping)
+            self.rankings.sheet_rows = None
+            if updated:
+                logger.info(f"✓ Updated {updated} Rankings ID cell(s)")
 
         except Exception as e:
             logger.error(f"Error updating Rankings IDs: {e}")
 
     def _update_story_progress_ids(self, id_mapping: dict):
-        """Update character IDs in StoryProgress sheet (optimized with batch update)"""
+        """Update character IDs in StoryProgress sheet (only the changed ID cells)"""
         try:
             if not hasattr(self, 'story_progress_sheet') or self.story_progress_sheet is None:
                 return
 
-            logger.info("Updating StoryProgress sheet IDs...")
-            all_values = self.story_progress_sheet.get_all_values()
-
-            if len(all_values) <= 1:  # Only header or empty
-                return
-
-            # Columns: Character ID, Current Level, ...
-            # Character ID is column A (index 0)
-
-            # Collect all updates for batch processing
-            updated_rows = []
-
-            for row_idx in range(1, len(all_values)):  # Skip header
-                row = list(all_values[row_idx])  # Convert to list for modification
-                if len(row) < 1:
-                    continue
-
-                # Update Character ID (column A, index 0)
-                if row[0]:
-                    try:
-                        old_id = int(row[0])
-                        if old_id in id_mapping:
-                            row[0] = id_mapping[old_id]
-                    except (ValueError, TypeError):
-                        pass
-
-                updated_rows.append(row)
-
-            # Batch update all rows at once (1 API call instead of N)
-            if any(updated_rows[i] != list(all_values[i + 1]) for i in range(len(updated_rows))):
-                cell_range = f'A2:F{len(updated_rows) + 1}'  # F covers all 6 columns
-                self.story_progress_sheet.update(cell_range, updated_rows, value_input_option='USER_ENTERED')
-                logger.info(f"✓ Updated StoryProgress sheet IDs (batch update: {len(updated_rows)} rows)")
+            # Character ID (A)
+            updated = self._remap_id_columns(self.story_progress_sheet, ['A'], id_mapping)
+            if updated:
+                logger.info(f"✓ Updated {updated} StoryProgress ID cell(s)")
 
         except Exception as e:
             logger.error(f"Error updating StoryProgress IDs: {e}")
\ No newline at end of file
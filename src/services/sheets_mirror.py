@@ -0,0 +1,732 @@
+"""
+Offline-first local mirror of the Google Sheets backend
+Every mirrored worksheet is kept as a grid of cell values in SQLite (and in
+memory), so reads never touch the network. Writes are applied to the local grid
+and recorded in a change log; a background thread pushes the log to Sheets in
+order and pulls remote changes (new rows by comparing column A, changed rows by
+a periodic full diff). Losing the connection only delays the push, and a
+mirror saved by an earlier run can be opened without any connection (the sync
+thread connects once Sheets is reachable); changes Sheets rejects are kept in
+a dead-letter table until the user discards them
+
+Each logged write remembers the column A values (IDs) of the rows it touched,
+so on push it is replayed at the rows that hold those IDs on the remote sheet
+now. Rows that moved apart or disappeared, and appends whose ID another client
+took meanwhile, are conflicts and become dead letters instead of overwriting
+someone else's row
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from gspread.exceptions import WorksheetNotFound
+from gspread.utils import rowcol_to_a1
+
+from config.settings import Settings
+from src.services.sheets_backend import (GRID_WRITE_METHODS, GridReads, apply_write, cell_value, grid_bounds,
+                                         range_and_values, split_range, trim_grid, trim_row)
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayConflict(Exception):
+    """A logged change no longer matches the rows it was made for on the remote sheet"""
+
+
+def _shift_rows(range_name: str, offset: int) -> str:
+    """Move the row numbers of an A1 range ("'Title'!A2:C3", "A2:J", "1:1") by offset"""
+    if not offset:
+        return range_name
+    a1 = split_range(range_name)[1]
+    shifted = re.sub(r'([A-Za-z]*)(\d+)', lambda m: f"{m.group(1)}{int(m.group(2)) + offset}", a1)
+    return range_name[:len(range_name) - len(a1)] + shifted
+
+
+def _row_blocks(grid_rows: int, method: str, args: tuple, kwargs: dict) -> Optional[List[Tuple[int, int]]]:
+    """0-based (first row, row count) of each range a write touches, None for appends and clear()"""
+    if method == 'update':
+        range_name, values = range_and_values(args, kwargs)
+        return [(grid_bounds(split_range(range_name)[1])[0], len(values))]
+    if method == 'batch_update':
+        data = args[0] if args else kwargs.get('data', [])
+        return [(grid_bounds(split_range(item['range'])[1])[0], len(item['values'])) for item in data]
+    if method == 'update_cell':
+        return [((args[0] if args else kwargs['row']) - 1, 1)]
+    if method == 'batch_clear':
+        blocks = []
+        for range_name in (args[0] if args else kwargs['ranges']):
+            start_row, end_row, _, _ = grid_bounds(split_range(range_name)[1])
+            blocks.append((start_row, max(0, min(end_row or grid_rows, grid_rows) - start_row)))
+        return blocks
+    if method == 'delete_rows':
+        start = args[0] if args else kwargs['start_index']
+        end = args[1] if len(args) > 1 else kwargs.get('end_index') or start
+        return [(start - 1, end - start + 1)]
+    return None
+
+
+def _appended_rows(method: str, args: tuple, kwargs: dict) -> List[List[Any]]:
+    if method == 'append_row':
+        return [args[0] if args else kwargs['values']]
+    if method == 'append_rows':
+        return list(args[0] if args else kwargs['values'])
+    return []
+
+class SheetsMirror:
+    """SQLite copy of a set of worksheets with a change log and a sync thread"""
+
+    def __init__(self, db_path: Optional[Path] = None, sync_interval: Optional[float] = None,
+                 full_sync_interval: Optional[float] = None):
+        """
+        Args:
+            db_path: SQLite file holding the mirrored grids and the change log
+            sync_interval: Seconds between push/pull cycles
+            full_sync_interval: Seconds between full diffs that catch in-place edits made elsewhere
+        """
+        self.db_path = Path(db_path) if db_path else Settings.SHEETS_MIRROR_PATH
+        self.sync_interval = sync_interval if sync_interval is not None else Settings.SHEETS_SYNC_INTERVAL
+        self.full_sync_interval = (full_sync_interval if full_sync_interval is not None
+                                   else Settings.SHEETS_FULL_SYNC_INTERVAL)
+
+        self._lock = threading.RLock()
+        self._grids: Dict[str, List[List[str]]] = {}
+        self._remote: Dict[str, Any] = {}  # Title -> real (quota-aware) worksheet
+        self._titles: set = set()  # Mirrored sheet titles (attached, or opened from the saved mirror)
+        self._spreadsheet = None
+        self._connector: Optional[Callable[[], Tuple[Any, List[Any]]]] = None
+        self._listeners: List[Callable[[str], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_full_sync = 0.0
+        self._poisoned: Dict[str, set] = {}  # Title -> IDs of appended rows that never reached the sheet
+
+        self.pushed = 0
+        self.push_failures = 0
+        self.dead_lettered = 0
+        self.pulls = 0
+        self.rows_pulled = 0
+        self.online = True
+        self.last_sync_at: Optional[float] = None
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS mirror_rows (
+                sheet TEXT NOT NULL,
+                row_index INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (sheet, row_index)
+            );
+            CREATE TABLE IF NOT EXISTS mirror_sheets (
+                sheet TEXT PRIMARY KEY,
+                synced_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS change_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sheet TEXT NOT NULL,
+                method TEXT NOT NULL,
+                args TEXT NOT NULL,
+                kwargs TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                row_keys TEXT
+            );
+            CREATE TABLE IF NOT EXISTS dead_letter (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sheet TEXT NOT NULL,
+                method TEXT NOT NULL,
+                args TEXT NOT NULL,
+                kwargs TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                failed_at REAL NOT NULL,
+                reason TEXT NOT NULL,
+                row_keys TEXT
+            );
+        """)
+        for table in ('change_log', 'dead_letter'):
+            columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+            if 'row_keys' not in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN row_keys TEXT")
+        self._conn.commit()
+        self._load_grids()
+
+    def attach(self, spreadsheet, worksheets: List[Any]):
+        """
+        Mirror the given worksheets; sheets never synced before are loaded now (one batch read)
+
+        Args:
+            spreadsheet: Spreadsheet the worksheets belong to (used for batched reads)
+            worksheets: Worksheets to mirror
+        """
+        self._spreadsheet = spreadsheet
+        missing = []
+        with self._lock:
+            for worksheet in worksheets:
+                if worksheet is None:
+                    continue
+                self._remote[worksheet.title] = worksheet
+                self._titles.add(worksheet.title)
+                if worksheet.title not in self._grids:
+                    missing.append(worksheet.title)
+        if missing:
+            self._pull_full(missing)
+
+    def open_saved(self, titles: List[str]) -> bool:
+        """Serve the given sheets from the grids saved by an earlier run, without a connection
+
+        Returns:
+            True if all sheets were saved (they are mirrored now), False otherwise
+        """
+        with self._lock:
+            if not all(title in self._grids for title in titles):
+                return False
+            self._titles.update(titles)
+        return True
+
+    def set_connector(self, connector: Callable[[], Tuple[Any, List[Any]]]):
+        """Register a callback returning (spreadsheet, worksheets); the sync thread calls it
+        until it succeeds and then attaches the result (used after an offline start)"""
+        self._connector = connector
+
+    @property
+    def connected(self) -> bool:
+        return self._spreadsheet is not None
+
+    def is_mirrored(self, title: str) -> bool:
+        with self._lock:
+            return title in self._titles
+
+    def titles(self) -> List[str]:
+        with self._lock:
+            return sorted(self._titles)
+
+    def wrap_worksheet(self, worksheet):
+        """Wrap a worksheet so reads and writes go through the mirror"""
+        if worksheet is None or isinstance(worksheet, MirroredWorksheet):
+            return worksheet
+        return MirroredWorksheet(self, worksheet) if self.is_mirrored(worksheet.title) else worksheet
+
+    def wrap_spreadsheet(self, spreadsheet):
+        """Wrap a spreadsheet so worksheets it returns and values_batch_update go through the mirror"""
+        return MirroredSpreadsheet(self, spreadsheet)
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """Register a callback(title) called after a pull changed a sheet"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str], None]):
+        """Unregister a callback added with add_listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def values(self, title: str) -> List[List[str]]:
+        """Copy of the mirrored grid of a sheet"""
+        with self._lock:
+            return [list(row) for row in self._grids.get(title, [])]
+
+    def record_write(self, title: str, method: str, args: tuple, kwargs: dict) -> Any:
+        """Apply a write to the local grid and queue it for the push to Sheets
+
+        Returns:
+            A response shaped like the gspread one (append_row returns its updated range)
+        """
+        with self._lock:
+            grid = self._grids.setdefault(title, [])
+            # IDs of the touched rows before the write; the push finds the rows by them
+            blocks = _row_blocks(len(grid), method, args, kwargs)
+            row_keys = None if blocks is None else [
+                [grid[row][0] if row < len(grid) and grid[row] else '' for row in range(start, start + count)]
+                for start, count in blocks
+            ]
+            response, touched_from, touched_rows = apply_write(title, grid, method, args, kwargs)
+            self._grids[title] = grid
+            self._persist(title, touched_from, touched_rows)
+            self._conn.execute(
+                "INSERT INTO change_log (sheet, method, args, kwargs, created_at, row_keys) VALUES (?, ?, ?, ?, ?, ?)",
+                (title, method, json.dumps(list(args), default=str), json.dumps(kwargs, default=str), time.time(),
+                 None if row_keys is None else json.dumps(row_keys))
+            )
+            self._conn.commit()
+        return response
+
+    def _persist(self, title: str, rewrite_from: Optional[int], rows):
+        """Write changed rows of a grid to SQLite (caller holds the lock and commits)"""
+        grid = self._grids.get(title, [])
+        if rewrite_from is not None:
+            self._conn.execute("DELETE FROM mirror_rows WHERE sheet = ? AND row_index >= ?", (title, rewrite_from))
+            rows = set(rows) | set(range(rewrite_from, len(grid)))
+        for row_index in sorted(rows):
+            if row_index < len(grid):
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO mirror_rows (sheet, row_index, data) VALUES (?, ?, ?)",
+                    (title, row_index, json.dumps(grid[row_index], ensure_ascii=False))
+                )
+            else:
+                self._conn.execute("DELETE FROM mirror_rows WHERE sheet = ? AND row_index = ?", (title, row_index))
+        self._conn.execute("INSERT OR IGNORE INTO mirror_sheets (sheet, synced_at) VALUES (?, NULL)", (title,))
+
+    def start(self):
+        """Start the background sync thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="SheetsMirrorSync", daemon=True)
+        self._thread.start()
+
+    def stop(self, push: bool = True, timeout: float = 10.0):
+        """Stop the sync thread, optionally pushing pending changes one last time"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if push:
+            self.push()
+
+    def _run(self):
+        while not self._stop_event.wait(self.sync_interval):
+            if not self.connected and self._connector:
+                self._connect()
+            self.sync_once()
+
+    def _connect(self):
+        """Attach the remote sheets once the connector can reach Sheets"""
+        try:
+            spreadsheet, worksheets = self._connector()
+        except Exception as e:
+            logger.debug(f"Sheets still unreachable: {e}")
+            return
+        self.attach(spreadsheet, worksheets)
+        logger.info(f"Connected to Sheets, pushing {self.pending_count()} change(s) made offline")
+
+    def sync_once(self):
+        """Push pending changes, then pull remote changes if nothing is left to push"""
+        try:
+            if self.push() and self.pending_count() == 0:
+                self.pull()
+            self.last_sync_at = time.time()
+        except Exception as e:
+            logger.error(f"Error syncing sheets mirror: {e}")
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM change_log").fetchone()[0]
+
+    def push(self) -> bool:
+        """Replay the change log against Sheets in order, at the rows that hold the logged IDs now
+
+        Returns:
+            True if the log was drained, False if a connection/quota error stopped the push
+        """
+        columns: Dict[str, List[List[str]]] = {}  # Title -> remote column A as a one-column grid
+        while True:
+            with self._lock:
+                change = self._conn.execute(
+                    "SELECT id, sheet, method, args, kwargs, created_at, row_keys FROM change_log ORDER BY id LIMIT 1"
+                ).fetchone()
+                remote = self._remote.get(change[1]) if change else None
+            if change is None:
+                self.online = True
+                return True
+
+            change_id, title, method, args, kwargs, created_at, row_keys = change
+            args, kwargs = tuple(json.loads(args)), json.loads(kwargs)
+            try:
+                if remote is None:
+                    raise ConnectionError(f"worksheet {title} is not attached")
+                if title not in columns:
+                    columns[title] = [[value] for value in remote.col_values(1)]
+                args, kwargs = self._replay_args(title, remote, columns[title], method, args, kwargs,
+                                                 None if row_keys is None else json.loads(row_keys))
+                if args is not None:
+                    getattr(remote, method)(*args, **kwargs)
+                    apply_write(title, columns[title], method, args, kwargs)
+                    columns[title] = [row[:1] for row in columns[title]]
+                self.pushed += 1
+            except ReplayConflict as e:
+                self._dead_letter(change, f"Conflict: {e}")
+                continue
+            except Exception as e:
+                if self._is_transient(e):
+                    self.push_failures += 1
+                    if self.online:
+                        logger.warning(f"Sheets unreachable, keeping {self.pending_count()} change(s) for later: {e}")
+                    self.online = False
+                    return False
+                # A change Sheets rejects would block the log forever: set it aside for the user
+                self._dead_letter(change, str(e))
+                columns.pop(title, None)
+                continue
+
+            with self._lock:
+                self._conn.execute("DELETE FROM change_log WHERE id = ?", (change_id,))
+                self._conn.commit()
+
+    def _replay_args(self, title: str, remote, column_grid: List[List[str]], method: str,
+                     args: tuple, kwargs: dict, row_keys: Optional[List[List[str]]]):
+        """Rewrite a logged write for the current remote rows
+
+        Returns:
+            (args, kwargs) to send, or (None, None) if the change is already on the sheet
+
+        Raises:
+            ReplayConflict: The rows the change was made for are gone, moved apart or taken
+        """
+        column = [row[0] if row else '' for row in column_grid]
+        appended = _appended_rows(method, args, kwargs)
+        if appended:
+            present = []
+            for values in appended:
+                row_id = cell_value(values[0]) if values else ''
+                if row_id and row_id in column:
+                    present.append((column.index(row_id), values))
+            if not present:
+                return args, kwargs
+            # Already applied (e.g. the response of an earlier push was lost)?
+            if len(present) == len(appended) and all(
+                    trim_row([cell_value(v) for v in remote.row_values(row + 1)]) == trim_row(
+                        [cell_value(v) for v in values]) for row, values in present):
+                return None, None
+            raise ReplayConflict(f"ID {cell_value(present[0][1][0])} on {title} is already used by another client")
+
+        if row_keys is None:
+            return args, kwargs  # clear(), or logged before row IDs were recorded
+
+        blocks = _row_blocks(len(column), method, args, kwargs)
+        offsets = [self._row_offset(title, column, start, keys) for (start, _), keys in zip(blocks, row_keys)]
+        if not any(offsets):
+            return args, kwargs
+
+        if method == 'update':
+            range_name, values = range_and_values(args, kwargs)
+            kwargs = {key: value for key, value in kwargs.items() if key not in ('range_name', 'values')}
+            return (), dict(kwargs, range_name=_shift_rows(range_name, offsets[0]), values=values)
+        if method == 'batch_update':
+            data = [dict(item, range=_shift_rows(item['range'], offset))
+                    for item, offset in zip(args[0] if args else kwargs['data'], offsets)]
+            return ((data,) + tuple(args[1:]), kwargs) if args else ((), dict(kwargs, data=data))
+        if method == 'update_cell':
+            if args:
+                return (args[0] + offsets[0],) + tuple(args[1:]), kwargs
+            return (), dict(kwargs, row=kwargs['row'] + offsets[0])
+        if method == 'batch_clear':
+            ranges = [_shift_rows(range_name, offset)
+                      for range_name, offset in zip(args[0] if args else kwargs['ranges'], offsets)]
+            return ((ranges,), kwargs) if args else ((), dict(kwargs, ranges=ranges))
+        # delete_rows
+        start = args[0] if args else kwargs['start_index']
+        end = args[1] if len(args) > 1 else kwargs.get('end_index') or start
+        return (start + offsets[0], end + offsets[0]), {}
+
+    def _row_offset(self, title: str, column: List[str], start: int, keys: List[str]) -> int:
+        """Rows between where a logged block was and where its IDs are on the remote sheet now"""
+        poisoned = self._poisoned.get(title, set())
+        offsets = set()
+        for i, key in enumerate(keys):
+            if not key:
+                continue
+            if key in poisoned:
+                raise ReplayConflict(f"row {key} of {title} was never written to the sheet")
+            row = start + i
+            if row < len(column) and column[row] == key:
+                offsets.add(0)
+                continue
+            matches = [index for index, value in enumerate(column) if value == key]
+            if len(matches) != 1:
+                raise ReplayConflict(f"row {key} of {title} is {'missing' if not matches else 'not unique'} on the sheet")
+            offsets.add(matches[0] - row)
+        if len(offsets) > 1:
+            raise ReplayConflict(f"rows {', '.join(k for k in keys if k)} of {title} are no longer together")
+
+        offset = offsets.pop() if offsets else 0
+        for i, key in enumerate(keys):
+            row = start + i + offset
+            if not key and row < len(column) and column[row]:
+                raise ReplayConflict(f"row {row + 1} of {title} was filled by another client")
+        return offset
+
+    def _dead_letter(self, change: tuple, reason: str):
+        """Move a change that can't be pushed from the change log to the dead-letter table
+
+        IDs of rows it appended are remembered, so later changes to those rows (which
+        would land on another client's row with the same ID) become dead letters too,
+        until the sheet is pulled again
+        """
+        change_id, title, method, args, kwargs, created_at, row_keys = change
+        appended_ids = [cell_value(values[0]) for values in _appended_rows(method, tuple(json.loads(args)),
+                                                                            json.loads(kwargs)) if values]
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO dead_letter (sheet, method, args, kwargs, created_at, failed_at, reason, row_keys) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (title, method, args, kwargs, created_at, time.time(), reason,
+                 json.dumps([appended_ids]) if appended_ids else row_keys)
+            )
+            self._poisoned.setdefault(title, set()).update(appended_ids)
+            self._conn.execute("DELETE FROM change_log WHERE id = ?", (change_id,))
+            self._conn.commit()
+        self.dead_lettered += 1
+        logger.error(f"Change {method} on {title} was not written to Sheets, kept as dead letter: {reason}")
+
+    def get_dead_letters(self) -> List[Dict[str, Any]]:
+        """Changes Sheets rejected, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, sheet, method, args, kwargs, created_at, failed_at, reason FROM dead_letter ORDER BY id"
+            ).fetchall()
+        return [{
+            'id': row[0], 'sheet': row[1], 'method': row[2], 'args': json.loads(row[3]),
+            'kwargs': json.loads(row[4]), 'created_at': row[5], 'failed_at': row[6], 'reason': row[7]
+        } for row in rows]
+
+    def discard_dead_letters(self, ids: Optional[List[int]] = None):
+        """Forget dead letters the user has seen (all if ids is None)"""
+        with self._lock:
+            if ids is None:
+                self._conn.execute("DELETE FROM dead_letter")
+            else:
+                self._conn.executemany("DELETE FROM dead_letter WHERE id = ?", [(i,) for i in ids])
+            self._conn.commit()
+
+    def dead_letter_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM dead_letter").fetchone()[0]
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """Connection problems and 429/5xx are retried later; other errors are not"""
+        code = getattr(error, 'code', None)
+        if isinstance(code, int):
+            return code == 429 or code >= 500
+        return isinstance(error, (OSError, ConnectionError, TimeoutError)) or 'connection' in str(error).lower()
+
+    def pull(self):
+        """Fetch remote changes: appended rows from a column A probe, in-place edits from a periodic full diff"""
+        with self._lock:
+            titles = list(self._remote)
+        if not titles or self._spreadsheet is None:
+            return
+
+        if time.time() - self._last_full_sync >= self.full_sync_interval:
+            self._pull_full(titles)
+            return
+
+        response = self._spreadsheet.values_batch_get([self._quote(title, 'A:A') for title in titles])
+        full, tails = [], {}
+        for title, value_range in zip(titles, response.get('valueRanges', [])):
+            remote_column = [row[0] if row else '' for row in value_range.get('values', [])]
+            with self._lock:
+                grid = self._grids.get(title, [])
+                local_column = [row[0] if row else '' for row in grid]
+            while remote_column and remote_column[-1] == '':
+                remote_column.pop()
+            while local_column and local_column[-1] == '':
+                local_column.pop()
+
+            if title in self._poisoned:
+                full.append(title)  # Local rows that never reached the sheet may share IDs with remote rows
+            elif remote_column == local_column:
+                continue
+            elif len(remote_column) > len(local_column) == len(grid) and remote_column[:len(local_column)] == local_column:
+                tails[title] = len(local_column)
+            else:
+                full.append(title)
+
+        if tails:
+            tail_titles = list(tails)
+            response = self._spreadsheet.values_batch_get(
+                [self._quote(title, f"A{tails[title] + 1}:{self._last_column(title)}") for title in tail_titles]
+            )
+            for title, value_range in zip(tail_titles, response.get('valueRanges', [])):
+                self._apply_remote(title, self.values(title)[:tails[title]] + value_range.get('values', []))
+        if full:
+            self._pull_full(full)
+
+    def _pull_full(self, titles: List[str]):
+        """Fetch whole sheets in one batch read and apply the rows that differ"""
+        response = self._spreadsheet.values_batch_get([self._quote(title) for title in titles])
+        for title, value_range in zip(titles, response.get('valueRanges', [])):
+            self._apply_remote(title, value_range.get('values', []))
+        if set(titles) >= set(self._remote):
+            self._last_full_sync = time.time()
+
+    def _apply_remote(self, title: str, remote_grid: List[List[Any]]):
+        """Replace a mirrored grid with remote values, writing only changed rows"""
+        remote_grid = trim_grid([[cell_value(value) for value in row] for row in remote_grid])
+        with self._lock:
+            pending = self._conn.execute("SELECT COUNT(*) FROM change_log WHERE sheet = ?", (title,)).fetchone()[0]
+            if pending:
+                return  # Local changes not pushed yet; pull again after they are
+            self._poisoned.pop(title, None)  # Rows that never reached the sheet are gone locally too
+            old_grid = self._grids.get(title)
+            changed = {i for i in range(max(len(remote_grid), len(old_grid or [])))
+                       if old_grid is None or i >= len(old_grid) or i >= len(remote_grid)
+                       or old_grid[i] != remote_grid[i]}
+            if old_grid is not None and not changed:
+                self._conn.execute("UPDATE mirror_sheets SET synced_at = ? WHERE sheet = ?", (time.time(), title))
+                self._conn.commit()
+                return
+            self._grids[title] = remote_grid
+            self._persist(title, None, changed)
+            self._conn.execute("INSERT OR REPLACE INTO mirror_sheets (sheet, synced_at) VALUES (?, ?)",
+                               (title, time.time()))
+            self._conn.commit()
+
+        if old_grid is not None:
+            self.pulls += 1
+            self.rows_pulled += len(changed)
+            logger.info(f"Pulled {len(changed)} changed row(s) of {title} from Sheets")
+            for callback in self._listeners:
+                try:
+                    callback(title)
+                except Exception as e:
+                    logger.warning(f"Mirror change listener failed: {e}")
+
+    def _last_column(self, title: str) -> str:
+        """Letter of the last column of a sheet (reads must stay inside the grid)"""
+        col_count = getattr(self._remote.get(title), 'col_count', None)
+        if not isinstance(col_count, int) or col_count < 1:
+            col_count = 26
+        return rowcol_to_a1(1, col_count)[:-1]
+
+    @staticmethod
+    def _quote(title: str, a1: Optional[str] = None) -> str:
+        quoted = "'" + title.replace("'", "''") + "'"
+        return f"{quoted}!{a1}" if a1 else quoted
+
+    def _load_grids(self):
+        """Load mirrored grids saved by a previous run"""
+        titles = [row[0] for row in self._conn.execute("SELECT sheet FROM mirror_sheets")]
+        for title in titles:
+            grid = []
+            for row_index, data in self._conn.execute(
+                    "SELECT row_index, data FROM mirror_rows WHERE sheet = ? ORDER BY row_index", (title,)):
+                while len(grid) < row_index:
+                    grid.append([])
+                grid.append(json.loads(data))
+            self._grids[title] = grid
+        # Appends that became dead letters after the last pull still block changes to their rows
+        for title, method, row_keys in self._conn.execute(
+                "SELECT d.sheet, d.method, d.row_keys FROM dead_letter d LEFT JOIN mirror_sheets m ON m.sheet = d.sheet "
+                "WHERE m.synced_at IS NULL OR d.failed_at > m.synced_at"):
+            if method in ('append_row', 'append_rows') and row_keys:
+                self._poisoned.setdefault(title, set()).update(json.loads(row_keys)[0])
+        if titles:
+            logger.info(f"Loaded sheets mirror: {len(titles)} sheet(s), {self.pending_count()} pending change(s)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get mirror and sync statistics"""
+        with self._lock:
+            rows = {title: len(grid) for title, grid in self._grids.items()}
+        return {
+            'rows': rows,
+            'pending': self.pending_count(),
+            'pushed': self.pushed,
+            'push_failures': self.push_failures,
+            'dead_letters': self.dead_letter_count(),
+            'pulls': self.pulls,
+            'rows_pulled': self.rows_pulled,
+            'online': self.online,
+            'connected': self.connected,
+            'last_sync_at': self.last_sync_at
+        }
+
+    def close(self):
+        """Stop syncing (pushing what is left) and close the database"""
+        self.stop(push=True)
+        with self._lock:
+            self._conn.close()
+
+
+class MirroredWorksheet(GridReads):
+    """Worksheet proxy: reads come from the mirror, writes go to the mirror's change log"""
+
+    def __init__(self, mirror: SheetsMirror, worksheet, title: Optional[str] = None):
+        """
+        Args:
+            mirror: Mirror holding the sheet
+            worksheet: Remote worksheet (None when opened offline from the saved mirror)
+            title: Sheet title (defaults to the worksheet's)
+        """
+        self._mirror = mirror
+        self._target = worksheet
+        self.title = title or worksheet.title
+
+    def _grid(self) -> List[List[str]]:
+        return self._mirror.values(self.title)
+
+    def __getattr__(self, name):
+        if name in GRID_WRITE_METHODS:
+            def write(*args, **kwargs):
+                return self._mirror.record_write(self.title, name, args, kwargs)
+            return write
+        # Remote worksheet attached later (after an offline start) takes over
+        target = self._mirror._remote.get(self.title) or self._target
+        if target is None:
+            raise AttributeError(f"{name} is not available while {self.title} is offline")
+        return getattr(target, name)
+
+
+class MirroredSpreadsheet:
+    """Spreadsheet proxy returning mirrored worksheets and routing batch reads/updates to the mirror
+
+    With spreadsheet None (offline start) only the mirrored sheets exist.
+    """
+
+    def __init__(self, mirror: SheetsMirror, spreadsheet):
+        self._mirror = mirror
+        self._target = spreadsheet
+
+    def worksheet(self, title: str):
+        if self._target is None:
+            if not self._mirror.is_mirrored(title):
+                raise WorksheetNotFound(title)
+            return MirroredWorksheet(self._mirror, None, title)
+        return self._mirror.wrap_worksheet(self._target.worksheet(title))
+
+    def worksheets(self, *args, **kwargs):
+        if self._target is None:
+            return [MirroredWorksheet(self._mirror, None, title) for title in self._mirror.titles()]
+        return [self._mirror.wrap_worksheet(ws) for ws in self._target.worksheets(*args, **kwargs)]
+
+    def add_worksheet(self, title: str, *args, **kwargs):
+        if self._target is None:
+            raise ConnectionError(f"Can't create worksheet {title} while offline")
+        return self._mirror.wrap_worksheet(self._target.add_worksheet(title, *args, **kwargs))
+
+    def values_batch_get(self, ranges: List[str], *args, **kwargs) -> Dict[str, Any]:
+        """Answer from the mirror when every range is on a mirrored sheet"""
+        parsed = []
+        for range_name in ranges:
+            title, a1 = split_range(range_name)
+            if title is None:
+                title, a1 = range_name.strip("'").replace("''", "'"), None
+            parsed.append((range_name, title, a1))
+        if self._target is not None and not all(self._mirror.is_mirrored(title) for _, title, _ in parsed):
+            return self._target.values_batch_get(ranges, *args, **kwargs)
+        return {'valueRanges': [{'range': range_name, 'values': MirroredWorksheet(self._mirror, None, title).get(a1)}
+                                for range_name, title, a1 in parsed]}
+
+    def values_batch_update(self, body: Dict[str, Any], *args, **kwargs):
+        """Split a batch update by sheet; mirrored sheets are written locally"""
+        remote_data, local_data = [], {}
+        for item in body.get('data', []):
+            title, a1 = split_range(item['range'])
+            if title and self._mirror.is_mirrored(title):
+                local_data.setdefault(title, []).append({'range': a1, 'values': item['values']})
+            else:
+                remote_data.append(item)
+        for title, data in local_data.items():
+            self._mirror.record_write(title, 'batch_update', (data,), {'value_input_option': body.get('valueInputOption', 'RAW')})
+        if remote_data:
+            return self._target.values_batch_update(dict(body, data=remote_data), *args, **kwargs)
+        return {'totalUpdatedRows': sum(len(item['values']) for data in local_data.values() for item in data)}
+
+    def __getattr__(self, name):
+        if self._target is None:
+            raise AttributeError(f"{name} is not available while offline")
+        return getattr(self._target, name)
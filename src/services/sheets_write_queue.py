@@ -0,0 +1,249 @@
+"""
+Write-behind queue for Google Sheets battle results
+Battle results are queued in memory (and on disk), coalesced per character, and
+flushed by a background worker with batched API calls instead of one call per cell
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class SheetsWriteQueue:
+    """Background worker that batches battle result writes to SheetsManager"""
+
+    def __init__(self, sheets_manager, persist_path: Optional[Path] = None,
+                 flush_interval: float = None, autostart: bool = True):
+        """
+        Args:
+            sheets_manager: SheetsManager used to perform the writes
+            persist_path: JSON file the pending writes are saved to (survives crashes)
+            flush_interval: Seconds between background flushes
+            autostart: Start the background worker immediately
+        """
+        self.sheets_manager = sheets_manager
+        self.persist_path = Path(persist_path) if persist_path else Settings.DATA_DIR / "pending_writes.json"
+        self.flush_interval = flush_interval if flush_interval is not None else Settings.SHEETS_FLUSH_INTERVAL
+
+        # Pending writes: stat increments coalesced per character ID, history rows in order
+        self._stat_increments: Dict[str, Dict[str, int]] = {}
+        self._history: List[Dict[str, Any]] = []
+        self._rankings_dirty = False
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.battles_queued = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.api_calls = 0
+        self.dropped_increments = 0
+        self.last_error: Optional[str] = None
+
+        self._load()
+        if autostart:
+            self.start()
+
+    def start(self):
+        """Start the background flush worker"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SheetsWriteQueue", daemon=True)
+        self._thread.start()
+
+    def enqueue_battle(self, battle, battle_data: Optional[Dict[str, Any]] = None):
+        """
+        Queue the writes for one finished battle
+
+        Args:
+            battle: Battle object (character IDs and winner)
+            battle_data: BattleHistory row data (see SheetsManager.record_battle_history)
+        """
+        with self._lock:
+            for char_id, increment in battle.stat_increments().items():
+                delta = self._stat_increments.setdefault(char_id, {'wins': 0, 'losses': 0, 'draws': 0})
+                for key, value in increment.items():
+                    delta[key] += value
+
+            if battle_data:
+                self._history.append(dict(battle_data))
+
+            self._rankings_dirty = True
+            self.battles_queued += 1
+            self._persist()
+
+        logger.debug(f"Queued battle result ({self.pending_count()} pending write(s))")
+        self._wake.set()
+
+    def pending_count(self) -> int:
+        """Number of pending write operations (stat rows + history rows + rankings)"""
+        with self._lock:
+            return len(self._stat_increments) + len(self._history) + (1 if self._rankings_dirty else 0)
+
+    def flush(self) -> bool:
+        """
+        Write all pending results now (called by the worker, or directly to drain the queue)
+
+        Returns:
+            True if the queue is empty afterwards, False if writes failed and were kept
+        """
+        with self._flush_lock:
+            with self._lock:
+                increments = self._stat_increments
+                history = self._history
+                rankings_dirty = self._rankings_dirty
+                self._stat_increments = {}
+                self._history = []
+                self._rankings_dirty = False
+
+            if not increments and not history and not rankings_dirty:
+                return True
+
+            try:
+                if increments:
+                    self.api_calls += 1
+                    result = self.sheets_manager.apply_stat_increments(increments)
+                    if result is None:
+                        raise RuntimeError("stat increments were not applied")
+                    # Increments were written in one request: never re-queue them. Characters
+                    # deleted while their battle was queued can't be updated, so drop theirs
+                    _, missing = result
+                    if missing:
+                        self.dropped_increments += len(missing)
+                        logger.warning(f"Dropped queued stat increments for missing character(s): "
+                                       f"{', '.join(missing)}")
+                    increments = {}
+
+                if history:
+                    self.api_calls += 1
+                    if not self.sheets_manager.record_battle_histories(history):
+                        raise RuntimeError("battle history was not recorded")
+                    history = []
+
+                if rankings_dirty:
+                    self.api_calls += 1
+                    if not self.sheets_manager.update_rankings():
+                        raise RuntimeError("rankings were not updated")
+                    rankings_dirty = False
+
+                self.flushes += 1
+                self.last_error = None
+                with self._lock:
+                    self._persist()
+                logger.info("✓ Flushed queued battle results to Google Sheets")
+                return self.pending_count() == 0
+
+            except Exception as e:
+                # Put back whatever was not written (in front of anything queued meanwhile)
+                self.failed_flushes += 1
+                self.last_error = str(e)
+                logger.error(f"Error flushing queued Sheets writes: {e}")
+                with self._lock:
+                    for char_id, delta in increments.items():
+                        current = self._stat_increments.setdefault(char_id, {'wins': 0, 'losses': 0, 'draws': 0})
+                        for key, value in delta.items():
+                            current[key] = current.get(key, 0) + value
+                    self._history = history + self._history
+                    self._rankings_dirty = self._rankings_dirty or rankings_dirty
+                    self._persist()
+                return False
+
+    def stop(self, flush: bool = True, timeout: float = 10.0):
+        """
+        Stop the background worker
+
+        Args:
+            flush: Try to write pending results before returning
+            timeout: Seconds to wait for the worker to finish
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if flush:
+            self.flush()
+        if self.pending_count():
+            logger.warning(f"{self.pending_count()} Sheets write(s) still pending, saved to {self.persist_path}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics"""
+        with self._lock:
+            return {
+                'pending_characters': len(self._stat_increments),
+                'pending_history': len(self._history),
+                'rankings_dirty': self._rankings_dirty,
+                'battles_queued': self.battles_queued,
+                'flushes': self.flushes,
+                'failed_flushes': self.failed_flushes,
+                'api_calls': self.api_calls,
+                'dropped_increments': self.dropped_increments,
+                'last_error': self.last_error
+            }
+
+    def _run(self):
+        """Worker loop: wait for new results, let them accumulate briefly, then flush"""
+        backoff = self.flush_interval
+        while not self._stop.is_set():
+            self._wake.wait()
+            if self._stop.is_set():
+                break
+            # Collect further results arriving within the flush interval into the same batch
+            self._stop.wait(backoff)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+
+            if self.flush():
+                backoff = self.flush_interval
+            else:
+                backoff = min(backoff * 2, 300.0)
+                self._wake.set()
+
+    def _persist(self):
+        """Save pending writes to disk atomically (caller holds the lock)"""
+        try:
+            if not self._stat_increments and not self._history and not self._rankings_dirty:
+                if self.persist_path.exists():
+                    self.persist_path.unlink()
+                return
+
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.persist_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'stat_increments': self._stat_increments,
+                    'history': self._history,
+                    'rankings_dirty': self._rankings_dirty
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.persist_path)
+        except Exception as e:
+            logger.error(f"Error persisting Sheets write queue: {e}")
+
+    def _load(self):
+        """Restore pending writes left over from a previous run"""
+        if not self.persist_path.exists():
+            return
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._stat_increments = data.get('stat_increments', {})
+            self._history = data.get('history', [])
+            self._rankings_dirty = data.get('rankings_dirty', False)
+            if self.pending_count():
+                logger.info(f"Restored {self.pending_count()} pending Sheets write(s) from {self.persist_path}")
+                self._wake.set()
+        except Exception as e:
+            logger.error(f"Error loading Sheets write queue: {e}")
@@ -11,6 +11,7 @@ from src.models.character import Character
 from src.models.story_boss import StoryBoss, StoryProgress
 from src.services.battle_engine import BattleEngine
 from src.models.battle import Battle
+from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,7 @@ class StoryModeEngine:
         self.current_character: Optional[Character] = None
         self.current_boss_level: int = 1
         self.progress_cache: Dict[str, StoryProgress] = {}  # Cache to reduce API calls
+        self._progress_loaded_at = 0.0  # When progress_cache was last bulk loaded
 
     def load_bosses(self) -> bool:
         """Load all story mode bosses"""
@@ -52,11 +54,13 @@ class StoryModeEngine:
     def get_player_progress(self, character_id: str, use_cache: bool = True) -> StoryProgress:
         """Get player's story mode progress with caching"""
         try:
-            # Check cache first
+            # Check cache first (bulk loaded for all characters, refreshed per TTL)
+            bulk_loaded = use_cache and self._load_all_progress()
             if use_cache and character_id in self.progress_cache:
                 return self.progress_cache[character_id]
 
-            progress = self.db_manager.get_story_progress(character_id)
+            # A fresh bulk load already showed there is no saved progress
+            progress = None if bulk_loaded else self.db_manager.get_story_progress(character_id)
             if not progress:
                 # Create new progress
                 progress = StoryProgress(character_id=character_id)
@@ -69,6 +73,26 @@ class StoryModeEngine:
             logger.error(f"Error getting story progress: {e}")
             return StoryProgress(character_id=character_id)
 
+    def _load_all_progress(self, force: bool = False) -> bool:
+        """Refresh progress_cache for all characters with one read (at most once per TTL)
+
+        Returns:
+            True if progress_cache holds a bulk load that is still fresh
+        """
+        if not hasattr(self.db_manager, 'get_all_story_progress'):
+            return False
+
+        if not force and self._progress_loaded_at and time.time() - self._progress_loaded_at < Settings.STORY_PROGRESS_TTL:
+            return True
+
+        progress_map = self.db_manager.get_all_story_progress()
+        if progress_map is None:
+            return False
+
+        self.progress_cache.update(progress_map)
+        self._progress_loaded_at = time.time()
+        return True
+
     def start_battle(self, player: Character, boss_level: int) -> Optional[Battle]:
         """Start a story mode battle"""
         try:
@@ -97,6 +121,7 @@ class StoryModeEngine:
             )
 
             # Create battle engine
+            self._release_battle_engine()
             self.battle_engine = BattleEngine()
 
             # Apply current settings to battle engine
@@ -137,6 +162,13 @@ class StoryModeEngine:
         except Exception as e:
             logger.error(f"Error executing story battle: {e}")
             return None
+        finally:
+            self._release_battle_engine()
+
+    def _release_battle_engine(self):
+        """Release the frame output held by the last battle's engine (the shared block stays with other holders)"""
+        if self.battle_engine:
+            self.battle_engine.disable_shared_memory_output()
 
     def update_progress(self, character_id: str, boss_level: int, victory: bool) -> bool:
         """Update player's story mode progress"""
@@ -409,6 +441,8 @@ class StoryModeEngine:
         """Stop auto story mode"""
         self.is_running = False
         self.current_character = None
+        self._release_battle_engine()
         self.character_queue.clear()
         self.progress_cache.clear()  # Clear cache when stopping
+        self._progress_loaded_at = 0.0
         logger.info("Auto story mode stopped")
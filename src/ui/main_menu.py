@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import Optional
 
 from src.services.sheets_manager import SheetsManager
+from src.services.sheets_actor import SheetsActor
+from src.services.sheets_write_queue import SheetsWriteQueue
 from src.services.database_manager import DatabaseManager
 from src.services.image_processor import ImageProcessor
 from src.services.ai_analyzer import AIAnalyzer
@@ -44,12 +46,16 @@ class MainMenuWindow:
 
         if sheets_manager.online_mode:
             logger.info("MainMenuWindow.__init__: Using Google Sheets (online mode)")
-            self.db_manager = sheets_manager
+            # All Sheets calls (UI, loader thread, write queue) run in order on one I/O thread;
+            # queued battle results are flushed on its background lane so UI reads go first
+            self.db_manager = SheetsActor(sheets_manager)
             self.online_mode = True
+            self.write_queue = SheetsWriteQueue(self.db_manager.background)
         else:
             logger.warning("MainMenuWindow.__init__: Google Sheets unavailable, using local database (offline mode)")
             self.db_manager = DatabaseManager()
             self.online_mode = False
+            self.write_queue = None
 
         logger.info("MainMenuWindow.__init__: Initializing image processor")
         self.image_processor = ImageProcessor()
@@ -78,7 +84,9 @@ class MainMenuWindow:
         
         # Status
         self.status_var = tk.StringVar()
-        if self.online_mode:
+        if self.online_mode and sheets_manager.mirror and not sheets_manager.mirror.connected:
+            self.status_var.set("Ready (Google Sheets unreachable - using local mirror, changes sync when reconnected)")
+        elif self.online_mode:
             self.status_var.set("Ready (Online Mode - Google Sheets)")
         else:
             self.status_var.set("Ready (Offline Mode - Local Database)")
@@ -94,6 +102,11 @@ class MainMenuWindow:
         logger.info("MainMenuWindow.__init__: Scheduling character loading")
         self.root.after(100, self._load_characters)
 
+        # Report changes Google Sheets rejected while syncing the local mirror
+        self._reported_dead_letters = set()
+        if self.online_mode:
+            self.root.after(5000, self._check_sheets_sync)
+
         logger.info("Main menu window initialized")
     
     def _setup_styles(self):
@@ -485,9 +498,11 @@ class MainMenuWindow:
                         self.root.after(0, update_ui)
 
                     # Load characters (with AI generation if needed)
-                    if isinstance(self.db_manager, SheetsManager):
-                        # Online mode - pass progress callback for AI generation
-                        characters = self.db_manager.get_all_characters(progress_callback=progress_callback)
+                    if isinstance(self.db_manager, SheetsActor):
+                        # Online mode - reload from the sheet (new LINE registrations) and
+                        # pass progress callback for AI generation (background lane, run in steps)
+                        self.db_manager.refresh(self.db_manager.worksheet)
+                        characters = self.db_manager.background.get_all_characters(progress_callback=progress_callback)
                     else:
                         # Offline mode - no AI generation
                         characters = self.db_manager.get_all_characters()
@@ -557,6 +572,31 @@ class MainMenuWindow:
             self.status_var.set(f"Error loading characters: {e}")
             messagebox.showerror("Error", f"Failed to load characters: {e}")
     
+    def _check_sheets_sync(self):
+        """Show changes the local mirror could not write to Google Sheets (checked every 30 seconds)"""
+        try:
+            # The mirror is thread-safe, so this doesn't wait behind the Sheets I/O thread
+            mirror = getattr(self.db_manager, 'mirror', None)
+            dead_letters = mirror.get_dead_letters() if mirror else []
+            new = [letter for letter in dead_letters if letter['id'] not in self._reported_dead_letters]
+            if new:
+                self._reported_dead_letters.update(letter['id'] for letter in new)
+                lines = [f"- {letter['sheet']} {letter['method']}: {letter['reason']}" for letter in new[:10]]
+                if len(new) > 10:
+                    lines.append(f"... and {len(new) - 10} more")
+                self.status_var.set(f"⚠ {len(new)} change(s) were not written to Google Sheets")
+                if messagebox.askyesno(
+                        "Google Sheets",
+                        f"Google Sheetsに書き込めなかった変更があります / "
+                        f"{len(new)} change(s) could not be written to Google Sheets "
+                        f"(kept in {mirror.db_path}):\n\n" + "\n".join(lines) +
+                        "\n\n一覧から削除しますか？ / Remove them from the list?"):
+                    mirror.discard_dead_letters([letter['id'] for letter in new])
+        except Exception as e:
+            logger.error(f"Error checking Sheets sync: {e}")
+        finally:
+            self.root.after(30000, self._check_sheets_sync)
+
     def _on_character_select(self, event):
         """Handle character selection"""
         try:
@@ -635,12 +675,6 @@ class MainMenuWindow:
             # Start battle
             battle = self.battle_engine.start_battle(char1, char2, visual_mode)
 
-            # Save battle to database
-            if self.db_manager.save_battle(battle):
-                logger.info(f"Battle saved: {battle.id}")
-            else:
-                logger.warning("Failed to save battle")
-
             # Record battle history to Google Sheets (online mode only)
             if self.online_mode:
                 winner_id = battle.winner_id if battle.winner_id else ""
@@ -669,17 +703,15 @@ class MainMenuWindow:
                     'battle_log': battle.battle_log  # Add battle log
                 }
 
-                if self.db_manager.record_battle_history(battle_data):
-                    logger.info("Battle history recorded to Google Sheets")
-                else:
-                    logger.warning("Failed to record battle history")
-
-                # Update rankings after battle
-                if self.db_manager.update_rankings():
-                    logger.info("Rankings updated successfully")
-                else:
-                    logger.warning("Failed to update rankings")
+                # Stats, history and rankings are written in the background in batches
+                self.write_queue.enqueue_battle(battle, battle_data)
+                logger.info(f"Battle result queued for Google Sheets: {battle.id}")
             else:
+                # Save battle to database
+                if self.db_manager.save_battle(battle):
+                    logger.info(f"Battle saved: {battle.id}")
+                else:
+                    logger.warning("Failed to save battle")
                 logger.info("Offline mode: Battle history and rankings not recorded")
             
             # Update status
@@ -791,6 +823,10 @@ class MainMenuWindow:
         try:
             if hasattr(self, 'battle_engine') and self.battle_engine:
                 self.battle_engine.cleanup()
+            if getattr(self, 'write_queue', None):
+                self.write_queue.stop()
+            if isinstance(getattr(self, 'db_manager', None), SheetsActor):
+                self.db_manager.close()
             logger.info("Main menu cleaned up")
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
@@ -838,7 +874,8 @@ class MainMenuWindow:
             logger.info(f"Endless battle started with champion: {result['champion'].name}")
 
             # Open endless battle window
-            EndlessBattleWindow(self.root, self.endless_battle_engine, self.db_manager, self.visual_mode_var.get())
+            EndlessBattleWindow(self.root, self.endless_battle_engine, self.db_manager, self.visual_mode_var.get(),
+                                self.write_queue)
 
         except Exception as e:
             logger.error(f"Error starting endless battle: {e}")
@@ -1391,6 +1428,7 @@ class BattleHistoryWindow:
         self.db_manager = db_manager
         self.battles = []
         self.selected_battle = None
+        self._history_cursor = None  # Cursor of the next older page (SheetsManager only)
 
         logger.info("Creating BattleHistoryWindow")
 
@@ -1444,6 +1482,9 @@ class BattleHistoryWindow:
             left_controls.pack(side=tk.LEFT)
 
             ttk.Button(left_controls, text="🔄 Refresh", command=self._load_battles_safe).pack(side=tk.LEFT)
+            self.load_more_button = ttk.Button(left_controls, text="⏬ Load older", command=self._load_older_battles,
+                                               state=tk.DISABLED)
+            self.load_more_button.pack(side=tk.LEFT, padx=(5, 0))
 
             # Right controls
             right_controls = ttk.Frame(control_frame)
@@ -1613,63 +1654,18 @@ class BattleHistoryWindow:
 
             self.battles = []
 
-            # Get limited number of battles
+            # Get limited number of battles (Sheets: only the last rows are read, older pages on demand)
             limit = min(int(self.limit_var.get()), 20)
-            battles = self.db_manager.get_recent_battles(limit=limit)
-
-            for i, battle in enumerate(battles):
-                try:
-                    # Get basic info safely
-                    battle_id_short = battle.id[:8] if battle.id else "Unknown"
-
-                    # Get character names with fallback
-                    char1_name = "Unknown"
-                    char2_name = "Unknown"
-                    try:
-                        char1 = self.db_manager.get_character(battle.character1_id)
-                        char2 = self.db_manager.get_character(battle.character2_id)
-                        if char1:
-                            char1_name = char1.name[:12]  # Truncate for better display
-                        if char2:
-                            char2_name = char2.name[:12]
-                    except Exception:
-                        pass
-
-                    # Determine winner
-                    winner_name = "Draw"
-                    if battle.winner_id:
-                        if battle.winner_id == battle.character1_id:
-                            winner_name = char1_name
-                        elif battle.winner_id == battle.character2_id:
-                            winner_name = char2_name
-
-                    # Format date
-                    try:
-                        date_str = battle.created_at.strftime("%m/%d %H:%M")
-                    except Exception:
-                        date_str = "Unknown"
-
-                    # Format duration
-                    duration_str = f"{battle.duration:.1f}" if battle.duration else "0.0"
-
-                    # Add to appropriate widget
-                    if self._use_treeview:
-                        # Use Treeview with nice columns
-                        fighters_text = f"{char1_name} vs {char2_name}"
-                        self.battle_tree.insert("", tk.END,
-                                              text=battle_id_short,
-                                              values=(date_str, fighters_text, winner_name, duration_str))
-                    else:
-                        # Use Listbox with formatted text
-                        battle_text = f"{battle_id_short} | {date_str} | {char1_name} vs {char2_name} | Winner: {winner_name}"
-                        self.battle_listbox.insert(tk.END, battle_text)
+            if isinstance(self.db_manager, SheetsActor):
+                battles, self._history_cursor = self.db_manager.get_recent_battles_page(limit=limit)
+            else:
+                battles, self._history_cursor = self.db_manager.get_recent_battles(limit=limit), None
+            self.load_more_button.config(state=tk.NORMAL if self._history_cursor else tk.DISABLED)
 
+            for battle in battles:
+                if self._insert_battle(battle, len(self.battles)):
                     self.battles.append(battle)
 
-                except Exception as battle_e:
-                    logger.warning(f"Error processing battle {i}: {battle_e}")
-                    continue
-
             logger.info(f"Loaded {len(self.battles)} battles safely")
 
             # Clear detail text
@@ -1683,6 +1679,79 @@ class BattleHistoryWindow:
             except:
                 pass
 
+    def _load_older_battles(self):
+        """Load the page of battles before the oldest one shown (placed above it)"""
+        try:
+            if not self._history_cursor:
+                return
+            limit = min(int(self.limit_var.get()), 20)
+            battles, self._history_cursor = self.db_manager.get_recent_battles_page(
+                limit=limit, cursor=self._history_cursor)
+
+            older = []
+            for battle in battles:
+                if self._insert_battle(battle, len(older)):
+                    older.append(battle)
+            self.battles = older + self.battles
+            self.load_more_button.config(state=tk.NORMAL if self._history_cursor else tk.DISABLED)
+            logger.info(f"Loaded {len(older)} older battles ({len(self.battles)} shown)")
+
+        except Exception as e:
+            logger.error(f"Error loading older battles: {e}")
+
+    def _insert_battle(self, battle, index) -> bool:
+        """Add one battle to the list widget at the given position"""
+        try:
+            # Get basic info safely
+            battle_id_short = battle.id[:8] if battle.id else "Unknown"
+
+            # Get character names with fallback
+            char1_name = "Unknown"
+            char2_name = "Unknown"
+            try:
+                char1 = self.db_manager.get_character(battle.character1_id)
+                char2 = self.db_manager.get_character(battle.character2_id)
+                if char1:
+                    char1_name = char1.name[:12]  # Truncate for better display
+                if char2:
+                    char2_name = char2.name[:12]
+            except Exception:
+                pass
+
+            # Determine winner
+            winner_name = "Draw"
+            if battle.winner_id:
+                if battle.winner_id == battle.character1_id:
+                    winner_name = char1_name
+                elif battle.winner_id == battle.character2_id:
+                    winner_name = char2_name
+
+            # Format date
+            try:
+                date_str = battle.created_at.strftime("%m/%d %H:%M")
+            except Exception:
+                date_str = "Unknown"
+
+            # Format duration
+            duration_str = f"{battle.duration:.1f}" if battle.duration else "0.0"
+
+            # Add to appropriate widget
+            if self._use_treeview:
+                # Use Treeview with nice columns
+                fighters_text = f"{char1_name} vs {char2_name}"
+                self.battle_tree.insert("", index,
+                                        text=battle_id_short,
+                                        values=(date_str, fighters_text, winner_name, duration_str))
+            else:
+                # Use Listbox with formatted text
+                battle_text = f"{battle_id_short} | {date_str} | {char1_name} vs {char2_name} | Winner: {winner_name}"
+                self.battle_listbox.insert(index, battle_text)
+            return True
+
+        except Exception as battle_e:
+            logger.warning(f"Error processing battle {battle.id if battle else 'Unknown'}: {battle_e}")
+            return False
+
     def _on_limit_change(self, event=None):
         """Handle limit change"""
         self._load_battles_safe()
@@ -1702,12 +1771,18 @@ class BattleHistoryWindow:
         except Exception as e:
             logger.error(f"Error handling battle selection: {e}")
 
+    def _load_battle_log(self, battle):
+        """Fetch the battle log of a Sheets history entry when its details are shown"""
+        if not battle.battle_log and battle.id and isinstance(self.db_manager, SheetsActor):
+            battle.battle_log = self.db_manager.get_battle_log(battle.id)
+
     def _display_battle_details_safe(self, battle):
         """Display battle details with improved formatting"""
         try:
             if not battle:
                 self._show_detail_text("No battle selected")
                 return
+            self._load_battle_log(battle)
 
             details = []
 
@@ -2075,6 +2150,7 @@ class BattleHistoryWindow:
             if not battle:
                 self._show_detail_error("バトルデータが見つかりません")
                 return
+            self._load_battle_log(battle)
                 
             # Get character details safely
             char1 = None
@@ -2753,9 +2829,10 @@ class StoryModeWindow:
 class EndlessBattleWindow:
     """Window for endless tournament-style battles"""
 
-    def __init__(self, parent, endless_engine, db_manager, visual_mode: bool = True):
+    def __init__(self, parent, endless_engine, db_manager, visual_mode: bool = True, write_queue=None):
         self.endless_engine = endless_engine
         self.db_manager = db_manager
+        self.write_queue = write_queue
         self.visual_mode = visual_mode
         self.is_running = True
         self.check_interval = 10000  # Check for new characters every 10 seconds
@@ -2846,13 +2923,10 @@ class EndlessBattleWindow:
                 # Battle completed, save and continue
                 self._update_battle_complete(result)
 
-                # Save battle to database
                 battle = result['battle']
-                if self.db_manager.save_battle(battle):
-                    logger.info(f"Endless battle saved: {battle.id}")
 
                 # Record battle history to Google Sheets (online mode only)
-                if isinstance(self.db_manager, SheetsManager) and self.db_manager.online_mode:
+                if self.write_queue and isinstance(self.db_manager, SheetsActor) and self.db_manager.online_mode:
                     battle_data = {
                         'battle_id': battle.id,
                         'fighter1_id': battle.character1_id,
@@ -2871,16 +2945,11 @@ class EndlessBattleWindow:
                         'battle_log': battle.battle_log
                     }
 
-                    if self.db_manager.record_battle_history(battle_data):
-                        logger.info("Endless battle history recorded to Google Sheets")
-                    else:
-                        logger.warning("Failed to record endless battle history")
-
-                    # Update rankings after battle
-                    if self.db_manager.update_rankings():
-                        logger.info("Rankings updated successfully")
-                    else:
-                        logger.warning("Failed to update rankings")
+                    # Stats, history and rankings are written in the background in batches
+                    self.write_queue.enqueue_battle(battle, battle_data)
+                    logger.info(f"Endless battle result queued for Google Sheets: {battle.id}")
+                elif self.db_manager.save_battle(battle):
+                    logger.info(f"Endless battle saved: {battle.id}")
 
                 # Schedule next battle
                 self.window.after(1000, self._start_battle_loop)
@@ -9,6 +9,7 @@ import logging
 from pathlib import Path
 from src.models.story_boss import StoryBoss
 from src.services.image_processor import ImageProcessor
+from src.services.image_cache import image_cache
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
@@ -281,10 +282,14 @@ class StoryBossManagerWindow:
 
     def _update_image_display(self):
         """Update image displays"""
+        # Drive URLs are shown from the local image cache
+        image_path = image_cache.resolve(self.selected_image_path) if self.selected_image_path else None
+        sprite_path = image_cache.resolve(self.selected_sprite_path) if self.selected_sprite_path else None
+
         # Update original image
-        if self.selected_image_path and Path(self.selected_image_path).exists():
+        if image_path and Path(image_path).exists():
             try:
-                img = Image.open(self.selected_image_path)
+                img = Image.open(image_path)
                 img.thumbnail((150, 150))
                 photo = ImageTk.PhotoImage(img)
                 self.original_image_label.config(image=photo, text="")
@@ -295,9 +300,9 @@ class StoryBossManagerWindow:
             self.original_image_label.config(image="", text="画像なし")
 
         # Update sprite image
-        if self.selected_sprite_path and Path(self.selected_sprite_path).exists():
+        if sprite_path and Path(sprite_path).exists():
             try:
-                img = Image.open(self.selected_sprite_path)
+                img = Image.open(sprite_path)
                 img.thumbnail((150, 150))
                 photo = ImageTk.PhotoImage(img)
                 self.sprite_image_label.config(image=photo, text="")
@@ -342,8 +347,8 @@ class StoryBossManagerWindow:
             # Upload images if they are local files
             if self.selected_image_path and not self.selected_image_path.startswith('http'):
                 # Upload to Google Drive
-                from src.services.sheets_manager import SheetsManager
-                if isinstance(self.db_manager, SheetsManager):
+                from src.services.sheets_actor import SheetsActor
+                if isinstance(self.db_manager, SheetsActor):
                     image_url = self.db_manager.upload_to_drive(
                         self.selected_image_path,
                         f"boss_lv{self.current_boss.level}_original{Path(self.selected_image_path).suffix}"
@@ -357,8 +362,8 @@ class StoryBossManagerWindow:
 
             if self.selected_sprite_path and not self.selected_sprite_path.startswith('http'):
                 # Upload to Google Drive
-                from src.services.sheets_manager import SheetsManager
-                if isinstance(self.db_manager, SheetsManager):
+                from src.services.sheets_actor import SheetsActor
+                if isinstance(self.db_manager, SheetsActor):
                     sprite_url = self.db_manager.upload_to_drive(
                         self.selected_sprite_path,
                         f"boss_lv{self.current_boss.level}_sprite.png"
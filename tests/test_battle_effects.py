@@ -0,0 +1,55 @@
+"""
+Unit tests for battle effects particle pooling
+"""
+
+import pygame
+
+from src.services.battle_effects import BattleEffects
+
+
+class TestBattleEffectsPool:
+    """Test BattleEffects particle pool"""
+
+    def test_particles_are_reused(self):
+        """Test that dead particles go back to the pool and are reused"""
+        effects = BattleEffects(pygame.Surface((200, 200)), max_particles=10)
+        first = effects.add_particle(10, 10, 0, 0, life=1, color=(255, 0, 0))
+
+        effects.update(1.0)  # life -> 0
+        effects.update(1.0)  # released to pool
+
+        assert effects.particles == []
+        assert effects.add_particle(20, 20, 0, 0, life=5, color=(0, 255, 0)) is first
+        assert first.max_life == 5
+
+    def test_hard_cap(self):
+        """Test that live particles never exceed the pool capacity"""
+        effects = BattleEffects(pygame.Surface((200, 200)), max_particles=25)
+        effects.create_explosion(100, 100, particle_count=40)
+
+        stats = effects.get_pool_stats()
+        assert stats['live'] == 25
+        assert stats['free'] == 0
+        assert stats['dropped'] == 15
+        assert stats['utilisation'] == 1.0
+
+    def test_draw_reuses_scratch_surfaces(self):
+        """Test that drawing reuses one scratch surface per particle size"""
+        effects = BattleEffects(pygame.Surface((200, 200)), max_particles=50)
+        for _ in range(20):
+            effects.add_particle(50, 50, 0, 0, life=10, color=(255, 255, 255), size=4)
+
+        effects.draw()
+        effects.draw()
+
+        assert effects.get_pool_stats()['scratch_surfaces'] == 1
+
+    def test_clear_returns_particles(self):
+        """Test that clear() returns all live particles to the pool"""
+        effects = BattleEffects(pygame.Surface((200, 200)), max_particles=30)
+        effects.create_magic_particles(100, 100, particle_count=30)
+        effects.clear()
+
+        stats = effects.get_pool_stats()
+        assert stats['live'] == 0
+        assert stats['free'] == 30
@@ -5,6 +5,7 @@ Unit tests for battle engine functionality
 import pytest
 from unittest.mock import patch, MagicMock
 import time
+import pygame
 
 from src.services.battle_engine import BattleEngine
 from src.models import Character, Battle, BattleTurn, Battle
@@ -438,4 +439,55 @@ class TestBattleEngineStatistics:
         
         # Should have recorded magic usage
         total_magic = result.magic_used[char1.id] + result.magic_used[char2.id]
-        assert total_magic > 0
\ No newline at end of file
+        assert total_magic > 0
+
+
+class TestPrerenderedHud:
+    """Test pre-rendered HP bar drawing"""
+
+    def _fighters(self):
+        char1 = Character(name="Left", hp=100, attack=50, defense=50, speed=50, magic=50, image_path="/test/left.png")
+        char2 = Character(name="Right", hp=80, attack=50, defense=50, speed=50, magic=50, image_path="/test/right.png")
+        return char1, char2
+
+    def _engine_with_surface(self):
+        pygame.font.init()
+        engine = BattleEngine()
+        engine.screen = pygame.Surface((1024, 768))
+        return engine
+
+    def test_hud_cache_built_once_per_battle(self):
+        """Test that HUD surfaces are reused across frames"""
+        char1, char2 = self._fighters()
+        engine = self._engine_with_surface()
+
+        engine._draw_hp_bars(char1, char2, (300, 400), (700, 400), char1.hp, char2.hp, [0, 0], 1.0)
+        hud = engine._hud_cache
+        engine._draw_hp_bars(char1, char2, (300, 400), (700, 400), char1.hp // 2, 1, [0, 0], 1.0)
+
+        assert engine._hud_cache is hud
+        assert set(hud['strips']) == {'green', 'yellow', 'red'}
+
+    def test_fill_width_matches_hp(self):
+        """Test that the bar fill uses the color tier and width for the HP ratio"""
+        char1, char2 = self._fighters()
+        engine = self._engine_with_surface()
+        engine._draw_hp_bars(char1, char2, (300, 400), (700, 400), char1.hp, 0, [0, 0], 1.0)
+
+        bar_y = 400 - 185 + 15
+        assert engine.screen.get_at((300 - 140 + 10, bar_y))[:3] != (80, 80, 80)  # Filled (full HP)
+        assert engine.screen.get_at((700 - 140 + 10, bar_y))[:3] == (80, 80, 80)  # Empty (0 HP)
+        assert engine._get_hp_color_key(0.3) == 'yellow'
+
+    def test_legacy_hp_bars_when_disabled(self):
+        """Test that BATTLE_PRERENDERED_HUD off draws the bars directly with the same layout"""
+        char1, char2 = self._fighters()
+        engine = self._engine_with_surface()
+        engine.use_prerendered_hud = False
+        engine._draw_hp_bars(char1, char2, (300, 400), (700, 400), 10, 0, [0, 0], 1.0)
+
+        bar_y = 400 - 185 + 15
+        assert engine._hud_cache is None
+        assert engine.screen.get_at((300 - 140 + 10, bar_y))[:3] == (255, 0, 0)  # Red tier (10% HP)
+        assert engine.screen.get_at((700 - 140 + 10, bar_y))[:3] == (80, 80, 80)  # Empty (0 HP)
+        assert engine.screen.get_at((300 - 140, bar_y))[:3] == (0, 0, 0)  # Border
@@ -0,0 +1,116 @@
+"""
+Unit tests for the offscreen battle recorder
+"""
+
+import threading
+
+import pygame
+import pytest
+
+from src.services import battle_recorder
+from src.services.battle_recorder import BattleRecorder
+
+pytestmark = pytest.mark.skipif(not battle_recorder.CV2_AVAILABLE, reason="OpenCV not installed")
+
+
+def _solid_surface(color, size=(8, 4)):
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    return surface
+
+
+class FakeVideoWriter:
+    """VideoWriter that fails to open"""
+
+    instances = []
+
+    def __init__(self, *args):
+        self.released = False
+        self.writes = 0
+        FakeVideoWriter.instances.append(self)
+
+    def isOpened(self):
+        return False
+
+    def write(self, frame):
+        self.writes += 1
+
+    def release(self):
+        self.released = True
+
+
+class TestBattleRecorder:
+    """Test BattleRecorder"""
+
+    def test_png_sequence_written(self, tmp_path):
+        """Test that PNG mode writes one numbered file per frame"""
+        recorder = BattleRecorder(tmp_path / "frames", mode=BattleRecorder.MODE_PNG)
+        assert recorder.start()
+        for value in range(3):
+            recorder.write_frame(_solid_surface((value, 0, 0)))
+        recorder.close()
+
+        files = sorted(p.name for p in (tmp_path / "frames").iterdir())
+        assert files == ["frame_000000.png", "frame_000001.png", "frame_000002.png"]
+        assert recorder.frames_written == 3
+        assert recorder.frames_dropped == 0
+
+    def test_full_queue_drops_frames(self, tmp_path, monkeypatch):
+        """Test that frames are dropped and counted while the encoder is stalled"""
+        entered = threading.Event()
+        release = threading.Event()
+        convert = battle_recorder.cv2.cvtColor
+
+        def slow_convert(*args):
+            entered.set()
+            release.wait(5)
+            return convert(*args)
+
+        monkeypatch.setattr(battle_recorder.cv2, 'cvtColor', slow_convert)
+        recorder = BattleRecorder(tmp_path / "frames", mode=BattleRecorder.MODE_PNG, queue_size=2)
+        assert recorder.start()
+
+        recorder.write_frame(_solid_surface((1, 1, 1)))
+        assert entered.wait(5)  # Encoder holds frame 0
+        for _ in range(5):
+            recorder.write_frame(_solid_surface((2, 2, 2)))
+
+        assert recorder.frames_dropped == 3
+        assert recorder.get_stats()['queue_depth'] == 2
+
+        release.set()
+        recorder.close()
+        stats = recorder.get_stats()
+        assert stats['frames_submitted'] == 6
+        assert stats['frames_written'] == 3
+        assert stats['drop_rate'] == pytest.approx(50.0)
+
+    def test_close_drains_queue(self, tmp_path):
+        """Test that close waits for every queued frame to be encoded"""
+        recorder = BattleRecorder(tmp_path / "frames", mode=BattleRecorder.MODE_PNG, queue_size=50)
+        assert recorder.start()
+        for _ in range(20):
+            recorder.write_frame(_solid_surface((0, 0, 255)))
+        recorder.close()
+
+        assert recorder.frames_written == 20
+        assert recorder.get_stats()['queue_depth'] == 0
+        assert len(list((tmp_path / "frames").iterdir())) == 20
+
+    def test_video_writer_open_failure_stops_encoding(self, tmp_path, monkeypatch):
+        """Test that a VideoWriter that fails to open is released and no frames are written"""
+        FakeVideoWriter.instances = []
+        monkeypatch.setattr(battle_recorder.cv2, 'VideoWriter', FakeVideoWriter)
+        recorder = BattleRecorder(tmp_path / "battle.mp4", mode=BattleRecorder.MODE_VIDEO)
+        assert recorder.start()
+        for _ in range(3):
+            recorder.write_frame(_solid_surface((0, 255, 0)))
+        recorder.close()
+
+        assert len(FakeVideoWriter.instances) == 1
+        writer = FakeVideoWriter.instances[0]
+        assert writer.released
+        assert writer.writes == 0
+        assert recorder.frames_written == 0
+        assert recorder.encode_errors == 1
+        assert recorder.get_stats()['failed']
@@ -0,0 +1,53 @@
+"""
+Unit tests for the font service
+"""
+
+from unittest.mock import patch
+import pygame
+import pytest
+
+from src.services import font_service
+from src.services.font_service import FontService
+
+
+@pytest.fixture(autouse=True)
+def pygame_font():
+    pygame.font.init()
+    yield
+
+
+class TestFontService:
+    """Test FontService functionality"""
+
+    def test_stored_path_skips_probing(self, tmp_path):
+        """Test that a valid stored font path is used without probing candidates"""
+        stored = tmp_path / "font.ttf"
+        stored.write_bytes(b"")
+
+        with patch.object(font_service.settings_manager, 'get_setting', return_value=str(stored)), \
+             patch.object(FontService, '_probe_font_path') as mock_probe:
+            service = FontService()
+            assert service.resolve_font_path() == str(stored)
+            mock_probe.assert_not_called()
+
+    def test_probed_path_is_persisted(self):
+        """Test that a newly found font path is saved to user settings"""
+        with patch.object(font_service.settings_manager, 'get_setting', return_value=''), \
+             patch.object(font_service.settings_manager, 'set_setting') as mock_set, \
+             patch.object(FontService, '_probe_font_path', return_value='/fonts/found.ttc'):
+            service = FontService()
+            assert service.resolve_font_path() == '/fonts/found.ttc'
+            service.resolve_font_path()
+            mock_set.assert_called_once_with('font_path', '/fonts/found.ttc')
+
+    def test_prewarm_opens_each_size_once(self):
+        """Test that pre-warmed sizes are reused by get_font"""
+        with patch.object(font_service.settings_manager, 'get_setting', return_value=''), \
+             patch.object(FontService, '_probe_font_path', return_value=None):
+            service = FontService()
+            assert service.prewarm([20, 36, 36, 20]) == 2
+            assert service.cached_sizes() == [20, 36]
+
+            font = service.get_font(36)
+            assert service.get_font(36) is font
+            assert service.prewarm([36]) == 0
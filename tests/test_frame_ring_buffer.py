@@ -0,0 +1,135 @@
+"""
+Unit tests for the shared-memory frame ring buffer
+"""
+
+import os
+import pytest
+import pygame
+
+from src.services.frame_ring_buffer import (
+    SharedMemoryFrameSink, SharedMemoryFrameReader, acquire_frame_sink, release_frame_sink
+)
+
+
+@pytest.fixture
+def shm_name():
+    """Unique shared memory name per test"""
+    return f"oekaki_test_{os.getpid()}"
+
+
+def _solid_surface(color, size=(8, 4)):
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    return surface
+
+
+class TestSharedMemoryFrameRing:
+    """Test SharedMemoryFrameSink / SharedMemoryFrameReader"""
+
+    def test_write_and_read_latest(self, shm_name):
+        """Test that the latest frame is readable with its header"""
+        sink = SharedMemoryFrameSink(shm_name, slot_count=3)
+        try:
+            sink.write_frame(_solid_surface((255, 0, 0)))
+            sink.write_frame(_solid_surface((0, 255, 0)))
+
+            reader = SharedMemoryFrameReader(shm_name, untrack=False)
+            try:
+                index, width, height, pixels = reader.read_frame()
+                assert index == 1
+                assert (width, height) == (8, 4)
+                assert len(pixels) == 8 * 4 * 3
+                assert bytes(pixels[:3]) == b"\x00\xff\x00"
+                del pixels
+            finally:
+                reader.close()
+        finally:
+            sink.close()
+
+    def test_overwritten_frame_is_unavailable(self, shm_name):
+        """Test that frames older than the ring size are reported as gone"""
+        sink = SharedMemoryFrameSink(shm_name, slot_count=2)
+        try:
+            for value in range(3):
+                sink.write_frame(_solid_surface((value, value, value)))
+
+            reader = SharedMemoryFrameReader(shm_name, untrack=False)
+            try:
+                assert reader.latest_index() == 2
+                assert reader.read_frame(0) is None
+                assert not reader.is_valid(0)
+                assert reader.is_valid(1)
+            finally:
+                reader.close()
+        finally:
+            sink.close()
+
+    def test_oversized_frame_skipped(self, shm_name):
+        """Test that frames larger than the slot capacity are skipped"""
+        sink = SharedMemoryFrameSink(shm_name, max_size=(4, 4))
+        try:
+            sink.write_frame(_solid_surface((1, 2, 3), size=(8, 8)))
+            assert sink.frames_skipped == 1
+            assert sink.frame_index == 0
+        finally:
+            sink.close()
+
+    def test_live_block_is_not_replaced(self, shm_name):
+        """Test that a second sink in the same process does not unlink a block that is in use"""
+        sink = SharedMemoryFrameSink(shm_name)
+        other = SharedMemoryFrameSink(shm_name)
+        try:
+            sink.write_frame(_solid_surface((9, 9, 9)))
+            reader = SharedMemoryFrameReader(shm_name, untrack=False)
+            try:
+                with pytest.raises(FileExistsError):
+                    other.write_frame(_solid_surface((1, 1, 1)))
+                sink.write_frame(_solid_surface((7, 7, 7)))
+                assert reader.latest_index() == 1
+            finally:
+                reader.close()
+        finally:
+            other.close()
+            sink.close()
+
+
+class TestSharedFrameSinks:
+    """Test the process-wide sinks shared by battle engines"""
+
+    def test_engines_share_one_block(self, shm_name):
+        """Test that engines publishing to one name share the block until the last one releases it"""
+        from src.services.battle_engine import BattleEngine
+
+        main_engine = BattleEngine()
+        story_engine = BattleEngine()
+        main_engine.enable_shared_memory_output(shm_name)
+        story_engine.enable_shared_memory_output(shm_name)
+        try:
+            assert story_engine.shared_frame_sink is main_engine.shared_frame_sink
+            main_engine.shared_frame_sink.write_frame(_solid_surface((3, 3, 3)))
+            reader = SharedMemoryFrameReader(shm_name, untrack=False)
+            try:
+                story_engine.disable_shared_memory_output()
+                main_engine.shared_frame_sink.write_frame(_solid_surface((4, 4, 4)))
+                assert reader.latest_index() == 1
+            finally:
+                reader.close()
+        finally:
+            story_engine.disable_shared_memory_output()
+            main_engine.disable_shared_memory_output()
+
+        with pytest.raises(FileNotFoundError):
+            SharedMemoryFrameReader(shm_name, untrack=False)
+
+    def test_last_release_drops_the_sink(self, shm_name):
+        """Test that a name gets a new sink once every holder has released the old one"""
+        sink = acquire_frame_sink(shm_name)
+        assert acquire_frame_sink(shm_name) is sink
+        release_frame_sink(sink)
+        release_frame_sink(sink)
+
+        new_sink = acquire_frame_sink(shm_name)
+        try:
+            assert new_sink is not sink
+        finally:
+            release_frame_sink(new_sink)
@@ -0,0 +1,99 @@
+"""
+Unit tests for the streaming GAS upload (against a local HTTP server)
+"""
+
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from config.settings import Settings
+from src.services.gas_upload import Base64JsonBody, prepare_upload_image
+from src.services.sheets_manager import SheetsManager
+
+
+class _Handler(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        _Handler.received.append((self.headers.get('Transfer-Encoding'), self.rfile.read(length)))
+        body = json.dumps({'ok': True, 'url': 'https://drive.google.com/uc?id=uploaded'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.received = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestGasUpload:
+    """Test streaming upload helpers"""
+
+    @pytest.mark.parametrize('size', [0, 1, 2, 3, 1000, 4097])
+    def test_streamed_body_matches_json_payload(self, tmp_path, size):
+        """Test that the streamed body and its length equal the in-memory JSON payload"""
+        data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+        path = tmp_path / "image.png"
+        path.write_bytes(data)
+        fields = {'secret': 's', 'mimeType': 'image/png', 'filename': 'キャラ.png'}
+
+        body = Base64JsonBody(fields, path, chunk_size=30)
+        streamed = b''.join(body)
+
+        expected = dict(fields, image=base64.b64encode(data).decode())
+        assert json.loads(streamed) == expected
+        assert len(streamed) == len(body) == body.bytes_sent
+
+    def test_large_image_is_downscaled(self, tmp_path):
+        """Test that images over the upload size are re-encoded and small ones are sent as is"""
+        large = tmp_path / "large.jpg"
+        Image.new('RGB', (3000, 2000), (200, 50, 50)).save(large, quality=95)
+        small = tmp_path / "small.png"
+        Image.new('RGBA', (200, 200)).save(small)
+
+        upload_path, mime_type, is_temp = prepare_upload_image(str(large), 1000)
+        with Image.open(upload_path) as img:
+            assert max(img.size) == 1000
+        assert mime_type == 'image/jpeg'
+        assert is_temp
+        upload_path.unlink()
+
+        assert prepare_upload_image(str(small), 1000) == (small, 'image/png', False)
+
+    def test_sheets_manager_streams_upload(self, server, tmp_path):
+        """Test that upload_to_drive_via_gas sends a Content-Length body and records throughput"""
+        image = tmp_path / "sprite.png"
+        Image.new('RGBA', (64, 64), (0, 0, 255, 255)).save(image)
+        with patch.object(SheetsManager, '_initialize_client'):
+            manager = SheetsManager()
+
+        with patch.object(Settings, 'GAS_WEBHOOK_URL', server):
+            url = manager.upload_to_drive_via_gas(str(image))
+
+        assert url == 'https://drive.google.com/uc?id=uploaded'
+        transfer_encoding, raw = _Handler.received[0]
+        assert transfer_encoding is None
+        payload = json.loads(raw)
+        assert base64.b64decode(payload['image']) == image.read_bytes()
+        assert payload['filename'] == 'sprite.png'
+        stats = manager.get_upload_stats()
+        assert stats['uploads'] == 1
+        assert stats['bytes_sent'] == len(raw)
+        assert stats['last_throughput'] > 0
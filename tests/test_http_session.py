@@ -0,0 +1,71 @@
+"""
+Unit tests for the pooled HTTP session (against a local HTTP server)
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.services.http_session import PooledHttpSession
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive
+    connections = set()
+    failures_left = 0
+
+    def do_GET(self):
+        _Handler.connections.add(self.client_address)
+        if _Handler.failures_left > 0:
+            _Handler.failures_left -= 1
+            status, body = 503, b'busy'
+        else:
+            status, body = 200, b'sprite-bytes'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.connections = set()
+    _Handler.failures_left = 0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestPooledHttpSession:
+    """Test PooledHttpSession functionality"""
+
+    def test_connection_is_reused(self, server):
+        """Test that sequential downloads share one keep-alive connection"""
+        http = PooledHttpSession(timeout=(2, 2), retries=0)
+        for _ in range(3):
+            assert http.get(f"{server}/sprite.png").content == b'sprite-bytes'
+        http.close()
+
+        assert len(_Handler.connections) == 1
+        metrics = http.get_metrics()[server.split('//')[1]]
+        assert metrics['requests'] == 3
+        assert metrics['errors'] == 0
+        assert metrics['avg_latency'] > 0
+
+    def test_get_retries_server_errors(self, server):
+        """Test that 5xx responses to GET are retried by the adapter"""
+        _Handler.failures_left = 1
+        http = PooledHttpSession(timeout=(2, 2), retries=2)
+
+        response = http.get(f"{server}/sprite.png")
+        http.close()
+
+        assert response.status_code == 200
+        assert _Handler.failures_left == 0
@@ -0,0 +1,106 @@
+"""
+Unit tests for the content-addressed image cache (against a local HTTP server)
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.services.image_cache import ImageCache
+
+PNG_A = b'\x89PNG\r\n\x1a\n' + b'A' * 100
+PNG_B = b'\x89PNG\r\n\x1a\n' + b'B' * 100
+
+
+class _Handler(BaseHTTPRequestHandler):
+    files = {}
+    requests = []
+
+    def do_GET(self):
+        _Handler.requests.append((self.path, self.headers.get('If-None-Match')))
+        body = _Handler.files.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        etag = f'"{len(body)}-{body[-1]}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.files = {'/a.png': PNG_A, '/a-copy.png': PNG_A, '/b.png': PNG_B}
+    _Handler.requests = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestImageCache:
+    """Test ImageCache functionality"""
+
+    def test_each_url_downloaded_once_and_blobs_shared(self, server, tmp_path):
+        """Test that repeated lookups hit the cache and identical content is stored once"""
+        cache = ImageCache(cache_dir=tmp_path, max_bytes=10 ** 6, revalidate_after=3600)
+
+        first = cache.resolve(f"{server}/a.png")
+        assert cache.resolve(f"{server}/a.png") == first
+        assert cache.resolve(f"{server}/a-copy.png") == first
+        assert first.endswith('.png')
+
+        stats = cache.get_stats()
+        assert len(_Handler.requests) == 2
+        assert stats['hits'] == 1
+        assert stats['blobs'] == 1
+        assert stats['urls'] == 2
+
+    def test_stale_entry_is_revalidated(self, server, tmp_path):
+        """Test that stale entries use a conditional request and keep the cached blob on 304"""
+        cache = ImageCache(cache_dir=tmp_path, max_bytes=10 ** 6, revalidate_after=0)
+
+        path = cache.resolve(f"{server}/a.png")
+        assert cache.resolve(f"{server}/a.png") == path
+
+        assert _Handler.requests[1][1] is not None  # If-None-Match sent
+        assert cache.get_stats()['not_modified'] == 1
+
+    def test_lru_eviction(self, server, tmp_path):
+        """Test that the least recently used image is evicted when over the size limit"""
+        cache = ImageCache(cache_dir=tmp_path, max_bytes=len(PNG_A) + 10, revalidate_after=3600)
+
+        a_path = cache.resolve(f"{server}/a.png")
+        cache.resolve(f"{server}/b.png")
+
+        assert not cache.contains(f"{server}/a.png")
+        assert cache.contains(f"{server}/b.png")
+        assert cache.get_stats()['evictions'] == 1
+        assert not (tmp_path / a_path).exists()
+
+    def test_index_survives_restart(self, server, tmp_path):
+        """Test that a new cache instance reuses the stored index and put_file entries"""
+        sprite = tmp_path / "sprite.png"
+        sprite.write_bytes(PNG_B)
+        cache = ImageCache(cache_dir=tmp_path / "cache", revalidate_after=3600)
+        cache.resolve(f"{server}/a.png")
+        cache.put_file("https://drive.google.com/uc?id=uploaded", str(sprite))
+
+        reopened = ImageCache(cache_dir=tmp_path / "cache", revalidate_after=3600)
+        assert reopened.contains(f"{server}/a.png")
+        assert reopened.resolve("https://drive.google.com/uc?id=uploaded").endswith('.png')
+        assert len(_Handler.requests) == 1
@@ -0,0 +1,232 @@
+"""
+Tests for the single-thread SheetsManager actor
+"""
+
+import threading
+
+import pytest
+
+from src.services.sheets_actor import SheetsActor
+
+
+class FakeManager:
+    """Stand-in for SheetsManager that records which thread ran each call"""
+
+    def __init__(self):
+        self.online_mode = True
+        self.calls = []
+        self.threads = set()
+        self.release = threading.Event()
+        self.release.set()
+        self.entered = threading.Event()
+        self.step_entered = threading.Event()
+        self.step_gate = threading.Event()
+        self.step_gate.set()
+        self.finish_gate = threading.Event()
+        self.finish_gate.set()
+
+    def get_all_characters(self):
+        self.entered.set()
+        self.release.wait(5)
+        self.calls.append('get_all_characters')
+        self.threads.add(threading.current_thread().name)
+        return ['character']
+
+    def get_character(self, char_id):
+        self.calls.append(('get_character', char_id))
+        self.threads.add(threading.current_thread().name)
+        return {'id': char_id}
+
+    def apply_stat_increments(self, increments):
+        self.calls.append('apply_stat_increments')
+        return list(increments), []
+
+    def update_rankings(self):
+        self.calls.append('update_rankings')
+        self.threads.add(threading.current_thread().name)
+        return True
+
+    def iter_update_rankings(self):
+        """Stepwise update_rankings: each of its two steps waits for its own gate"""
+        self.step_entered.set()
+        self.step_gate.wait(5)
+        self.calls.append('update_rankings')
+        self.threads.add(threading.current_thread().name)
+        yield
+        self.finish_gate.wait(5)
+        self.threads.add(threading.current_thread().name)
+        return True
+
+    def _on_mirror_pull(self, title):
+        self.calls.append(('_on_mirror_pull', title))
+        self.threads.add(threading.current_thread().name)
+
+    def fail(self):
+        raise ValueError("sheet unavailable")
+
+    def close(self):
+        self.calls.append('close')
+
+
+class FakeMirror:
+    """Mirror stand-in that keeps its pull listeners"""
+
+    def __init__(self):
+        self.listeners = []
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self.listeners.remove(callback)
+
+
+@pytest.fixture
+def actor():
+    actor = SheetsActor(FakeManager())
+    yield actor
+    actor.stop()
+
+
+class TestSheetsActor:
+    """Test SheetsActor"""
+
+    def test_method_calls_run_on_io_thread(self, actor):
+        """Test that proxied calls return the manager's result from the actor thread"""
+        assert actor.get_character('3') == {'id': '3'}
+        assert actor.update_rankings() is True
+        assert actor.manager.threads == {'SheetsActor'}
+
+    def test_attributes_are_forwarded(self, actor):
+        """Test that non-method attributes are read straight from the manager"""
+        assert actor.online_mode is True
+
+    def test_concurrent_identical_reads_share_one_call(self, actor):
+        """Test that reads queued while the same read is running share its result"""
+        manager = actor.manager
+        manager.release.clear()
+        first = actor.submit('get_all_characters')
+        assert manager.entered.wait(5)
+
+        others = [actor.submit('get_all_characters') for _ in range(3)]
+        manager.release.set()
+
+        assert first.result(5) == ['character']
+        assert all(future.result(5) == ['character'] for future in others)
+        assert manager.calls == ['get_all_characters']
+        assert actor.get_stats()['merged'] == 3
+
+    def test_merged_callers_get_copies(self, actor):
+        """Test that a caller mutating a merged result does not change what the others see"""
+        manager = actor.manager
+        manager.release.clear()
+        first = actor.submit('get_all_characters')
+        assert manager.entered.wait(5)
+        second = actor.submit('get_all_characters')
+        manager.release.set()
+
+        first.result(5).append('mutated')
+        assert second.result(5) == ['character']
+        assert second.result(5) is not first.result(5)
+
+    def test_foreground_calls_run_before_background(self, actor):
+        """Test that a UI read queued after a background job runs before it"""
+        manager = actor.manager
+        manager.release.clear()
+        running = actor.submit('get_all_characters')
+        assert manager.entered.wait(5)
+        flush = actor.submit_background('apply_stat_increments', {'1': {'wins': 1}})
+        read = actor.submit('get_character', '2')
+        manager.release.set()
+
+        assert read.result(5) == {'id': '2'}
+        assert flush.result(5) == (['1'], [])
+        running.result(5)
+        assert manager.calls == ['get_all_characters', ('get_character', '2'), 'apply_stat_increments']
+
+    def test_foreground_call_runs_while_background_job_is_running(self, actor):
+        """Test that a foreground call submitted during a stepped background job runs between its steps"""
+        manager = actor.manager
+        manager.step_gate.clear()
+        manager.finish_gate.clear()
+        job = actor.submit_background('update_rankings')
+        assert manager.step_entered.wait(5)
+
+        read = actor.submit('get_character', '2')
+        manager.step_gate.set()
+        assert read.result(5) == {'id': '2'}
+        assert not job.done()
+
+        manager.finish_gate.set()
+        assert job.result(5) is True
+        assert manager.calls == ['update_rankings', ('get_character', '2')]
+        assert manager.threads == {'SheetsActor'}
+
+    def test_close_runs_after_stepped_jobs(self, actor):
+        """Test that close waits for every step of a queued job"""
+        job = actor.submit_background('update_rankings')
+        actor.close()
+        assert job.result(0) is True
+        assert actor.manager.calls == ['update_rankings', 'close']
+
+    def test_background_proxy_blocks_for_result(self, actor):
+        """Test that calls through the background proxy return the manager's result"""
+        assert actor.background.apply_stat_increments({'4': {'wins': 1}}) == (['4'], [])
+        assert actor.background.online_mode is True
+
+    def test_write_orders_later_reads(self, actor):
+        """Test that a read submitted after a write is not merged into an earlier read"""
+        manager = actor.manager
+        manager.release.clear()
+        before = actor.submit('get_all_characters')
+        assert manager.entered.wait(5)
+        write = actor.submit('update_rankings')
+        after = actor.submit('get_all_characters')
+        manager.release.set()
+
+        assert after is not before
+        after.result(5)
+        assert write.result(5) is True
+        assert manager.calls == ['get_all_characters', 'update_rankings', 'get_all_characters']
+
+    def test_reads_with_different_arguments_are_not_merged(self, actor):
+        """Test that the merge key includes the call arguments"""
+        assert actor.submit('get_character', '1') is not actor.submit('get_character', '2')
+
+    def test_exception_is_raised_to_caller(self, actor):
+        """Test that a failing call raises in the caller and is counted"""
+        with pytest.raises(ValueError):
+            actor.fail()
+        assert actor.get_stats()['failures'] == 1
+
+    def test_call_without_thread_runs_directly(self):
+        """Test that calls work before the I/O thread is started"""
+        actor = SheetsActor(FakeManager(), autostart=False)
+        assert actor.get_character('1') == {'id': '1'}
+        assert actor.manager.threads == {threading.current_thread().name}
+
+    def test_close_drains_queue(self, actor):
+        """Test that close runs queued calls, closes the manager and stops the thread"""
+        future = actor.submit('update_rankings')
+        actor.close()
+        assert future.result(0) is True
+        assert actor.manager.calls[-1] == 'close'
+        assert actor._thread is None
+
+    def test_mirror_pulls_are_handled_on_io_thread(self):
+        """Test that the mirror listener is re-registered to invalidate caches on the actor thread"""
+        manager = FakeManager()
+        manager.mirror = FakeMirror()
+        manager.mirror.add_listener(manager._on_mirror_pull)
+        actor = SheetsActor(manager)
+        try:
+            assert manager.mirror.listeners == [actor._mirror_pulled]
+            sync_thread = threading.Thread(target=manager.mirror.listeners[0], args=("Characters",), name="SheetsMirror")
+            sync_thread.start()
+            sync_thread.join()
+            actor.submit('get_character', '1').result(5)
+        finally:
+            actor.stop()
+
+        assert manager.calls == [('_on_mirror_pull', 'Characters'), ('get_character', '1')]
+        assert manager.threads == {'SheetsActor'}
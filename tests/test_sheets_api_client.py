@@ -0,0 +1,161 @@
+"""
+Unit tests for the quota-aware Sheets API client
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from src.services.sheets_api_client import SheetsApiClient, TokenBucket
+
+
+class QuotaError(Exception):
+    """Stand-in for gspread.exceptions.APIError"""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = SimpleNamespace(status_code=status_code)
+
+
+class FakeWorksheet:
+    """Local worksheet that fails with the given errors before answering"""
+
+    def __init__(self, records=None, errors=None):
+        self.id = 1
+        self.title = 'Characters'
+        self.records = records or []
+        self.errors = list(errors or [])
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_all_records(self):
+        self.calls += 1
+        self.release.wait(5)
+        if self.errors:
+            raise self.errors.pop(0)
+        return list(self.records)
+
+    def update_cell(self, row, col, value):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'updatedCells': 1}
+
+
+class FakeClock:
+    """Manual clock advanced by the injected sleep function"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestTokenBucket:
+    """Test TokenBucket rate limiting"""
+
+    def test_waits_when_budget_is_used_up(self, clock):
+        """Test that calls beyond the burst wait for tokens at the per-minute rate"""
+        bucket = TokenBucket(60, capacity=2, clock=clock.time, sleep=clock.sleep)
+
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(1.0)
+        assert clock.now == pytest.approx(1.0)
+
+
+class TestSheetsApiClient:
+    """Test SheetsApiClient retries, coalescing and metrics"""
+
+    def test_quota_errors_are_retried_with_backoff(self, clock):
+        """Test that 429 responses are retried and counted"""
+        client = SheetsApiClient(max_retries=3, clock=clock.time, sleep=clock.sleep)
+        ws = client.wrap_worksheet(FakeWorksheet(records=[{'ID': 1}], errors=[QuotaError(429), QuotaError(503)]))
+
+        assert ws.get_all_records() == [{'ID': 1}]
+
+        metrics = client.get_metrics()['Worksheet.get_all_records']
+        assert metrics['calls'] == 3
+        assert metrics['retries'] == 2
+        assert metrics['errors'] == 0
+        assert len(clock.sleeps) == 2
+        assert clock.sleeps[1] <= 2.0  # base_delay * 2 ** 1
+
+    def test_non_retryable_errors_are_raised(self, clock):
+        """Test that client errors fail immediately"""
+        client = SheetsApiClient(clock=clock.time, sleep=clock.sleep)
+        fake = FakeWorksheet(errors=[QuotaError(400)])
+        ws = client.wrap_worksheet(fake)
+
+        with pytest.raises(QuotaError):
+            ws.update_cell(2, 4, 'url')
+        assert fake.calls == 1
+        assert client.get_metrics()['Worksheet.update_cell']['errors'] == 1
+
+    def test_writes_are_not_retried_after_send(self, clock):
+        """Test that writes are only retried when they can't have been applied"""
+        client = SheetsApiClient(max_retries=3, clock=clock.time, sleep=clock.sleep)
+        for error in (QuotaError(503), requests.exceptions.ReadTimeout("read timed out"),
+                      requests.exceptions.ConnectionError("connection reset")):
+            fake = FakeWorksheet(errors=[error])
+            with pytest.raises(type(error)):
+                client.wrap_worksheet(fake).update_cell(2, 4, 'url')
+            assert fake.calls == 1
+
+        refused = requests.exceptions.ConnectionError(MaxRetryError(None, '/', NewConnectionError(None, "refused")))
+        fake = FakeWorksheet(errors=[QuotaError(429), requests.exceptions.ConnectTimeout("connect"), refused])
+        assert client.wrap_worksheet(fake).update_cell(2, 4, 'url') == {'updatedCells': 1}
+        assert fake.calls == 4
+
+    def test_reads_are_retried_on_timeouts(self, clock):
+        """Test that reads are retried on timeouts and server errors"""
+        client = SheetsApiClient(max_retries=3, clock=clock.time, sleep=clock.sleep)
+        fake = FakeWorksheet(records=[{'ID': 1}], errors=[requests.exceptions.ReadTimeout("read timed out"),
+                                                          QuotaError(500)])
+        assert client.wrap_worksheet(fake).get_all_records() == [{'ID': 1}]
+        assert fake.calls == 3
+
+    def test_identical_reads_in_flight_are_coalesced(self):
+        """Test that concurrent identical reads share one request"""
+        client = SheetsApiClient()
+        fake = FakeWorksheet(records=[{'ID': 1}])
+        fake.release.clear()
+        ws = client.wrap_worksheet(fake)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(ws.get_all_records())) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(500):
+            if client.get_metrics().get('Worksheet.get_all_records', {}).get('coalesced', 0) == 3:
+                break
+            threading.Event().wait(0.01)
+        fake.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert fake.calls == 1
+        assert results == [[{'ID': 1}]] * 4
+
+    def test_attributes_pass_through(self):
+        """Test that non-API attributes are read from the wrapped worksheet"""
+        client = SheetsApiClient()
+        ws = client.wrap_worksheet(FakeWorksheet())
+
+        assert ws.title == 'Characters'
+        assert client.wrap_worksheet(ws) is ws
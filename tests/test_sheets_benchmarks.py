@@ -0,0 +1,123 @@
+"""
+API call benchmarks for the Google Sheets backend
+SheetsManager runs against an in-memory spreadsheet; each test reports the calls
+and payload bytes of one operation (run with -s to see the report) and fails if
+the call count grows past its budget
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from config.settings import Settings
+from src.models import Battle, Character
+from src.services.battle_log_store import BattleLogStore
+from src.services.endless_battle_engine import EndlessBattleEngine
+from src.services.sheets_backend import ApiCallRecorder, InMemorySpreadsheet
+from src.services.sheets_manager import SheetsManager
+from src.services.sheets_write_queue import SheetsWriteQueue
+
+CHARACTER_COUNT = 20
+
+
+def seed_spreadsheet() -> InMemorySpreadsheet:
+    """Spreadsheet with CHARACTER_COUNT characters (all with endless access) and some history"""
+    characters = [SheetsManager.CHARACTER_HEADERS] + [
+        [i, f"Fighter{i}", '', '', 100, 60, 50, 50, 40, 50, '', '2025-01-01T00:00:00', 0, 0, 0]
+        for i in range(1, CHARACTER_COUNT + 1)
+    ]
+    history = [SheetsManager.BATTLE_HISTORY_HEADERS] + [
+        [i, '2025-01-01 00:00:00', 1, 'Fighter1', 2, 'Fighter2', 1, 'Fighter1', 10, 5.0, 30, 0, 100, 70, 'KO']
+        for i in range(1, 51)
+    ]
+    progress = [SheetsManager.STORY_PROGRESS_HEADERS] + [
+        [i, 5, 'TRUE', 'TRUE', 5, 5, '2025-01-01T00:00:00'] for i in range(1, CHARACTER_COUNT + 1)
+    ]
+    return InMemorySpreadsheet({
+        Settings.WORKSHEET_NAME: characters,
+        Settings.BATTLE_HISTORY_SHEET: history,
+        Settings.RANKING_SHEET: [SheetsManager.RANKING_HEADERS],
+        'StoryBosses': [SheetsManager.STORY_BOSS_HEADERS],
+        'StoryProgress': progress
+    })
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    """SheetsManager on an in-memory spreadsheet, with the recorder reset after startup"""
+    monkeypatch.setattr(Settings, 'SHEETS_READS_PER_MINUTE', 1e6)
+    monkeypatch.setattr(Settings, 'SHEETS_WRITES_PER_MINUTE', 1e6)
+    monkeypatch.setattr(Settings, 'GAS_WEBHOOK_URL', None)
+    recorder = ApiCallRecorder()
+    manager = SheetsManager(spreadsheet=recorder.wrap(seed_spreadsheet()))
+    manager.battle_logs = BattleLogStore(tmp_path / "battle_logs")
+    queue = SheetsWriteQueue(manager, persist_path=tmp_path / "pending.json", autostart=False)
+    startup = recorder.get_stats()
+    recorder.reset()
+    return manager, queue, recorder, startup
+
+
+def battle_data(battle: Battle) -> dict:
+    return {
+        'battle_id': battle.id, 'fighter1_id': battle.character1_id, 'fighter2_id': battle.character2_id,
+        'fighter1_name': f"Fighter{battle.character1_id}", 'fighter2_name': f"Fighter{battle.character2_id}",
+        'winner_id': battle.winner_id, 'winner_name': f"Fighter{battle.winner_id}", 'total_turns': 8,
+        'duration': 4.2, 'f1_final_hp': 20, 'f2_final_hp': 0, 'f1_damage_dealt': 100, 'f2_damage_dealt': 80,
+        'result_type': 'KO', 'battle_log': ['Fighter attacks!'] * 20
+    }
+
+
+def report(recorder: ApiCallRecorder, title: str) -> int:
+    print('\n' + recorder.format_report(title))
+    return recorder.total_calls
+
+
+class TestApiCallBudgets:
+    """Sheets API calls per user-facing operation"""
+
+    def test_startup(self, backend):
+        """Test that startup reads all worksheets in one batch read"""
+        manager, _, _, startup = backend
+        assert manager.online_mode
+        assert startup['operations']['Spreadsheet.values_batch_get']['calls'] == 1
+        assert startup['calls'] <= 2
+
+    def test_calls_per_battle(self, backend):
+        """Test the calls one queued battle result costs when flushed"""
+        manager, queue, recorder, _ = backend
+        manager.get_all_characters()
+        recorder.reset()
+
+        battle = Battle(character1_id='1', character2_id='2', winner_id='1')
+        queue.enqueue_battle(battle, battle_data(battle))
+        assert queue.flush()
+
+        assert report(recorder, "Per battle") <= 4
+        assert manager.battle_history_sheet.col_values(1)[-1] == '51'
+
+    def test_calls_per_character_registration(self, backend):
+        """Test the calls registering one character (no images) costs"""
+        manager, _, recorder, _ = backend
+
+        character = Character(name='Newcomer', hp=100, attack=50, defense=50, speed=50, magic=50,
+                              image_path='')
+        assert manager.save_character(character)
+
+        assert report(recorder, "Per character registration") <= 2
+        assert manager.worksheet.col_values(2)[-1] == 'Newcomer'
+
+    def test_calls_per_endless_cycle(self, backend):
+        """Test the calls of one endless cycle (new character poll, battle, result flush)"""
+        manager, queue, recorder, _ = backend
+        battle_engine = MagicMock()
+        battle_engine.start_battle.side_effect = lambda f1, f2, visual_mode=False: Battle(
+            character1_id=f1.id, character2_id=f2.id, winner_id=f1.id)
+        engine = EndlessBattleEngine(manager, battle_engine)
+        assert engine.start_endless_battle()['status'] == 'started'
+        recorder.reset()
+
+        result = engine.run_next_battle()
+        assert result['status'] == 'battle_complete'
+        queue.enqueue_battle(result['battle'], battle_data(result['battle']))
+        assert queue.flush()
+
+        assert report(recorder, "Per endless cycle") <= 7
@@ -0,0 +1,762 @@
+"""
+Unit tests for SheetsManager (Google Sheets backend) without network access
+"""
+
+import re
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+
+from src.models import Battle, Character
+from src.services.sheets_manager import SheetsManager
+from src.services.battle_log_store import BattleLogStore
+from src.services.image_cache import ImageCache
+
+
+@pytest.fixture
+def sheets_manager(tmp_path):
+    """SheetsManager with mocked worksheets (no Google API connection)"""
+    with patch.object(SheetsManager, '_initialize_client'):
+        manager = SheetsManager()
+    manager.battle_logs = BattleLogStore(tmp_path / "battle_logs")
+    manager.online_mode = True
+    manager.worksheet = MagicMock()
+    manager.battle_history_sheet = MagicMock()
+    manager.ranking_sheet = MagicMock()
+    return manager
+
+
+def history_values(*battles):
+    """BattleHistory columns A:O as returned by worksheet.get() for (id, f1, f2, f1 damage, f2 damage) tuples"""
+    headers = SheetsManager.BATTLE_HISTORY_HEADERS[:15]
+    rows = []
+    for battle_id, f1_id, f2_id, f1_damage, f2_damage in battles:
+        row = dict.fromkeys(headers, '')
+        row.update({'Battle ID': battle_id, 'Fighter 1 ID': f1_id, 'Fighter 2 ID': f2_id,
+                    'F1 Damage Dealt': f1_damage, 'F2 Damage Dealt': f2_damage})
+        rows.append([str(row[header]) for header in headers])
+    return [headers] + rows
+
+
+class TestDamageAggregates:
+    """Test average damage calculation for rankings"""
+
+    def test_single_history_read_for_all_characters(self, sheets_manager):
+        """Test that damage averages for every character come from one history read"""
+        sheets_manager.battle_history_sheet.get.return_value = history_values(
+            (1, 1, 2, 40, 20),
+            (2, 2, 3, 30, 10),
+            (3, 1, 3, 50, 0),
+        )
+
+        assert sheets_manager._calculate_avg_damage('1') == 45.0
+        assert sheets_manager._calculate_avg_damage(2) == 25.0
+        assert sheets_manager._calculate_avg_damage('3') == 5.0
+        assert sheets_manager._calculate_avg_damage('99') == 0.0
+        assert sheets_manager.battle_history_sheet.get.call_count == 1
+        sheets_manager.battle_history_sheet.get_all_records.assert_not_called()
+
+    def test_failed_history_read_is_not_repeated_per_character(self, sheets_manager):
+        """Test that a failing history read during a ranking update is attempted only once"""
+        sheets_manager.battle_history_sheet.get.side_effect = RuntimeError("quota exceeded")
+        sheets_manager.ranking_sheet.get.return_value = []
+        characters = [ranked_character(str(i), i, 1) for i in range(1, 6)]
+
+        def steps(*args, **kwargs):
+            yield
+            return characters
+
+        with patch.object(sheets_manager, 'iter_all_characters', side_effect=steps):
+            assert sheets_manager.update_rankings()
+
+        assert sheets_manager.battle_history_sheet.get.call_count == 1
+
+    def test_record_battle_history_updates_aggregates(self, sheets_manager):
+        """Test that appended battles update the cached aggregates incrementally"""
+        sheets_manager.battle_history_sheet.get.return_value = history_values((1, 1, 2, 40, 20))
+        sheets_manager._calculate_avg_damage('1')
+
+        sheets_manager.record_battle_history({
+            'fighter1_id': '1', 'fighter2_id': '2',
+            'f1_damage_dealt': 60, 'f2_damage_dealt': 30
+        })
+
+        assert sheets_manager._calculate_avg_damage('1') == 50.0
+        assert sheets_manager._calculate_avg_damage('2') == 25.0
+
+
+class TestBattleLogs:
+    """Test battle logs kept outside the BattleHistory sheet"""
+
+    def test_log_is_stored_by_battle_id(self, sheets_manager):
+        """Test that new history rows stop at column O and the log is read back from the store"""
+        sheets_manager.battle_history_sheet.col_values.return_value = ['Battle ID', '1']
+
+        assert sheets_manager.record_battle_history({
+            'fighter1_id': '1', 'fighter2_id': '2', 'battle_log': ['Alpha attacks!', 'Beta falls!']
+        })
+
+        row = sheets_manager.battle_history_sheet.append_rows.call_args[0][0][0]
+        assert len(row) == 15
+        assert sheets_manager.get_battle_log(2) == ['Alpha attacks!', 'Beta falls!']
+        sheets_manager.battle_history_sheet.get.assert_not_called()
+
+    def test_legacy_log_fetched_from_column_p_once(self, sheets_manager):
+        """Test that logs of old rows are read from their own cell and then kept locally"""
+        sheets_manager.battle_history_sheet.get.side_effect = lambda range_name: (
+            history_values((1, 1, 2, 0, 0), (2, 2, 1, 0, 0)) if range_name == 'A1:O'
+            else [['turn 1\nturn 2']]
+        )
+
+        assert sheets_manager.get_battle_log(2) == ['turn 1', 'turn 2']
+        assert sheets_manager.get_battle_log(2) == ['turn 1', 'turn 2']
+
+        ranges = [c[0][0] for c in sheets_manager.battle_history_sheet.get.call_args_list]
+        assert ranges == ['A1:O', 'P3']
+
+
+class FakeHistorySheet:
+    """BattleHistory stand-in answering A1 range reads and counting the rows returned"""
+
+    def __init__(self, battle_count):
+        self.rows = history_values(*[(i, 1, 2, i, 0) for i in range(1, battle_count + 1)])
+        self.gets = []
+        self.col_reads = 0
+
+    def col_values(self, col):
+        self.col_reads += 1
+        return [row[col - 1] for row in self.rows]
+
+    def get(self, range_name):
+        self.gets.append(range_name)
+        match = re.match(r'A(\d+):O(\d*)$', range_name)
+        start, end = int(match.group(1)), int(match.group(2) or len(self.rows))
+        return self.rows[start - 1:end]
+
+
+class TestBattleHistoryPages:
+    """Test tail reads and cursor pagination of battle history"""
+
+    @pytest.mark.parametrize('battle_count', [100, 100000])
+    def test_latest_battles_read_only_their_rows(self, sheets_manager, battle_count):
+        """Test that the latest 10 battles cost one 10-row range read regardless of history size"""
+        sheet = FakeHistorySheet(battle_count)
+        sheets_manager.battle_history_sheet = sheet
+        sheets_manager._history_last_row = battle_count + 1
+
+        records = sheets_manager.get_battle_history(limit=10)
+
+        assert [r['Battle ID'] for r in records] == list(range(battle_count - 9, battle_count + 1))
+        assert sheet.gets == [f'A{battle_count - 8}:O']
+        assert sheet.col_reads == 0
+
+    def test_cursor_pages_back_to_first_battle(self, sheets_manager):
+        """Test that following cursors returns every battle once, newest page first"""
+        sheet = FakeHistorySheet(25)
+        sheets_manager.battle_history_sheet = sheet
+
+        pages = []
+        records, cursor = sheets_manager.get_battle_history_page(10)
+        pages.append([r['Battle ID'] for r in records])
+        while cursor:
+            records, cursor = sheets_manager.get_battle_history_page(10, cursor)
+            pages.append([r['Battle ID'] for r in records])
+
+        assert pages == [list(range(16, 26)), list(range(6, 16)), list(range(1, 6))]
+        assert sheet.col_reads == 1
+
+    def test_rows_appended_elsewhere_are_included(self, sheets_manager):
+        """Test that the open-ended tail range picks up rows added by other clients"""
+        sheet = FakeHistorySheet(20)
+        sheets_manager.battle_history_sheet = sheet
+        sheets_manager.get_battle_history(limit=5)
+
+        sheet.rows += history_values((21, 1, 2, 0, 0), (22, 2, 1, 0, 0))[1:]
+        records = sheets_manager.get_battle_history(limit=5)
+
+        assert [r['Battle ID'] for r in records] == [18, 19, 20, 21, 22]
+        assert sheet.col_reads == 1
+
+
+class TestSnapshotCache:
+    """Test worksheet snapshot cache"""
+
+    def _character_record(self, char_id, name):
+        return {
+            'ID': char_id, 'Name': name, 'Image URL': '', 'Sprite URL': '', 'HP': 100,
+            'Attack': 50, 'Defense': 50, 'Speed': 50, 'Magic': 50, 'Luck': 50,
+            'Description': '', 'Created At': '', 'Wins': 0, 'Losses': 0, 'Draws': 0
+        }
+
+    def test_repeated_reads_hit_cache(self, sheets_manager):
+        """Test that lookups within the TTL reuse one sheet download"""
+        sheets_manager.worksheet.get_all_records.return_value = [
+            self._character_record(1, 'Alpha'), self._character_record(2, 'Beta')
+        ]
+
+        assert sheets_manager.get_character(2).name == 'Beta'
+        assert sheets_manager.get_character_by_name('Alpha').id == '1'
+        assert sheets_manager.get_character_count() == 2
+
+        assert sheets_manager.worksheet.get_all_records.call_count == 1
+        stats = sheets_manager.get_cache_stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 1
+
+    def test_own_writes_patch_snapshot(self, sheets_manager):
+        """Test that updates are visible without re-reading the sheet"""
+        sheets_manager.worksheet.get_all_records.return_value = [self._character_record(1, 'Alpha')]
+        sheets_manager.worksheet.get.return_value = [['1', 'Alpha']]
+        character = sheets_manager.get_character(1)
+        character.win_count = 3
+        character.battle_count = 5
+
+        assert sheets_manager.update_character(character)
+        updated = sheets_manager.get_character(1)
+
+        assert updated.win_count == 3
+        assert updated.battle_count == 5
+        assert sheets_manager.worksheet.get_all_records.call_count == 1
+
+    def test_refresh_forces_read(self, sheets_manager):
+        """Test that refresh() drops the snapshot"""
+        sheets_manager.worksheet.get_all_records.return_value = []
+        sheets_manager.get_character_count()
+        sheets_manager.refresh()
+        sheets_manager.get_character_count()
+
+        assert sheets_manager.worksheet.get_all_records.call_count == 2
+
+
+class TestBatchedSheetWrites:
+    """Test the batched SheetsManager operations used by the queue"""
+
+    def test_stat_increments_use_one_batch_update(self, sheets_manager):
+        """Test that increments for several characters become one values_batch_update"""
+        sheets_manager.sheet = MagicMock()
+        sheets_manager.worksheet.title = 'Characters'
+        sheets_manager.worksheet.get.return_value = [['1', 'Alpha'], ['2', 'Beta']]
+        sheets_manager.worksheet.batch_get.return_value = [[['2', '1', '0']], [[]]]
+
+        assert sheets_manager.apply_stat_increments({
+            '1': {'wins': 1, 'losses': 0, 'draws': 0},
+            '2': {'wins': 0, 'losses': 1, 'draws': 0},
+        }) == (['1', '2'], [])
+
+        sheets_manager.worksheet.batch_get.assert_called_once_with(['M2:O2', 'M3:O3'])
+        body = sheets_manager.sheet.values_batch_update.call_args[0][0]
+        assert body['data'] == [
+            {'range': "'Characters'!M2:O2", 'values': [[3, 1, 0]]},
+            {'range': "'Characters'!M3:O3", 'values': [[0, 1, 0]]},
+        ]
+        sheets_manager.worksheet.get_all_records.assert_not_called()
+
+    def test_battle_result_tracks_draws(self, sheets_manager):
+        """Test that a draw adds to Draws of both fighters from the cached snapshot in one write"""
+        sheets_manager.sheet = MagicMock()
+        sheets_manager.worksheet.title = 'Characters'
+        sheets_manager.worksheet.get_all_records.return_value = [
+            {'ID': 1, 'Wins': 2, 'Losses': 1, 'Draws': 0},
+            {'ID': 2, 'Wins': 0, 'Losses': 0, 'Draws': 4},
+        ]
+        sheets_manager.get_character_count()
+
+        assert sheets_manager.save_battle(Battle(character1_id='1', character2_id='2', winner_id=None))
+
+        body = sheets_manager.sheet.values_batch_update.call_args[0][0]
+        assert body['data'] == [
+            {'range': "'Characters'!M2:O2", 'values': [[2, 1, 1]]},
+            {'range': "'Characters'!M3:O3", 'values': [[0, 0, 5]]},
+        ]
+        sheets_manager.sheet.values_batch_update.assert_called_once()
+        sheets_manager.worksheet.batch_get.assert_not_called()
+        assert sheets_manager.worksheet.get_all_records.call_count == 1
+        assert sheets_manager.get_character('2').draw_count == 5
+
+    def test_stats_reread_after_own_write(self, sheets_manager):
+        """Test that a snapshot loaded before our last stats write is not used as the base"""
+        sheets_manager.sheet = MagicMock()
+        sheets_manager.worksheet.title = 'Characters'
+        sheets_manager.worksheet.get_all_records.return_value = [
+            {'ID': 1, 'Wins': 2, 'Losses': 1, 'Draws': 0},
+            {'ID': 2, 'Wins': 0, 'Losses': 0, 'Draws': 4},
+        ]
+        sheets_manager.get_character_count()
+        sheets_manager.save_battle(Battle(character1_id='1', character2_id='2', winner_id='1'))
+
+        # Another client added a win to character 1 meanwhile
+        sheets_manager.worksheet.get.return_value = [['1', 'Alpha'], ['2', 'Beta']]
+        sheets_manager.worksheet.batch_get.return_value = [[['4', '1', '0']], [['0', '1', '4']]]
+        sheets_manager.save_battle(Battle(character1_id='1', character2_id='2', winner_id='1'))
+
+        sheets_manager.worksheet.batch_get.assert_called_once_with(['M2:O2', 'M3:O3'])
+        body = sheets_manager.sheet.values_batch_update.call_args[0][0]
+        assert body['data'][0] == {'range': "'Characters'!M2:O2", 'values': [[5, 1, 0]]}
+
+    def test_battle_result_per_fighter(self, sheets_manager):
+        """Test that a deleted fighter doesn't fail the battle whose other fighter was written"""
+        sheets_manager.sheet = MagicMock()
+        sheets_manager.worksheet.title = 'Characters'
+        sheets_manager.worksheet.get_all_records.return_value = [{'ID': 1, 'Wins': 2, 'Losses': 1, 'Draws': 0}]
+        sheets_manager.get_character_count()
+        battle = Battle(character1_id='1', character2_id='999', winner_id='1')
+
+        assert sheets_manager.apply_battle_result(battle) == {'1': True, '999': False}
+        sheets_manager.worksheet.get.return_value = [['1', 'Alpha']]
+        sheets_manager.worksheet.batch_get.return_value = [[['3', '1', '0']]]
+        assert sheets_manager.save_battle(battle)
+
+        sheets_manager.sheet.values_batch_update.side_effect = Exception("quota")
+        assert sheets_manager.apply_battle_result(battle) == {'1': False, '999': False}
+        assert not sheets_manager.save_battle(battle)
+
+    def test_histories_use_one_append(self, sheets_manager):
+        """Test that several battle histories are appended with sequential IDs in one call"""
+        sheets_manager.battle_history_sheet.col_values.return_value = ['Battle ID', '1']
+
+        assert sheets_manager.record_battle_histories([{'fighter1_id': '1'}, {'fighter1_id': '2'}])
+
+        rows = sheets_manager.battle_history_sheet.append_rows.call_args[0][0]
+        assert [row[0] for row in rows] == [2, 3]
+        sheets_manager.battle_history_sheet.get_all_records.assert_not_called()
+
+
+def ranked_character(char_id, wins, losses):
+    return Character(id=char_id, name=f"Fighter{char_id}", hp=50, attack=50, defense=50, speed=50,
+                     magic=50, image_path='', battle_count=wins + losses, win_count=wins)
+
+
+class TestIncrementalRankings:
+    """Test Rankings updates that write only changed rows"""
+
+    def update(self, sheets_manager, characters):
+        def steps(*args, **kwargs):
+            yield
+            return characters
+
+        with patch.object(sheets_manager, 'iter_all_characters', side_effect=steps), \
+                patch.object(sheets_manager, '_calculate_avg_damage', return_value=0.0):
+            assert sheets_manager.update_rankings()
+
+    def test_only_changed_rows_are_written(self, sheets_manager):
+        """Test that the sheet is never cleared and unchanged ranks are not rewritten"""
+        sheets_manager.ranking_sheet.get.return_value = []
+        characters = [ranked_character('1', 3, 0), ranked_character('2', 2, 1), ranked_character('3', 0, 3)]
+        self.update(sheets_manager, characters)
+
+        first = sheets_manager.ranking_sheet.batch_update.call_args[0][0]
+        assert [item['range'] for item in first] == ['A2:J4']
+        assert [row[1] for row in first[0]['values']] == ['1', '2', '3']
+
+        # Fighter3 beats Fighter2 three times and overtakes it; Fighter1 keeps rank 1
+        characters[2] = ranked_character('3', 3, 3)
+        characters[1] = ranked_character('2', 2, 4)
+        self.update(sheets_manager, characters)
+
+        second = sheets_manager.ranking_sheet.batch_update.call_args[0][0]
+        assert [item['range'] for item in second] == ['A3:J4']
+        assert [row[1] for row in second[0]['values']] == ['3', '2']
+
+        self.update(sheets_manager, characters)
+        assert sheets_manager.ranking_sheet.batch_update.call_count == 2
+        sheets_manager.ranking_sheet.clear.assert_not_called()
+        sheets_manager.ranking_sheet.get.assert_called_once()
+
+    def test_removed_character_rows_are_blanked(self, sheets_manager):
+        """Test that rows left over after a character is deleted are blanked in the same batch"""
+        sheets_manager.ranking_sheet.get.return_value = [
+            [1, '1', 'Fighter1', 3, 3, 0, 0, 100, 0, 9],
+            [2, '2', 'Fighter2', 3, 2, 1, 0, 66.67, 0, 6],
+        ]
+        self.update(sheets_manager, [ranked_character('1', 3, 0)])
+
+        sheets_manager.ranking_sheet.batch_update.assert_called_once_with([
+            {'range': 'A3:J3', 'values': [[''] * 10]}
+        ])
+
+
+class TestRowIndex:
+    """Test character ID -> row addressing"""
+
+    def test_update_writes_row_without_full_read(self, sheets_manager):
+        """Test that update_character targets the indexed row with one batch_update"""
+        sheets_manager.worksheet.get.return_value = [['1', 'Alpha'], ['2', 'Beta']]
+        character = Character(id='2', name='Beta', image_path='', sprite_path='',
+                              hp=100, attack=50, defense=50, speed=50, magic=50)
+
+        assert sheets_manager.update_character(character)
+        assert sheets_manager.update_character(character)
+
+        sheets_manager.worksheet.get_all_records.assert_not_called()
+        assert sheets_manager.worksheet.get.call_count == 1
+        ranges = [item['range'] for item in sheets_manager.worksheet.batch_update.call_args[0][0]]
+        assert ranges == ['B3', 'E3:K3', 'M3:O3']
+
+    def test_name_lookup_and_delete_shift(self, sheets_manager):
+        """Test name -> ID lookup and that rows below a deleted character move up"""
+        sheets_manager.worksheet.get.return_value = [['1', 'Alpha'], ['2', 'Beta'], ['3', 'Gamma']]
+
+        assert sheets_manager.get_character_id_by_name('Gamma') == '3'
+        sheets_manager.row_index.remove('2')
+
+        assert sheets_manager._find_character_row(3) == 3
+        assert sheets_manager.get_character_id_by_name('Beta') is None
+        assert sheets_manager.worksheet.get.call_count == 1
+
+    def test_unknown_id_reloads_index_once(self, sheets_manager):
+        """Test that a row added by another client is found after one index reload"""
+        sheets_manager.worksheet.get.return_value = [['1', 'Alpha']]
+        assert sheets_manager._find_character_row(1) == 2
+
+        sheets_manager.worksheet.get.return_value = [['1', 'Alpha'], ['2', 'Beta']]
+        assert sheets_manager._find_character_row(2) == 3
+        assert sheets_manager.worksheet.get.call_count == 2
+
+
+class TestIdAllocation:
+    """Test ID allocation from column A"""
+
+    def _character(self, name):
+        return Character(name=name, image_path='', sprite_path='',
+                         hp=100, attack=50, defense=50, speed=50, magic=50)
+
+    def test_create_reads_only_column_a(self, sheets_manager):
+        """Test that create_character takes max(ID) + 1 and registers the appended row"""
+        sheets_manager.worksheet.col_values.return_value = ['ID', '1', '2', '5']
+        sheets_manager.worksheet.append_row.return_value = {
+            'updates': {'updatedRange': "'Characters'!A5:O5"}
+        }
+        sheets_manager.worksheet.get.return_value = [['1', 'Alpha']]
+        sheets_manager._load_row_index()
+        character = self._character('Delta')
+
+        assert sheets_manager.create_character(character)
+
+        assert character.id == '6'
+        assert sheets_manager.worksheet.append_row.call_args[0][0][0] == 6
+        assert sheets_manager.row_index.get_row(6) == 5
+        sheets_manager.worksheet.get_all_records.assert_not_called()
+
+    def test_pending_ids_not_reused(self, sheets_manager):
+        """Test that IDs reserved but not yet appended are skipped, and external appends are seen"""
+        sheets_manager.battle_history_sheet.col_values.return_value = ['Battle ID', '1', '2']
+        allocator = sheets_manager.battle_ids
+
+        assert allocator.allocate(sheets_manager.battle_history_sheet) == 3
+        assert allocator.allocate(sheets_manager.battle_history_sheet, 2) == 4
+
+        # Another writer (LINE bot / GAS) appended up to ID 9
+        sheets_manager.battle_history_sheet.col_values.return_value = ['Battle ID'] + [str(i) for i in range(1, 10)]
+        assert allocator.allocate(sheets_manager.battle_history_sheet) == 10
+
+    def test_failed_append_releases_id(self, sheets_manager):
+        """Test that IDs of rows that failed to append are handed out again"""
+        sheets_manager.worksheet.col_values.return_value = ['ID', '1', '2']
+        sheets_manager.worksheet.append_row.side_effect = [Exception("timeout"), {}]
+
+        assert not sheets_manager.create_character(self._character('Gamma'))
+        character = self._character('Gamma')
+        assert sheets_manager.create_character(character)
+        assert character.id == '3'
+
+        sheets_manager.battle_history_sheet.col_values.return_value = ['Battle ID', '1']
+        sheets_manager.battle_history_sheet.append_rows.side_effect = [Exception("timeout"), {}]
+        assert not sheets_manager.record_battle_histories([{'fighter1_id': '1'}, {'fighter1_id': '2'}])
+        assert sheets_manager.record_battle_histories([{'fighter1_id': '1'}])
+        assert sheets_manager.battle_history_sheet.append_rows.call_args[0][0][0][0] == 2
+
+    def test_release_keeps_later_reservations(self, sheets_manager):
+        """Test that releasing an ID below a newer reservation doesn't hand the newer ID out twice"""
+        sheets_manager.worksheet.col_values.return_value = ['ID', '1']
+        allocator = sheets_manager.character_ids
+        first = allocator.allocate(sheets_manager.worksheet)
+        allocator.allocate(sheets_manager.worksheet)
+
+        allocator.release(first)
+        assert allocator.allocate(sheets_manager.worksheet) == 4
+
+    def test_concurrent_allocations_are_unique(self, sheets_manager):
+        """Test that threads allocating at the same time never get the same ID"""
+        sheets_manager.worksheet.col_values.return_value = ['ID', '1']
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(executor.map(lambda _: sheets_manager.character_ids.allocate(sheets_manager.worksheet),
+                                    range(50)))
+
+        assert sorted(ids) == list(range(2, 52))
+
+
+class TestIdIntegrity:
+    """Test fingerprinted, incremental ID integrity checks"""
+
+    def test_unchanged_column_skips_check(self, sheets_manager):
+        """Test that steady state costs one column A read and no writes"""
+        sheets_manager.worksheet.col_values.return_value = ['ID', '1', '2', '3']
+
+        sheets_manager._fix_id_integrity()
+        sheets_manager._fix_id_integrity()
+
+        assert sheets_manager.worksheet.col_values.call_count == 2
+        sheets_manager.worksheet.batch_update.assert_not_called()
+        sheets_manager.worksheet.get_all_records.assert_not_called()
+        assert sheets_manager._verified_id_count == 3
+
+    def test_gap_repair_touches_only_changed_cells(self, sheets_manager):
+        """Test that a gap rewrites only the shifted IDs and their references"""
+        sheets_manager.worksheet.col_values.return_value = ['ID', '1', '2', '4', '5']
+        sheets_manager.battle_history_sheet.batch_get.return_value = [
+            [['1'], ['4']],         # Fighter 1 ID (C)
+            [['5'], ['2']],         # Fighter 2 ID (E)
+            [['1'], ['']],          # Winner ID (G)
+        ]
+        sheets_manager.ranking_sheet.batch_get.return_value = [[['5'], ['1']]]
+        sheets_manager.story_progress_sheet = MagicMock()
+        sheets_manager.story_progress_sheet.batch_get.return_value = [[['4']]]
+
+        sheets_manager._fix_id_integrity()
+
+        assert sheets_manager.worksheet.batch_update.call_args[0][0] == [
+            {'range': 'A4', 'values': [[3]]}, {'range': 'A5', 'values': [[4]]}
+        ]
+        assert sheets_manager.battle_history_sheet.batch_update.call_args[0][0] == [
+            {'range': 'C3', 'values': [[3]]}, {'range': 'E2', 'values': [[4]]}
+        ]
+        assert sheets_manager.ranking_sheet.batch_update.call_args[0][0] == [{'range': 'B2', 'values': [[4]]}]
+        assert sheets_manager.story_progress_sheet.batch_update.call_args[0][0] == [{'range': 'A2', 'values': [[3]]}]
+        sheets_manager.battle_history_sheet.get_all_values.assert_not_called()
+
+    def test_only_new_rows_checked_after_append(self, sheets_manager):
+        """Test that verified rows are trusted and a bad appended ID is fixed on its own"""
+        sheets_manager.worksheet.col_values.return_value = ['ID', '1', '2']
+        sheets_manager._fix_id_integrity()
+
+        sheets_manager.worksheet.col_values.return_value = ['ID', '1', '2', '7']
+        sheets_manager.battle_history_sheet.batch_get.return_value = [[], [], []]
+        sheets_manager.ranking_sheet.batch_get.return_value = [[]]
+        sheets_manager._fix_id_integrity()
+
+        assert sheets_manager.worksheet.batch_update.call_args[0][0] == [{'range': 'A4', 'values': [[3]]}]
+        assert sheets_manager._verified_id_count == 3
+
+
+def named_sheet(title):
+    worksheet = MagicMock()
+    worksheet.title = title
+    return worksheet
+
+
+class TestStartupLoad:
+    """Test the single batched read of all worksheets at startup"""
+
+    def startup(self, sheets_manager, *value_ranges):
+        sheets = {title: named_sheet(title) for title in
+                  ['Characters', 'BattleHistory', 'Rankings', 'StoryBosses', 'StoryProgress']}
+        sheets_manager.worksheet = sheets['Characters']
+        sheets_manager.sheet = MagicMock()
+        sheets_manager.sheet.values_batch_get.return_value = {
+            'valueRanges': [{'values': values} if values else {} for values in value_ranges]
+        }
+        with patch('src.services.sheets_manager.Settings.BATTLE_HISTORY_SHEET', 'BattleHistory'), \
+                patch('src.services.sheets_manager.Settings.RANKING_SHEET', 'Rankings'):
+            sheets_manager._initialize_worksheets(sheets)
+        return sheets
+
+    def test_one_read_primes_all_caches(self, sheets_manager):
+        """Test that correct sheets cost one values_batch_get, no writes and no later reads"""
+        characters = [SheetsManager.CHARACTER_HEADERS, ['1', 'Alpha'] + ['10'] * 13]
+        history = history_values((1, 1, 1, 40, 20))
+        progress = [SheetsManager.STORY_PROGRESS_HEADERS, ['1', '2', 'FALSE', 'FALSE', '1', '3', '']]
+        sheets = self.startup(sheets_manager, characters, history, [SheetsManager.RANKING_HEADERS],
+                              [SheetsManager.STORY_BOSS_HEADERS], progress, [SheetsManager.BATTLE_HISTORY_HEADERS])
+
+        sheets_manager.sheet.values_batch_get.assert_called_once()
+        assert sheets_manager.sheet.values_batch_get.call_args[0][0][1] == "'BattleHistory'!A1:O"
+        sheets_manager.sheet.values_batch_update.assert_not_called()
+        assert sheets_manager.get_character_id_by_name('Alpha') == '1'
+        assert sheets_manager._get_records(sheets['Characters'])[0]['Name'] == 'Alpha'
+        assert sheets_manager._get_records(sheets['StoryProgress'], SheetsManager.STORY_PROGRESS_HEADERS)[0]['Attempts'] == 3
+        assert sheets_manager._history_last_row == 2
+        sheets_manager._ensure_headers()
+        for worksheet in sheets.values():
+            worksheet.get_all_records.assert_not_called()
+            worksheet.row_values.assert_not_called()
+            worksheet.get.assert_not_called()
+            worksheet.delete_rows.assert_not_called()
+
+    def test_header_fixes_and_migration_in_one_write(self, sheets_manager):
+        """Test that missing headers and an old 8-column StoryProgress sheet are fixed in one batch update"""
+        old_progress = [
+            SheetsManager.STORY_PROGRESS_HEADERS[:5] + ['Defeated Bosses', 'Attempts', 'Last Played'],
+            ['1', '3', 'FALSE', 'FALSE', '2', '1,2', '4', '2025-01-01']
+        ]
+        self.startup(sheets_manager, [SheetsManager.CHARACTER_HEADERS, ['1', 'Alpha']], [], [],
+                     [SheetsManager.STORY_BOSS_HEADERS], old_progress, [])
+
+        sheets_manager.sheet.values_batch_update.assert_called_once()
+        data = {item['range']: item['values'] for item in
+                sheets_manager.sheet.values_batch_update.call_args[0][0]['data']}
+        assert data["'BattleHistory'!A1:P1"] == [SheetsManager.BATTLE_HISTORY_HEADERS]
+        assert data["'Rankings'!A1:J1"] == [SheetsManager.RANKING_HEADERS]
+        assert data["'StoryProgress'!A2:G2"] == [['1', '3', 'FALSE', 'FALSE', 2, '4', '2025-01-01']]
+        assert data["'StoryProgress'!H1:H1"] == [['']]
+        assert data["'StoryProgress'!A1:G1"] == [SheetsManager.STORY_PROGRESS_HEADERS]
+        assert "'Characters'!A1:O1" not in data
+
+
+class TestStoryProgressBulkLoad:
+    """Test bulk story progress loading"""
+
+    def _progress_record(self, char_id, level, endless_access):
+        return {
+            'Character ID': char_id, 'Current Level': level, 'Completed': 'FALSE',
+            'EndlessAccess': 'TRUE' if endless_access else 'FALSE', 'Victories': level - 1,
+            'Attempts': 3, 'Last Played': '2025-01-01T00:00:00'
+        }
+
+    def test_all_progress_from_one_read(self, sheets_manager):
+        """Test that progress for every character comes from one sheet read"""
+        sheets_manager.story_progress_sheet = MagicMock()
+        sheets_manager.story_progress_sheet.get_all_records.return_value = [
+            self._progress_record(1, 3, False), self._progress_record(2, 5, True)
+        ]
+
+        progress_map = sheets_manager.get_all_story_progress()
+
+        assert set(progress_map) == {'1', '2'}
+        assert progress_map['1'].victories == [1, 2]
+        assert progress_map['2'].endless_access
+        assert sheets_manager.get_story_progress('2').current_level == 5
+        assert sheets_manager.story_progress_sheet.get_all_records.call_count == 1
+
+    def test_endless_engine_reads_progress_once_per_ttl(self):
+        """Test that endless mode eligibility checks share one bulk progress load"""
+        from src.models.story_boss import StoryProgress
+        from src.services.endless_battle_engine import EndlessBattleEngine
+
+        db_manager = MagicMock()
+        db_manager.get_all_characters.return_value = [
+            Character(id=str(i), name=f'C{i}', image_path='', sprite_path='',
+                      hp=100, attack=50, defense=50, speed=50, magic=50)
+            for i in range(1, 4)
+        ]
+        db_manager.get_all_story_progress.return_value = {
+            '1': StoryProgress(character_id='1', endless_access=True),
+            '3': StoryProgress(character_id='3', endless_access=True),
+        }
+
+        engine = EndlessBattleEngine(db_manager, MagicMock())
+        engine._load_characters()
+        engine._load_characters()
+
+        assert [c.id for c in engine.participants] == ['1', '3']
+        assert db_manager.get_all_story_progress.call_count == 1
+        db_manager.get_story_progress.assert_not_called()
+
+
+class TestCharacterPipeline:
+    """Test parallel processing of characters needing AI generation"""
+
+    def _empty_record(self, char_id):
+        return {'ID': char_id, 'Name': '', 'Image URL': f'https://example.com/{char_id}.png',
+                'Sprite URL': '', 'HP': 0}
+
+    def test_generation_runs_in_parallel_and_keeps_order(self, sheets_manager):
+        """Test that records are generated concurrently and returned in sheet order"""
+        import threading
+        import time
+
+        sheets_manager.last_id_integrity_check = time.time()
+        sheets_manager.worksheet.get_all_records.return_value = [self._empty_record(i) for i in range(1, 5)]
+        sheets_manager.worksheet.get.return_value = []
+
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def generate(record, progress_callback=None, current=1, total=1):
+            with lock:
+                active.append(record['ID'])
+                peak.append(len(active))
+            progress_callback(current, total, None, "AIが画像を分析中...")
+            time.sleep(0.05)
+            with lock:
+                active.remove(record['ID'])
+            return Character(id=str(record['ID']), name=f"C{record['ID']}", image_path='', sprite_path='',
+                             hp=100, attack=50, defense=50, speed=50, magic=50)
+
+        progress = []
+        with patch.object(sheets_manager, '_generate_stats_for_character', side_effect=generate):
+            characters = sheets_manager.get_all_characters(
+                progress_callback=lambda current, total, name, step: progress.append((current, total)))
+
+        assert [c.id for c in characters] == ['1', '2', '3', '4']
+        assert max(peak) > 1
+        assert sorted(progress) == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+    def test_sheet_writes_run_on_the_stepping_thread(self, sheets_manager):
+        """Test that pipeline workers hand their sheet writes to the thread advancing iter_all_characters"""
+        import threading
+        import time
+
+        sheets_manager.last_id_integrity_check = time.time()
+        sheets_manager.worksheet.get_all_records.return_value = [self._empty_record(i) for i in range(1, 4)]
+        sheets_manager.worksheet.get.return_value = []
+        written_on = []
+
+        def generate(record, progress_callback=None, current=1, total=1):
+            sheets_manager._sheet_write(lambda: written_on.append(threading.current_thread().name))
+            time.sleep(0.05 * record['ID'])
+            return None
+
+        with patch.object(sheets_manager, '_generate_stats_for_character', side_effect=generate):
+            steps = sheets_manager.iter_all_characters()
+            step_count = 0
+            while True:
+                try:
+                    next(steps)
+                    step_count += 1
+                except StopIteration as stop:
+                    assert stop.value == []
+                    break
+
+        assert written_on == [threading.current_thread().name] * 3
+        assert step_count > 1
+
+
+class TestLocalSprites:
+    """Test that locally made sprites follow the source image, not the character ID"""
+
+    IMAGE_URL = 'https://example.com/new-character.png'
+
+    def _record(self, char_id):
+        return {'ID': char_id, 'Name': 'Renumbered', 'Image URL': self.IMAGE_URL, 'Sprite URL': '',
+                'HP': 100, 'Attack': 50, 'Defense': 50, 'Speed': 50, 'Magic': 50, 'Luck': 50}
+
+    @pytest.fixture
+    def sprites_dir(self, sheets_manager, tmp_path):
+        sheets_manager.image_cache = ImageCache(tmp_path / "image_cache")
+        sprites_dir = tmp_path / "sprites"
+        sprites_dir.mkdir()
+        # Leftover of whichever character held ID 1 before the IDs were renumbered
+        (sprites_dir / "char_1_sprite.png").write_bytes(b"\x89PNG other character")
+        with patch('src.services.sheets_manager.Settings.SPRITES_DIR', sprites_dir):
+            yield sprites_dir
+
+    def test_leftover_id_sprite_is_not_used(self, sheets_manager, sprites_dir):
+        """Test that a sprite file named after the character ID is ignored"""
+        assert sheets_manager._needs_sprite_download(self._record(1))
+
+    def test_local_sprite_is_found_by_image_url(self, sheets_manager, sprites_dir, tmp_path):
+        """Test that a sprite made from an image is reused whatever ID the character has now"""
+        def process(input_path, output_dir, name):
+            output = tmp_path / f"{name}_sprite.png"
+            output.write_bytes(b"\x89PNG new character")
+            return True, "ok", str(output)
+
+        with patch('src.services.image_processor.ImageProcessor.process_character_image', side_effect=process):
+            success, _, sprite_path = sheets_manager._create_local_sprite(self.IMAGE_URL, tmp_path / "original.png")
+        assert success
+
+        assert not sheets_manager._needs_sprite_download(self._record(7))
+        character = sheets_manager._record_to_character(self._record(7))
+        assert character.sprite_path == sprite_path
+        assert open(character.sprite_path, 'rb').read() == b"\x89PNG new character"
@@ -0,0 +1,300 @@
+"""
+Unit tests for the local SQLite mirror of the Sheets backend
+"""
+
+import pytest
+
+from config.settings import Settings
+from src.services.sheets_backend import InMemorySpreadsheet, grid_bounds, split_range
+from src.services.sheets_manager import SheetsManager
+from src.services.sheets_mirror import SheetsMirror
+
+
+class RejectedError(Exception):
+    """Stand-in for a gspread APIError Sheets returns for an invalid request"""
+
+    code = 400
+
+
+class FakeRemoteSheet:
+    """In-memory worksheet standing in for the quota-aware gspread worksheet"""
+
+    def __init__(self, title, grid):
+        self.title = title
+        self.col_count = 4
+        self.grid = [list(map(str, row)) for row in grid]
+        self.offline = False
+        self.reject = set()
+        self.calls = []
+
+    def _call(self, name):
+        if self.offline:
+            raise ConnectionError("connection aborted")
+        if name in self.reject:
+            raise RejectedError("Invalid values")
+        self.calls.append(name)
+
+    def col_values(self, col):
+        self._call('col_values')
+        return [row[col - 1] if len(row) >= col else '' for row in self.grid]
+
+    def row_values(self, row):
+        self._call('row_values')
+        return list(self.grid[row - 1])
+
+    def append_row(self, values, **kwargs):
+        self._call('append_row')
+        self.grid.append([str(v) for v in values])
+
+    def update(self, range_name, values, **kwargs):
+        self._call('update')
+        start_row, _, start_col, _ = grid_bounds(range_name)
+        for r, row_values in enumerate(values):
+            while len(self.grid) <= start_row + r:
+                self.grid.append([])
+            row = self.grid[start_row + r]
+            row.extend([''] * (start_col + len(row_values) - len(row)))
+            row[start_col:start_col + len(row_values)] = [str(v) for v in row_values]
+
+
+class FakeSpreadsheet:
+    """Answers values_batch_get from FakeRemoteSheet grids"""
+
+    def __init__(self, *sheets):
+        self.sheets = {sheet.title: sheet for sheet in sheets}
+        self.batch_gets = []
+
+    def values_batch_get(self, ranges):
+        self.batch_gets.append(ranges)
+        value_ranges = []
+        for range_name in ranges:
+            title, a1 = split_range(range_name) if '!' in range_name else (range_name.strip("'"), None)
+            grid = self.sheets[title].grid
+            if a1:
+                start_row, end_row, start_col, end_col = grid_bounds(a1)
+                grid = [row[start_col:end_col] for row in grid[start_row:end_row]]
+            value_ranges.append({'values': grid})
+        return {'valueRanges': value_ranges}
+
+
+@pytest.fixture
+def remote():
+    characters = FakeRemoteSheet('Characters', [['ID', 'Name', 'Wins'], [1, 'Alpha', 3], [2, 'Beta', 0]])
+    return characters, FakeSpreadsheet(characters)
+
+
+def open_mirror(tmp_path, remote, full_sync_interval=3600):
+    characters, spreadsheet = remote
+    mirror = SheetsMirror(db_path=tmp_path / "mirror.db", sync_interval=3600,
+                          full_sync_interval=full_sync_interval)
+    mirror.attach(spreadsheet, [characters])
+    return mirror, mirror.wrap_worksheet(characters)
+
+
+class TestSheetsMirror:
+    """Test SheetsMirror functionality"""
+
+    def test_reads_are_served_locally(self, tmp_path, remote):
+        """Test that one batch read loads the sheet and later reads need no API call"""
+        characters, spreadsheet = remote
+        mirror, worksheet = open_mirror(tmp_path, remote)
+
+        assert worksheet.get_all_records() == [
+            {'ID': 1, 'Name': 'Alpha', 'Wins': 3}, {'ID': 2, 'Name': 'Beta', 'Wins': 0}
+        ]
+        assert worksheet.col_values(1) == ['ID', '1', '2']
+        assert worksheet.get('A2:B') == [['1', 'Alpha'], ['2', 'Beta']]
+        assert worksheet.row_values(1) == ['ID', 'Name', 'Wins']
+        assert len(spreadsheet.batch_gets) == 1
+        assert characters.calls == []
+
+    def test_writes_are_logged_and_pushed_in_order(self, tmp_path, remote):
+        """Test that writes show up locally at once and reach Sheets on push"""
+        characters, _ = remote
+        mirror, worksheet = open_mirror(tmp_path, remote)
+
+        response = worksheet.append_row([3, 'Gamma', 0])
+        worksheet.update('C2', [[4]])
+
+        assert response['updates']['updatedRange'] == "'Characters'!A4:C4"
+        assert worksheet.get_all_records()[0]['Wins'] == 4
+        assert characters.grid[1] == ['1', 'Alpha', '3']
+        assert mirror.pending_count() == 2
+
+        assert mirror.push()
+        assert characters.calls == ['col_values', 'append_row', 'update']
+        assert characters.grid == [['ID', 'Name', 'Wins'], ['1', 'Alpha', '4'], ['2', 'Beta', '0'], ['3', 'Gamma', '0']]
+        assert mirror.pending_count() == 0
+
+    def test_connection_loss_keeps_changes(self, tmp_path, remote):
+        """Test that an unreachable Sheets API leaves the log intact and play continues locally"""
+        characters, _ = remote
+        mirror, worksheet = open_mirror(tmp_path, remote)
+        characters.offline = True
+
+        worksheet.update('C3', [[1]])
+        assert not mirror.push()
+        assert mirror.pending_count() == 1
+        assert worksheet.get_all_records()[1]['Wins'] == 1
+        assert not mirror.get_stats()['online']
+
+        characters.offline = False
+        mirror.sync_once()
+        assert characters.grid[2] == ['2', 'Beta', '1']
+        assert mirror.get_stats()['online']
+
+    def test_pull_picks_up_remote_changes(self, tmp_path, remote):
+        """Test that rows appended elsewhere are fetched as a tail and edits by a full diff"""
+        characters, spreadsheet = remote
+        mirror, worksheet = open_mirror(tmp_path, remote)
+        pulled = []
+        mirror.add_listener(pulled.append)
+
+        characters.grid.append(['3', 'LineBot', '0'])
+        mirror.sync_once()
+        assert worksheet.col_values(2)[-1] == 'LineBot'
+        assert spreadsheet.batch_gets[-1] == ["'Characters'!A4:D"]
+
+        characters.grid[1][2] = '9'
+        mirror.full_sync_interval = 0
+        mirror.sync_once()
+        assert worksheet.get_all_records()[0]['Wins'] == 9
+        assert pulled == ['Characters', 'Characters']
+        assert mirror.get_stats()['rows_pulled'] == 2
+
+    def test_mirror_and_log_survive_restart(self, tmp_path, remote):
+        """Test that a reopened mirror serves the saved grid and still pushes pending changes"""
+        characters, spreadsheet = remote
+        mirror, worksheet = open_mirror(tmp_path, remote)
+        characters.offline = True
+        worksheet.append_row([3, 'Gamma', 0])
+        mirror.close()
+
+        characters.offline = False
+        reopened, worksheet = open_mirror(tmp_path, remote)
+        assert worksheet.col_values(2) == ['Name', 'Alpha', 'Beta', 'Gamma']
+        assert len(spreadsheet.batch_gets) == 1  # No reload of an already mirrored sheet
+        assert reopened.push()
+        assert characters.grid[-1] == ['3', 'Gamma', '0']
+        reopened.close()
+
+    def test_rejected_change_becomes_dead_letter(self, tmp_path, remote):
+        """Test that a change Sheets rejects is kept for the user and later changes still push"""
+        characters, _ = remote
+        mirror, worksheet = open_mirror(tmp_path, remote)
+        characters.reject = {'update'}
+
+        worksheet.update('C2', [[7]])
+        worksheet.append_row([3, 'Gamma', 0])
+        assert mirror.push()
+
+        assert characters.grid[-1] == ['3', 'Gamma', '0']
+        letters = mirror.get_dead_letters()
+        assert [(letter['sheet'], letter['method'], letter['args']) for letter in letters] == [
+            ('Characters', 'update', ['C2', [[7]]])
+        ]
+        assert 'Invalid values' in letters[0]['reason']
+        assert mirror.get_stats()['dead_letters'] == 1
+
+        mirror.discard_dead_letters([letters[0]['id']])
+        assert mirror.get_dead_letters() == []
+        mirror.close()
+
+    def test_writes_follow_their_row_id(self, tmp_path, remote):
+        """Test that a logged write lands on the row holding its ID after rows moved on the sheet"""
+        characters, _ = remote
+        mirror, worksheet = open_mirror(tmp_path, remote)
+        characters.offline = True
+        worksheet.update('C3', [[5]])  # Beta (ID 2) is row 3 locally
+
+        del characters.grid[1]  # Alpha deleted by another client: Beta moves to row 2
+        characters.offline = False
+        assert mirror.push()
+
+        assert characters.grid == [['ID', 'Name', 'Wins'], ['2', 'Beta', '5']]
+        assert mirror.get_dead_letters() == []
+        mirror.close()
+
+    def test_append_with_taken_id_is_a_conflict(self, tmp_path, remote):
+        """Test that an offline append whose ID another client took is not pushed over that row"""
+        characters, _ = remote
+        mirror, worksheet = open_mirror(tmp_path, remote)
+        characters.offline = True
+        worksheet.append_row([3, 'Gamma', 0])
+        worksheet.update('C4', [[1]])
+
+        characters.grid.append(['3', 'LineBot', '0'])  # Registered through LINE meanwhile
+        characters.offline = False
+        assert mirror.push()
+
+        assert characters.grid[-1] == ['3', 'LineBot', '0']
+        letters = mirror.get_dead_letters()
+        assert [letter['method'] for letter in letters] == ['append_row', 'update']
+        assert all(letter['reason'].startswith('Conflict') for letter in letters)
+
+        mirror.pull()
+        assert worksheet.col_values(2) == ['Name', 'Alpha', 'Beta', 'LineBot']
+        mirror.close()
+
+    def test_append_already_on_sheet_is_not_repeated(self, tmp_path, remote):
+        """Test that an append whose row is already on the sheet (lost response) is not sent again"""
+        characters, _ = remote
+        mirror, worksheet = open_mirror(tmp_path, remote)
+        characters.offline = True
+        worksheet.append_row([3, 'Gamma', 0])
+
+        characters.grid.append(['3', 'Gamma', '0'])
+        characters.offline = False
+        assert mirror.push()
+
+        assert len(characters.grid) == 4
+        assert 'append_row' not in characters.calls
+        assert mirror.get_dead_letters() == []
+        mirror.close()
+
+
+class TestOfflineStart:
+    """Test starting SheetsManager from the saved mirror without a connection"""
+
+    def test_saved_mirror_is_used_when_sheets_unreachable(self, tmp_path, monkeypatch):
+        """Test that startup falls back to the saved mirror and pushes once Sheets is reachable"""
+        monkeypatch.setattr(Settings, 'SHEETS_LOCAL_MIRROR', True)
+        monkeypatch.setattr(Settings, 'SHEETS_MIRROR_PATH', tmp_path / "mirror.db")
+        monkeypatch.setattr(Settings, 'SHEETS_SYNC_INTERVAL', 3600)
+        monkeypatch.setattr(Settings, 'SHEETS_READS_PER_MINUTE', 1e6)
+        monkeypatch.setattr(Settings, 'SHEETS_WRITES_PER_MINUTE', 1e6)
+        monkeypatch.setattr(Settings, 'GAS_WEBHOOK_URL', None)
+        remote = InMemorySpreadsheet({
+            Settings.WORKSHEET_NAME: [SheetsManager.CHARACTER_HEADERS,
+                                      [1, 'Alpha', '', '', 100, 60, 50, 50, 40, 50, '', '', 2, 0, 0]],
+            Settings.BATTLE_HISTORY_SHEET: [SheetsManager.BATTLE_HISTORY_HEADERS],
+            Settings.RANKING_SHEET: [SheetsManager.RANKING_HEADERS],
+            'StoryBosses': [SheetsManager.STORY_BOSS_HEADERS],
+            'StoryProgress': [SheetsManager.STORY_PROGRESS_HEADERS]
+        })
+        saved = SheetsMirror()
+        saved.attach(remote, remote.worksheets())
+        saved.close()
+
+        def unreachable(self):
+            raise ConnectionError("network is unreachable")
+
+        monkeypatch.setattr(SheetsManager, '_connect', unreachable)
+        manager = SheetsManager()
+        try:
+            assert manager.online_mode
+            assert not manager.mirror.connected
+            assert manager.get_character('1').name == 'Alpha'
+            assert manager.apply_stat_increments({'1': {'wins': 1, 'losses': 0, 'draws': 0}}) == (['1'], [])
+
+            manager.mirror._connect()
+            assert not manager.mirror.connected
+
+            monkeypatch.setattr(SheetsManager, '_connect', lambda self: remote)
+            manager.mirror._connect()
+            manager.mirror.sync_once()
+            assert manager.mirror.connected
+            assert remote.worksheet(Settings.WORKSHEET_NAME).get('M2') == [['3']]
+            assert manager.mirror.pending_count() == 0
+        finally:
+            manager.close()
@@ -0,0 +1,112 @@
+"""
+Unit tests for the Sheets write-behind queue
+"""
+
+from unittest.mock import MagicMock
+
+from config.settings import Settings
+from src.models import Battle
+from src.services.battle_log_store import BattleLogStore
+from src.services.sheets_backend import InMemorySpreadsheet
+from src.services.sheets_manager import SheetsManager
+from src.services.sheets_write_queue import SheetsWriteQueue
+
+
+def make_battle(char1_id, char2_id, winner_id):
+    return Battle(character1_id=char1_id, character2_id=char2_id, winner_id=winner_id)
+
+
+def make_manager(succeed=True):
+    manager = MagicMock()
+    manager.apply_stat_increments.side_effect = lambda increments: (list(increments), []) if succeed else None
+    manager.record_battle_histories.return_value = succeed
+    manager.update_rankings.return_value = succeed
+    return manager
+
+
+class TestSheetsWriteQueue:
+    """Test SheetsWriteQueue functionality"""
+
+    def test_results_are_coalesced_into_one_batch(self, tmp_path):
+        """Test that several battles flush as one increment batch, one append and one ranking update"""
+        manager = make_manager()
+        queue = SheetsWriteQueue(manager, persist_path=tmp_path / "pending.json", autostart=False)
+
+        queue.enqueue_battle(make_battle('1', '2', '1'), {'fighter1_id': '1'})
+        queue.enqueue_battle(make_battle('1', '3', '1'), {'fighter1_id': '1'})
+        queue.enqueue_battle(make_battle('2', '3', None), {'fighter1_id': '2'})
+
+        assert queue.flush()
+        manager.apply_stat_increments.assert_called_once_with({
+            '1': {'wins': 2, 'losses': 0, 'draws': 0},
+            '2': {'wins': 0, 'losses': 1, 'draws': 1},
+            '3': {'wins': 0, 'losses': 1, 'draws': 1},
+        })
+        assert len(manager.record_battle_histories.call_args[0][0]) == 3
+        manager.update_rankings.assert_called_once()
+        assert queue.pending_count() == 0
+        assert not (tmp_path / "pending.json").exists()
+
+    def test_pending_writes_survive_restart(self, tmp_path):
+        """Test that queued results are reloaded from disk by a new queue"""
+        persist_path = tmp_path / "pending.json"
+        queue = SheetsWriteQueue(make_manager(), persist_path=persist_path, autostart=False)
+        queue.enqueue_battle(make_battle('1', '2', '2'), {'fighter1_id': '1'})
+        assert persist_path.exists()
+
+        manager = make_manager()
+        restored = SheetsWriteQueue(manager, persist_path=persist_path, autostart=False)
+        assert restored.get_stats()['pending_history'] == 1
+
+        assert restored.flush()
+        manager.apply_stat_increments.assert_called_once_with({
+            '1': {'wins': 0, 'losses': 1, 'draws': 0},
+            '2': {'wins': 1, 'losses': 0, 'draws': 0},
+        })
+
+    def test_failed_flush_keeps_writes(self, tmp_path):
+        """Test that writes are kept and merged with new results when a flush fails"""
+        manager = make_manager()
+        manager.record_battle_histories.return_value = False
+        queue = SheetsWriteQueue(manager, persist_path=tmp_path / "pending.json", autostart=False)
+
+        queue.enqueue_battle(make_battle('1', '2', '1'), {'fighter1_id': '1'})
+        assert not queue.flush()
+        queue.enqueue_battle(make_battle('1', '2', '1'), {'fighter1_id': '1'})
+
+        stats = queue.get_stats()
+        assert stats['failed_flushes'] == 1
+        assert stats['pending_history'] == 2
+        # Stat increments were written before the failure and are not repeated
+        assert stats['pending_characters'] == 2
+        manager.record_battle_histories.return_value = True
+        assert queue.flush()
+        assert manager.apply_stat_increments.call_args[0][0]['1'] == {'wins': 1, 'losses': 0, 'draws': 0}
+
+
+    def test_missing_character_increments_are_dropped(self, tmp_path, monkeypatch):
+        """Test that a deleted fighter's increment is dropped and the other fighter's is written once"""
+        monkeypatch.setattr(Settings, 'SHEETS_READS_PER_MINUTE', 1e6)
+        monkeypatch.setattr(Settings, 'SHEETS_WRITES_PER_MINUTE', 1e6)
+        monkeypatch.setattr(Settings, 'GAS_WEBHOOK_URL', None)
+        spreadsheet = InMemorySpreadsheet({
+            Settings.WORKSHEET_NAME: [SheetsManager.CHARACTER_HEADERS,
+                                      [1, 'Fighter1', '', '', 100, 60, 50, 50, 40, 50, '', '', 0, 0, 0]],
+            Settings.BATTLE_HISTORY_SHEET: [SheetsManager.BATTLE_HISTORY_HEADERS],
+            Settings.RANKING_SHEET: [SheetsManager.RANKING_HEADERS],
+            'StoryBosses': [SheetsManager.STORY_BOSS_HEADERS],
+            'StoryProgress': [SheetsManager.STORY_PROGRESS_HEADERS]
+        })
+        manager = SheetsManager(spreadsheet=spreadsheet)
+        manager.battle_logs = BattleLogStore(tmp_path / "battle_logs")
+        queue = SheetsWriteQueue(manager, persist_path=tmp_path / "pending.json", autostart=False)
+
+        queue.enqueue_battle(make_battle('1', '999', '1'), {'fighter1_id': '1', 'fighter2_id': '999'})
+        assert queue.flush()
+        assert queue.flush()
+
+        assert manager.worksheet.get('M2')[0][0] == '1'
+        stats = queue.get_stats()
+        assert stats['dropped_increments'] == 1
+        assert stats['pending_characters'] == 0
+        assert not (tmp_path / "pending.json").exists()